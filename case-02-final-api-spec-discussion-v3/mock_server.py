@@ -1,7 +1,8 @@
 """Mock server for GET /dashboard/orders matching final_api_spec.yaml."""
 
+import base64
 import json
-from http.server import HTTPServer, BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
 from urllib.parse import urlparse, parse_qs
 
 MOCK_ORDERS = [
@@ -103,15 +104,53 @@ MOCK_ORDERS = [
 
 TOTAL_ORDERS = len(MOCK_ORDERS)
 
+# Cursor pagination: MOCK_ORDERS is newest first, so its (created_at, id)
+# keys are in descending order and a cursor is located by binary search.
+ORDER_KEYS = [(o["created_at"], o["id"]) for o in MOCK_ORDERS]
+
+
+def encode_cursor(order):
+    raw = json.dumps([order["created_at"], order["id"]]).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor):
+    """Return the (created_at, id) key in a cursor, or None if it is malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, order_id = json.loads(raw)
+    except (ValueError, TypeError):
+        return None
+    if not isinstance(created_at, str) or not isinstance(order_id, str):
+        return None
+    return created_at, order_id
+
+
+def position_after(key):
+    """Index of the first order after `key` in the descending ORDER_KEYS, O(log n)."""
+    lo, hi = 0, len(ORDER_KEYS)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if ORDER_KEYS[mid] < key:
+            hi = mid
+        else:
+            lo = mid + 1
+    return lo
+
 
 class DashboardHandler(BaseHTTPRequestHandler):
+    # HTTP/1.1 keeps connections open between requests; every response
+    # therefore carries Content-Length, and idle connections close after
+    # `timeout` seconds so they cannot hold a thread forever. Nagle is off
+    # so the separate header and body writes do not wait on a delayed ACK.
+    protocol_version = "HTTP/1.1"
+    timeout = 5
+    disable_nagle_algorithm = True
+
     def do_GET(self):
         parsed = urlparse(self.path)
         if parsed.path != "/dashboard/orders":
-            self.send_response(404)
-            self.send_header("Content-Type", "application/json")
-            self.end_headers()
-            self.wfile.write(json.dumps({"error": "Not found"}).encode())
+            self._send_json(404, {"error": "Not found"})
             return
 
         params = parse_qs(parsed.query)
@@ -119,18 +158,23 @@ class DashboardHandler(BaseHTTPRequestHandler):
             limit = int(params.get("limit", ["10"])[0])
             offset = int(params.get("offset", ["0"])[0])
         except ValueError:
-            self.send_response(400)
-            self.send_header("Content-Type", "application/json")
-            self.end_headers()
-            self.wfile.write(
-                json.dumps({"error": "limit and offset must be integers"}).encode()
-            )
+            self._send_json(400, {"error": "limit and offset must be integers"})
             return
 
         limit = max(1, min(limit, 50))
         offset = max(0, offset)
 
+        if "cursor" in params:
+            key = decode_cursor(params["cursor"][0])
+            if key is None or "offset" in params:
+                self._send_json(
+                    400, {"error": "cursor must be a valid next_cursor and cannot be combined with offset"}
+                )
+                return
+            offset = position_after(key)
+
         paginated = MOCK_ORDERS[offset : offset + limit]
+        has_more = paginated and offset + limit < TOTAL_ORDERS
 
         response = {
             "orders": paginated,
@@ -138,13 +182,19 @@ class DashboardHandler(BaseHTTPRequestHandler):
                 "limit": limit,
                 "offset": offset,
                 "total": TOTAL_ORDERS,
+                "next_cursor": encode_cursor(paginated[-1]) if has_more else None,
             },
         }
 
-        self.send_response(200)
+        self._send_json(200, response)
+
+    def _send_json(self, status_code, data):
+        body = json.dumps(data).encode()
+        self.send_response(status_code)
         self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
         self.end_headers()
-        self.wfile.write(json.dumps(response).encode())
+        self.wfile.write(body)
 
     def log_message(self, format, *args):
         print(f"[mock_server] {args[0]}")
@@ -152,7 +202,7 @@ class DashboardHandler(BaseHTTPRequestHandler):
 
 def main():
     port = 8080
-    server = HTTPServer(("localhost", port), DashboardHandler)
+    server = ThreadingHTTPServer(("localhost", port), DashboardHandler)
     print(f"Mock server running on http://localhost:{port}")
     print(f"Try: http://localhost:{port}/dashboard/orders")
     try:
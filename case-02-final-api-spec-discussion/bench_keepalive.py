@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Benchmark: requests per second with and without HTTP keep-alive.
+Python stdlib only — no external dependencies.
+
+Starts mock_server.py in a subprocess (keep-alive enabled, on a free port)
+and drives GET /dashboard/orders with load_generator.py's client threads,
+twice: once opening a new TCP connection per request, once reusing one
+persistent connection per thread.
+
+Usage:
+    python bench_keepalive.py
+    python bench_keepalive.py --mode asyncio --concurrency 16 --duration 10
+    python bench_keepalive.py --url http://localhost:8080   # existing server
+"""
+
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+from urllib.parse import urlsplit
+
+import load_generator
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+REQUEST_PATH = "/dashboard/orders?page=1&page_size=20"
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("localhost", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(mode, workers, port):
+    """Start mock_server.py with keep-alive on and wait until it accepts connections."""
+    proc = subprocess.Popen(
+        [
+            sys.executable, os.path.join(HERE, "mock_server.py"),
+            "--mode", mode, "--workers", str(workers),
+            "--port", str(port), "--keep-alive",
+        ],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(("localhost", port), timeout=0.2).close()
+            return proc
+        except OSError:
+            time.sleep(0.05)
+    proc.kill()
+    raise RuntimeError("mock server did not start")
+
+
+def run(host, port, keep_alive, concurrency, duration):
+    """One run of load_generator's client threads against REQUEST_PATH."""
+    path, _, query = REQUEST_PATH.partition("?")
+    report = load_generator.run_load(f"http://{host}:{port}{path}", concurrency, duration,
+                                     load_generator.parse_mix(query), keep_alive)
+    requests = report["status_counts"].get("200", 0)
+    return {
+        "keep_alive": keep_alive,
+        "requests": requests,
+        "errors": report["errors"] + report["requests"] - requests,
+        "seconds": report["duration_s"],
+        "requests_per_second": round(requests / report["duration_s"], 1) if report["duration_s"] else 0.0,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare req/s with and without keep-alive.")
+    parser.add_argument("--url", help="Benchmark an already running server instead of starting one")
+    parser.add_argument("--mode", default="thread", choices=["single", "thread", "fork", "asyncio"],
+                        help="Serving mode of the started server (default: thread)")
+    parser.add_argument("--workers", type=int, default=8, help="Server workers (default: 8)")
+    parser.add_argument("--concurrency", type=int, default=8, help="Client threads (default: 8)")
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds per run (default: 5)")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args(argv)
+
+    proc = None
+    if args.url:
+        parts = urlsplit(args.url)
+        host, port = parts.hostname, parts.port or 80
+    else:
+        host, port = "localhost", _free_port()
+        proc = start_server(args.mode, max(args.workers, args.concurrency), port)
+
+    try:
+        results = [
+            run(host, port, False, args.concurrency, args.duration),
+            run(host, port, True, args.concurrency, args.duration),
+        ]
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait()
+
+    if args.json:
+        print(json.dumps({"mode": None if args.url else args.mode, "concurrency": args.concurrency,
+                          "results": results}, indent=2))
+        return
+
+    print(f"GET {REQUEST_PATH}, {args.concurrency} client threads, {args.duration:g}s per run")
+    for r in results:
+        label = "keep-alive" if r["keep_alive"] else "new connection per request"
+        print(f"  {label:<28} {r['requests_per_second']:>9.1f} req/s  ({r['requests']} ok, {r['errors']} errors)")
+    before, after = results[0]["requests_per_second"], results[1]["requests_per_second"]
+    if before:
+        print(f"  keep-alive speedup: {after / before:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
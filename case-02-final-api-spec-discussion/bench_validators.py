@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: the ISO 8601 and URI checks of client_validator.py.
+Python stdlib only — no external dependencies.
+
+Builds pages with mock_server.py in-process and times the previous checks
+(replace("Z", "+00:00") + datetime.fromisoformat, two startswith calls)
+against the current ones: per check over every created_at and
+product_image_url value, then end to end through validate_response and the
+validators compiled from final_api_spec.yaml. The last row isolates the
+is_uri memo in the compiled validators. Two fast paths for the fixed
+%Y-%m-%dT%H:%M:%SZ form are timed too; neither beats the C parser, which is
+why is_datetime has none. Pages are decoded again before every run, so
+strings arrive with no cached hash, as after json.loads. Before and after
+runs alternate, and each side reports its median.
+
+Usage:
+    python bench_validators.py
+    python bench_validators.py --orders 20000 --repeat 15 --json
+"""
+
+import argparse
+import gc
+import json
+import os
+import re
+import statistics
+import sys
+import time
+from datetime import datetime
+
+import client_validator
+import mock_server
+import spec_compiler
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+PAGE_SIZE = 50
+
+
+def legacy_is_datetime(value):
+    try:
+        datetime.fromisoformat(value.replace("Z", "+00:00"))
+        return True
+    except ValueError:
+        return False
+
+
+def legacy_is_uri(value):
+    return value.startswith("http://") or value.startswith("https://")
+
+
+def unmemoized_is_uri(value):
+    """is_uri without its memo, to time the memo alone."""
+    return value.startswith(("http://", "https://"))
+
+
+_FIXED_DATETIME = re.compile(
+    r"\d{4}-(?:0[1-9]|1[0-2])-(?:0[1-9]|1\d|2[0-8])T(?:[01]\d|2[0-3]):[0-5]\d:[0-5]\dZ\Z")
+
+
+def regex_is_datetime(value):
+    """Candidate: accept the fixed form by regex (days 29-31 need the parser)."""
+    return _FIXED_DATETIME.match(value) is not None or legacy_is_datetime(value)
+
+
+def direct_is_datetime(value):
+    """Candidate: parse the fixed form as is; fromisoformat takes "Z" from 3.11."""
+    if len(value) == 20 and value[10] == "T" and value[19] == "Z":
+        try:
+            datetime.fromisoformat(value)
+            return True
+        except ValueError:
+            pass
+    return legacy_is_datetime(value)
+
+
+def encoded_pages(total_orders):
+    mock_server.configure_dataset(total_orders=total_orders, max_items=3)
+    pages = []
+    for page in range(1, -(-total_orders // PAGE_SIZE) + 1):
+        status, data = mock_server.handle_orders_request(
+            f"/dashboard/orders?page={page}&page_size={PAGE_SIZE}")
+        pages.append(json.dumps(data))
+    return pages
+
+
+def timed(pages, run):
+    """Seconds for one run(decoded pages), on freshly decoded pages.
+
+    The collector is off while timing, as in timeit: decoding allocates
+    enough that a full collection would otherwise land in a random run.
+    """
+    decoded = [json.loads(page) for page in pages]
+    spec_compiler._known_uris.clear()
+    gc.collect()
+    gc.disable()
+    try:
+        started = time.perf_counter()
+        run(decoded)
+        return time.perf_counter() - started
+    finally:
+        gc.enable()
+
+
+def interleaved(repeat, pages, before, after):
+    """Median seconds of `before` and `after` over `repeat` alternating runs.
+
+    Alternating the two, and which goes first, rather than timing one and
+    then the other, spreads drift on a shared machine over both sides.
+    """
+    old, new = [], []
+    for i in range(repeat):
+        if i % 2:
+            new.append(timed(pages, after))
+            old.append(timed(pages, before))
+        else:
+            old.append(timed(pages, before))
+            new.append(timed(pages, after))
+    return statistics.median(old), statistics.median(new)
+
+
+def check_runner(check, field):
+    if field == "created_at":
+        def run(decoded):
+            for data in decoded:
+                for order in data["orders"]:
+                    check(order["created_at"])
+    else:
+        def run(decoded):
+            for data in decoded:
+                for order in data["orders"]:
+                    for item in order["items"]:
+                        check(item["product_image_url"])
+    return run
+
+
+def response_runner(validate):
+    def run(decoded):
+        for data in decoded:
+            validate(data)
+    return run
+
+
+def with_checks(is_iso8601, is_uri, run):
+    """Run `run` with client_validator's checks temporarily replaced."""
+    def swapped(decoded):
+        saved = client_validator.is_iso8601, client_validator.is_uri
+        client_validator.is_iso8601, client_validator.is_uri = is_iso8601, is_uri
+        try:
+            run(decoded)
+        finally:
+            client_validator.is_iso8601, client_validator.is_uri = saved
+    return swapped
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time the ISO 8601 and URI checks, before and after.")
+    parser.add_argument("--orders", type=int, default=10000, help="Orders to validate (default: 10000)")
+    parser.add_argument("--repeat", type=int, default=9,
+                        help="Alternating runs of each side, the median is kept (default: 9)")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args(argv)
+
+    client_validator.RESULTS.echo = False
+    pages = encoded_pages(args.orders)
+    decoded = [json.loads(page) for page in pages]
+    items = sum(len(order["items"]) for data in decoded for order in data["orders"])
+
+    spec = os.path.join(HERE, "final_api_spec.yaml")
+    fail = client_validator.fail
+    compiled = spec_compiler.load_validators(spec, fail)
+    compiled_legacy = spec_compiler.load_validators(
+        spec, fail, format_checks={"date-time": legacy_is_datetime, "uri": legacy_is_uri})
+    compiled_unmemoized = spec_compiler.load_validators(
+        spec, fail, format_checks={"uri": unmemoized_is_uri})
+
+    cases = [
+        ("ISO 8601, regex fast path", args.orders,
+         check_runner(legacy_is_datetime, "created_at"), check_runner(regex_is_datetime, "created_at")),
+        ("ISO 8601, direct parse", args.orders,
+         check_runner(legacy_is_datetime, "created_at"), check_runner(direct_is_datetime, "created_at")),
+        ("URI check, memoized", items,
+         check_runner(legacy_is_uri, "uri"), check_runner(spec_compiler.is_uri, "uri")),
+        ("validate_response", args.orders,
+         with_checks(legacy_is_datetime, legacy_is_uri, response_runner(client_validator.validate_response)),
+         response_runner(client_validator.validate_response)),
+        ("compiled validate_response", args.orders,
+         response_runner(compiled_legacy.validate_response), response_runner(compiled.validate_response)),
+        ("compiled, URI memo only", args.orders,
+         response_runner(compiled_unmemoized.validate_response), response_runner(compiled.validate_response)),
+    ]
+    results = []
+    for name, count, before, after in cases:
+        old, new = interleaved(args.repeat, pages, before, after)
+        results.append({
+            "name": name,
+            "calls": count,
+            "before_ns": round(old / count * 1e9, 1),
+            "after_ns": round(new / count * 1e9, 1),
+            "speedup": round(old / new, 2),
+        })
+
+    if args.json:
+        print(json.dumps({"orders": args.orders, "items": items, "python": sys.version.split()[0],
+                          "results": results}, indent=2))
+        return
+
+    print(f"{args.orders} orders, {items} items, median of {args.repeat} interleaved runs, "
+          f"Python {sys.version.split()[0]}")
+    for r in results:
+        unit = "order" if r["calls"] == args.orders else "item"
+        print(f"  {r['name']:<28} {r['before_ns']:>8.1f} -> {r['after_ns']:>7.1f} ns/{unit}  "
+              f"({r['speedup']:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
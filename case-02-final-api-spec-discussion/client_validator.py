@@ -4,18 +4,70 @@ Client validator for GET /dashboard/orders.
 Fetches from the mock server and validates the response structure
 against the agreed API spec (final_api_spec.yaml).
 
-Usage: python3 client_validator.py [--url URL]
+Usage: python3 client_validator.py [URL | --url URL] [--follow-cursor | --crawl [--connections N]]
+                                   [--conditional]
 Default URL: http://localhost:8080/dashboard/orders?page=1&page_size=20
+Run with --help for every option; unknown or conflicting flags are errors.
+
+--follow-cursor walks the whole dataset through pagination.next_cursor,
+validating every page and checking that each order appears exactly once.
+--crawl fetches every page by number in parallel over N persistent
+connections (default 16) and runs the same checks, plus page-size and
+total_orders/total_pages consistency across pages.
+--conditional re-requests every fetched page with If-None-Match and reports
+how many body bytes each 304 saved.
+
+--spec PATH validates with checks compiled from an OpenAPI spec (see
+spec_compiler.py) instead of the hand-written field tables below.
+
+Corpus:    python3 client_validator.py --corpus PATH [--workers N] [--spec PATH]
+--corpus validates recorded responses offline: PATH is a JSONL file with one
+response per line, or a directory of .json responses and .jsonl corpora.
+Work is spread over a process pool (default: one worker per CPU) and
+failures are reported grouped by field path, e.g. orders[*].items[*].quantity.
+
+Streaming: python3 client_validator.py --stream [--url URL]
+           python3 client_validator.py --file PATH [--ndjson]
+--stream validates the live response order by order while it downloads;
+--file does the same for a saved response ("-" reads stdin). Files ending in
+.ndjson/.jsonl, or any input with --ndjson, are read as one order per line.
+Memory stays bounded by one order plus one read chunk.
+
+Reports:   --format text|json|junit [--output FILE]
+text (default) prints each failure as it is found. json and junit print one
+aggregated report instead: failures are counted per field path pattern,
+with a few samples each. Without --output the report goes to stdout and
+progress lines to stderr.
 """
 
+import argparse
+import codecs
+import http.client
 import json
+import os
+import re
 import sys
+import threading
 import urllib.request
 import urllib.error
-from datetime import datetime
+import xml.etree.ElementTree as ET
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+import spec_compiler
 
 MOCK_SERVER_URL = "http://localhost:8080/dashboard/orders?page=1&page_size=20"
 
+# Parallel connections used by --crawl unless --connections says otherwise
+DEFAULT_CRAWL_CONNECTIONS = 16
+
+# Bytes read at a time by the streaming validator
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Work unit sizes for --corpus: bytes of a JSONL file, or number of .json files
+CORPUS_CHUNK_BYTES = 8 * 1024 * 1024
+CORPUS_FILES_PER_TASK = 256
+
 VALID_STATUSES = {"pending", "confirmed", "shipped", "delivered", "cancelled", "returned"}
 
 REQUIRED_ORDER_FIELDS = {
@@ -44,34 +96,189 @@ REQUIRED_PAGINATION_FIELDS = {
 }
 
 
-def fail(msg):
-    print(f"FAIL: {msg}")
-    return False
+_INDEX = re.compile(r"\[\d+\]")
+_MISSING_FIELD = re.compile(r"missing required field '([^']*)'")
+
+
+def path_pattern(path, detail):
+    """Group key of a failure: its path with indices folded, e.g. orders[*].status.
+
+    A missing field is grouped under its own path rather than its parent's.
+    """
+    missing = _MISSING_FIELD.search(detail)
+    if missing:
+        path = f"{path}.{missing.group(1)}" if path else missing.group(1)
+    return _INDEX.sub("[*]", path) if path else "(response)"
+
+
+class ResultCollector:
+    """Aggregated validation failures.
+
+    Each failure is a (path, detail) pair. It is counted under its
+    path_pattern, and only the first `max_samples` of each pattern keep
+    their text, as (location, path, detail) tuples. With `echo` every
+    failure is also printed as it happens, the classic text output.
+    """
+
+    def __init__(self, echo=True, max_samples=3):
+        self.echo = echo
+        self.max_samples = max_samples
+        self.records = 0
+        self.failed_records = 0
+        self.violations = 0
+        self.patterns = {}  # pattern -> [count, [(location, path, detail), ...]]
+        self.location = None
+        self._record_failed = True
+
+    def start_record(self, location):
+        """Count a new response; later failures are attributed to `location`."""
+        self.records += 1
+        self.location = location
+        self._record_failed = False
+
+    def set_location(self, location):
+        """Attribute later failures to `location` without counting a response."""
+        self.location = location
+        self._record_failed = True
+
+    def add(self, path, detail):
+        if self.echo:
+            print(f"FAIL: {path}: {detail}" if path else f"FAIL: {detail}")
+        self.violations += 1
+        if not self._record_failed:
+            self._record_failed = True
+            self.failed_records += 1
+        pattern = path_pattern(path, detail)
+        entry = self.patterns.get(pattern)
+        if entry is None:
+            entry = self.patterns[pattern] = [0, []]
+        entry[0] += 1
+        if len(entry[1]) < self.max_samples:
+            entry[1].append((self.location, path, detail))
+        return False
+
+    def state(self):
+        """Compact, picklable totals, for merge() in another process."""
+        return self.records, self.failed_records, self.violations, self.patterns
+
+    def merge(self, state):
+        records, failed_records, violations, patterns = state
+        self.records += records
+        self.failed_records += failed_records
+        self.violations += violations
+        for pattern, (count, samples) in patterns.items():
+            entry = self.patterns.setdefault(pattern, [0, []])
+            entry[0] += count
+            entry[1].extend(samples[:self.max_samples - len(entry[1])])
+
+    def reset(self):
+        self.__init__(self.echo, self.max_samples)
+
+    def sorted_patterns(self):
+        return sorted(self.patterns.items(), key=lambda item: (-item[1][0], item[0]))
+
+
+# Every fail() of this process lands here
+RESULTS = ResultCollector()
+
+# ETag and body size of every page fetched, by URL, for --conditional
+FETCHED_ETAGS = {}
+
+# Where progress lines go; None is whatever sys.stdout is at the time
+PROGRESS = None
+
+
+def fail(path, detail):
+    """Record a violation at `path` (e.g. "orders[3].status"); returns False."""
+    return RESULTS.add(path, detail)
+
+
+def progress(line):
+    print(line, file=PROGRESS or sys.stdout)
+
+
+def render_text(results):
+    lines = [f"Failures by path: {results.violations} in {results.failed_records} "
+             f"of {results.records} responses"]
+    for pattern, (count, samples) in results.sorted_patterns():
+        lines.append(f"  {count:>8}  {pattern}")
+        location, path, detail = samples[0]
+        text = f"{path}: {detail}" if path else detail
+        lines.append(f"            e.g. {location}: {text}" if location else f"            e.g. {text}")
+    return "\n".join(lines)
+
+
+def render_json(results, ok):
+    return json.dumps({
+        "ok": ok,
+        "records": results.records,
+        "failed_records": results.failed_records,
+        "violations": results.violations,
+        "failures": [
+            {
+                "path": pattern,
+                "count": count,
+                "samples": [
+                    {"location": location, "path": path, "message": detail}
+                    for location, path, detail in samples
+                ],
+            }
+            for pattern, (count, samples) in results.sorted_patterns()
+        ],
+    }, indent=2)
+
+
+def render_junit(results, ok):
+    """One testcase per failing path pattern, or one passing testcase."""
+    suite = ET.Element("testsuite", name="client_validator")
+    for pattern, (count, samples) in results.sorted_patterns():
+        case = ET.SubElement(suite, "testcase", classname="dashboard_orders", name=pattern)
+        failure = ET.SubElement(case, "failure", message=f"{count} violation(s) at {pattern}")
+        failure.text = "\n".join(
+            f"{location or '-'}: {path}: {detail}" if path else f"{location or '-'}: {detail}"
+            for location, path, detail in samples
+        )
+    if not results.patterns:
+        ET.SubElement(suite, "testcase", classname="dashboard_orders",
+                      name="validate_response" if ok else "validation")
+        if not ok:
+            ET.SubElement(suite[-1], "failure", message="validation failed")
+    suite.set("tests", str(len(suite)))
+    suite.set("failures", str(sum(1 for case in suite if len(case))))
+    root = ET.Element("testsuites")
+    root.append(suite)
+    return ET.tostring(root, encoding="unicode")
+
+
+REPORT_RENDERERS = {"json": render_json, "junit": render_junit}
+
+
+# Fast-path checks shared with the compiled validators (see bench_validators.py)
+is_iso8601 = spec_compiler.is_datetime
+is_uri = spec_compiler.is_uri
 
 
 def validate_iso8601(value, context):
-    try:
-        datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if isinstance(value, str) and is_iso8601(value):
         return True
-    except (ValueError, AttributeError):
-        return fail(f"{context}: '{value}' is not a valid ISO 8601 datetime")
+    return fail(context, f"'{value}' is not a valid ISO 8601 datetime")
 
 
 def validate_uri(value, context):
-    if not (value.startswith("http://") or value.startswith("https://")):
-        return fail(f"{context}: '{value}' is not a valid URI (must start with http:// or https://)")
-    return True
+    if isinstance(value, str) and is_uri(value):
+        return True
+    return fail(context, f"'{value}' is not a valid URI (must start with http:// or https://)")
 
 
 def validate_fields(obj, required_fields, context):
     ok = True
     for field, expected_type in required_fields.items():
         if field not in obj:
-            fail(f"{context}: missing required field '{field}'")
+            fail(context, f"missing required field '{field}'")
             ok = False
             continue
         if not isinstance(obj[field], expected_type):
-            fail(f"{context}.{field}: expected {expected_type.__name__}, got {type(obj[field]).__name__}")
+            fail(f"{context}.{field}", f"expected {expected_type.__name__}, got {type(obj[field]).__name__}")
             ok = False
     return ok
 
@@ -81,16 +288,25 @@ def validate_item(item, context):
     if not ok:
         return False
 
-    if not validate_uri(item["product_image_url"], f"{context}.product_image_url"):
-        ok = False
+    # validate_fields checked the type; the context is only built on failure
+    if not is_uri(item["product_image_url"]):
+        ok = validate_uri(item["product_image_url"], f"{context}.product_image_url")
 
     if item["quantity"] < 1:
-        fail(f"{context}.quantity: must be >= 1, got {item['quantity']}")
+        fail(f"{context}.quantity", f"must be >= 1, got {item['quantity']}")
         ok = False
 
     return ok
 
 
+def items_count_problem(order):
+    """Cross-field rule the spec cannot express: preview items <= total count."""
+    count, items = order.get("total_items_count"), order.get("items")
+    if type(count) is int and type(items) is list and count < len(items):
+        return f"total_items_count ({count}) < items length ({len(items)})"
+    return None
+
+
 def validate_order(order, index):
     context = f"orders[{index}]"
     ok = validate_fields(order, REQUIRED_ORDER_FIELDS, context)
@@ -99,26 +315,27 @@ def validate_order(order, index):
 
     # Validate status enum
     if order["status"] not in VALID_STATUSES:
-        fail(f"{context}.status: '{order['status']}' not in valid statuses {VALID_STATUSES}")
+        fail(f"{context}.status", f"'{order['status']}' not in valid statuses {VALID_STATUSES}")
         ok = False
 
     # Validate created_at is ISO 8601
-    if not validate_iso8601(order["created_at"], f"{context}.created_at"):
-        ok = False
+    if not is_iso8601(order["created_at"]):
+        ok = validate_iso8601(order["created_at"], f"{context}.created_at")
 
     # Validate total_items_count >= 1
     if order["total_items_count"] < 1:
-        fail(f"{context}.total_items_count: must be >= 1, got {order['total_items_count']}")
+        fail(f"{context}.total_items_count", f"must be >= 1, got {order['total_items_count']}")
         ok = False
 
     # Validate items array max 3
     if len(order["items"]) > 3:
-        fail(f"{context}.items: max 3 items allowed, got {len(order['items'])}")
+        fail(f"{context}.items", f"max 3 items allowed, got {len(order['items'])}")
         ok = False
 
     # Validate items count consistency
-    if order["total_items_count"] < len(order["items"]):
-        fail(f"{context}: total_items_count ({order['total_items_count']}) < items length ({len(order['items'])})")
+    problem = items_count_problem(order)
+    if problem:
+        fail(context, problem)
         ok = False
 
     # Validate each item
@@ -136,19 +353,25 @@ def validate_pagination(pagination):
         return False
 
     if pagination["page"] < 1:
-        fail(f"{context}.page: must be >= 1, got {pagination['page']}")
+        fail(f"{context}.page", f"must be >= 1, got {pagination['page']}")
         ok = False
 
     if pagination["page_size"] < 1 or pagination["page_size"] > 50:
-        fail(f"{context}.page_size: must be 1-50, got {pagination['page_size']}")
+        fail(f"{context}.page_size", f"must be 1-50, got {pagination['page_size']}")
         ok = False
 
     if pagination["total_orders"] < 0:
-        fail(f"{context}.total_orders: must be >= 0, got {pagination['total_orders']}")
+        fail(f"{context}.total_orders", f"must be >= 0, got {pagination['total_orders']}")
         ok = False
 
     if pagination["total_pages"] < 0:
-        fail(f"{context}.total_pages: must be >= 0, got {pagination['total_pages']}")
+        fail(f"{context}.total_pages", f"must be >= 0, got {pagination['total_pages']}")
+        ok = False
+
+    # Optional keyset cursor: a string, or null on the last page
+    next_cursor = pagination.get("next_cursor")
+    if next_cursor is not None and (not isinstance(next_cursor, str) or not next_cursor):
+        fail(f"{context}.next_cursor", f"expected non-empty string or null, got {next_cursor!r}")
         ok = False
 
     return ok
@@ -159,19 +382,19 @@ def validate_response(data):
 
     # Top-level required fields
     if "orders" not in data:
-        return fail("Response missing required field 'orders'")
+        return fail("", "Response missing required field 'orders'")
     if "pagination" not in data:
-        return fail("Response missing required field 'pagination'")
+        return fail("", "Response missing required field 'pagination'")
 
     if not isinstance(data["orders"], list):
-        return fail(f"'orders' must be an array, got {type(data['orders']).__name__}")
+        return fail("orders", f"must be an array, got {type(data['orders']).__name__}")
     if not isinstance(data["pagination"], dict):
-        return fail(f"'pagination' must be an object, got {type(data['pagination']).__name__}")
+        return fail("pagination", f"must be an object, got {type(data['pagination']).__name__}")
 
     # Validate each order
     for i, order in enumerate(data["orders"]):
         if not isinstance(order, dict):
-            fail(f"orders[{i}]: expected object, got {type(order).__name__}")
+            fail(f"orders[{i}]", f"expected object, got {type(order).__name__}")
             ok = False
             continue
         if not validate_order(order, i):
@@ -184,55 +407,724 @@ def validate_response(data):
     return ok
 
 
-def main():
-    url = sys.argv[1] if len(sys.argv) > 1 and not sys.argv[1].startswith("--") else None
-    if url is None:
-        for i, arg in enumerate(sys.argv[1:], 1):
-            if arg == "--url" and i < len(sys.argv) - 1:
-                url = sys.argv[i + 1]
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_DECODER = json.JSONDecoder()
+
+# A decode error this close to the end of the buffer may just be a value cut
+# off by the chunk boundary: "-Infinity", "1.5e+", a \uXXXX escape.
+_TRUNCATED_TAIL = 12
+
+
+class _JSONStream:
+    """Incrementally decoded text buffer over a binary stream.
+
+    Consumed text is dropped on every refill, so the buffer never holds
+    more than the value being decoded plus one chunk.
+    """
+
+    def __init__(self, stream, chunk_size):
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.decoder = codecs.getincrementaldecoder("utf-8")()
+        self.buf = ""
+        self.pos = 0
+        self.dropped = 0
+        self.eof = False
+
+    def _fill(self):
+        """Read one more chunk; return False once the stream is exhausted."""
+        if self.eof:
+            return False
+        chunk = self.stream.read(self.chunk_size)
+        try:
+            text = self.decoder.decode(chunk, final=not chunk)
+        except UnicodeDecodeError as e:
+            raise ValueError(f"invalid UTF-8 near offset {self.dropped + len(self.buf)}: {e.reason}")
+        self.dropped += self.pos
+        self.buf = self.buf[self.pos:] + text
+        self.pos = 0
+        if not chunk:
+            self.eof = True
+        return bool(chunk)
+
+    def peek(self):
+        """Skip whitespace and return the next character, or "" at the end."""
+        while True:
+            self.pos = _WHITESPACE.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, char):
+        got = self.peek()
+        if got != char:
+            raise ValueError(f"expected '{char}' at offset {self.dropped + self.pos}, got {got or 'end of input'!r}")
+        self.pos += 1
+
+    def value(self):
+        """Decode the next complete JSON value."""
+        self.peek()
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError as e:
+                # Only a value cut off by the end of the buffer is worth
+                # another chunk; refilling on every error would pull the
+                # rest of a malformed response into memory.
+                truncated = (e.msg.startswith("Unterminated string")
+                             or len(self.buf) - e.pos < _TRUNCATED_TAIL)
+                if truncated and self._fill():
+                    continue
+                raise ValueError(f"{e.msg} at offset {self.dropped + e.pos}")
+            # A number or literal at the very end may continue in the next chunk
+            if end == len(self.buf) and self._fill():
+                continue
+            self.pos = end
+            return value
+
+
+def iter_response_members(stream, chunk_size=STREAM_CHUNK_SIZE, stream_keys=("orders",)):
+    """Yield (key, index, value) for each top-level member of a JSON object.
+
+    Arrays under `stream_keys` are not decoded whole: the member is reported
+    once as (key, None, []) and then each element as (key, index, element).
+    Every other member is decoded whole as (key, None, value). Raises
+    ValueError on malformed JSON.
+    """
+    js = _JSONStream(stream, chunk_size)
+    js.expect("{")
+    if js.peek() == "}":
+        js.pos += 1
+    else:
+        while True:
+            key = js.value()
+            if not isinstance(key, str):
+                raise ValueError(f"object key must be a string, got {key!r}")
+            js.expect(":")
+            if key in stream_keys and js.peek() == "[":
+                js.pos += 1
+                yield key, None, []
+                index = 0
+                if js.peek() == "]":
+                    js.pos += 1
+                else:
+                    while True:
+                        yield key, index, js.value()
+                        index += 1
+                        if js.peek() == "]":
+                            js.pos += 1
+                            break
+                        js.expect(",")
+            else:
+                yield key, None, js.value()
+            if js.peek() == "}":
+                js.pos += 1
                 break
-    if url is None:
-        url = MOCK_SERVER_URL
+            js.expect(",")
+    if js.peek():
+        raise ValueError(f"unexpected data after the response object at offset {js.dropped + js.pos}")
 
-    print(f"Fetching: {url}")
 
+def validate_stream(stream, chunk_size=STREAM_CHUNK_SIZE):
+    """Validate a response read from a binary stream, one order at a time.
+
+    Applies the same checks as validate_response without holding the whole
+    body or order list in memory. Returns (ok, orders seen, pagination).
+    """
+    ok = True
+    count = 0
+    pagination = None
+    seen = set()
+    try:
+        for key, index, value in iter_response_members(stream, chunk_size):
+            seen.add(key)
+            if key == "orders" and index is None:
+                if not isinstance(value, list):
+                    ok = fail("orders", f"must be an array, got {type(value).__name__}")
+            elif key == "orders":
+                count += 1
+                if not isinstance(value, dict):
+                    ok = fail(f"orders[{index}]", f"expected object, got {type(value).__name__}")
+                elif not validate_order(value, index):
+                    ok = False
+            elif key == "pagination":
+                pagination = value
+                if not isinstance(value, dict):
+                    ok = fail("pagination", f"must be an object, got {type(value).__name__}")
+                elif not validate_pagination(value):
+                    ok = False
+    except ValueError as e:
+        return fail("", f"Response is not valid JSON: {e}"), count, pagination
+
+    if "orders" not in seen:
+        ok = fail("", "Response missing required field 'orders'")
+    if "pagination" not in seen:
+        ok = fail("", "Response missing required field 'pagination'")
+    return ok, count, pagination
+
+
+def validate_ndjson(stream):
+    """Validate newline-delimited JSON with one order per line.
+
+    Returns (ok, orders seen). Only one line is held in memory at a time.
+    """
+    ok = True
+    count = 0
+    for line_number, line in enumerate(stream, 1):
+        if not line.strip():
+            continue
+        try:
+            order = json.loads(line)
+        except (UnicodeDecodeError, json.JSONDecodeError) as e:
+            ok = fail("", f"line {line_number}: not valid JSON: {e}")
+            continue
+        if not isinstance(order, dict):
+            ok = fail("", f"line {line_number}: expected object, got {type(order).__name__}")
+        elif not validate_order(order, count):
+            ok = False
+        count += 1
+    return ok, count
+
+
+def open_stream(url):
+    """Open `url` for streaming; exit with FAIL on connection or header errors."""
+    try:
+        resp = urllib.request.urlopen(
+            urllib.request.Request(url, headers={"Accept": "application/json, application/x-ndjson"}),
+            timeout=10,
+        )
+    except urllib.error.URLError as e:
+        fail("", f"Could not connect to {url}: {e}")
+        sys.exit(1)
+    content_type = resp.headers.get("Content-Type", "")
+    if "json" not in content_type:
+        fail("", f"Expected Content-Type application/json, got '{content_type}'")
+        sys.exit(1)
+    return resp
+
+
+def run_streaming(url, path, ndjson):
+    """Stream-validate a live URL (path None) or a saved file; return (ok, summary lines)."""
+    if path is None:
+        progress(f"Streaming: {url}")
+        stream = open_stream(url)
+        ndjson = ndjson or "ndjson" in stream.headers.get("Content-Type", "")
+    else:
+        progress(f"Reading: {path}")
+        stream = sys.stdin.buffer if path == "-" else open(path, "rb")
+        ndjson = ndjson or path.endswith((".ndjson", ".jsonl"))
+    RESULTS.start_record(url if path is None else path)
+    with stream:
+        if ndjson:
+            ok, count = validate_ndjson(stream)
+            return ok, [f"Orders: {count} (NDJSON)"]
+        ok, count, pagination = validate_stream(stream)
+    summary = [f"Orders: {count}"]
+    if isinstance(pagination, dict):
+        summary.append(f"Page: {pagination.get('page')}/{pagination.get('total_pages')}")
+    return ok, summary
+
+
+def corpus_tasks(root):
+    """Split a corpus into work units for validate_corpus_task.
+
+    A .jsonl/.ndjson file becomes ("lines", path, start, end) byte ranges;
+    .json files are grouped into ("files", [paths]) batches. A single file
+    of any other name is read as JSONL.
+    """
+    if os.path.isdir(root):
+        paths = sorted(os.path.join(d, f) for d, _, files in os.walk(root) for f in files)
+    else:
+        paths = [root]
+    batch = []
+    for path in paths:
+        if path.endswith(".json"):
+            batch.append(path)
+            if len(batch) == CORPUS_FILES_PER_TASK:
+                yield ("files", batch)
+                batch = []
+        elif path.endswith((".jsonl", ".ndjson")) or path == root:
+            size = os.path.getsize(path)
+            for start in range(0, size, CORPUS_CHUNK_BYTES):
+                yield ("lines", path, start, min(start + CORPUS_CHUNK_BYTES, size))
+    if batch:
+        yield ("files", batch)
+
+
+def init_corpus_worker(spec_path=None):
+    """Process pool initializer: aggregate failures quietly instead of printing them."""
+    RESULTS.echo = False
+    if spec_path is not None:
+        use_spec(spec_path)
+
+
+def _iter_task_records(task):
+    """Yield (location, raw JSON bytes) for every record in a work unit."""
+    if task[0] == "files":
+        for path in task[1]:
+            with open(path, "rb") as f:
+                yield path, f.read()
+        return
+    _, path, start, end = task
+    with open(path, "rb") as f:
+        # A range owns the lines that start inside it
+        if start:
+            f.seek(start - 1)
+            f.readline()
+        offset = f.tell()
+        while offset < end:
+            line = f.readline()
+            if not line:
+                break
+            if line.strip():
+                yield f"{path}@{offset}", line
+            offset += len(line)
+
+
+def validate_corpus_task(task):
+    """Validate one work unit with validate_response; return RESULTS.state() for it."""
+    RESULTS.reset()
+    for location, raw in _iter_task_records(task):
+        RESULTS.start_record(location)
+        try:
+            data = json.loads(raw)
+        except (UnicodeDecodeError, json.JSONDecodeError) as e:
+            fail("", f"Response is not valid JSON: {e}")
+        else:
+            if isinstance(data, dict):
+                validate_response(data)
+            else:
+                fail("", f"Response must be an object, got {type(data).__name__}")
+    return RESULTS.state()
+
+
+def validate_corpus(root, workers=None, spec_path=None):
+    """Validate every response in a corpus over a process pool; return ok.
+
+    Worker results are merged into RESULTS, so the report covers the whole
+    corpus. Failures are not echoed one by one, only summarized.
+    """
+    if not os.path.exists(root):
+        return fail("--corpus", f"{root} does not exist")
+    workers = workers or os.cpu_count() or 1
+    tasks = 0
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_corpus_worker,
+                             initargs=(spec_path,)) as pool:
+        for state in pool.map(validate_corpus_task, corpus_tasks(root)):
+            tasks += 1
+            RESULTS.merge(state)
+
+    progress(f"Corpus: {RESULTS.records} responses in {tasks} tasks over {workers} workers, "
+             f"{RESULTS.failed_records} failed")
+    if RESULTS.records == 0:
+        return fail("--corpus", f"no responses found in {root}")
+    return RESULTS.failed_records == 0
+
+
+def use_spec(spec_path):
+    """Replace the hand-written validators with ones compiled from `spec_path`.
+
+    Every mode (first page, crawl, cursor walk, streaming) picks them up,
+    since they look the validators up as module globals. The compiled checks
+    are exactly the spec's, plus items_count_problem on every Order.
+    """
+    global validate_response, validate_order, validate_pagination
+    compiled = spec_compiler.load_validators(spec_path, fail, object_checks={"Order": items_count_problem})
+
+    def validate_spec_order(order, index):
+        return compiled.validate_order(order, f"orders[{index}]")
+
+    def validate_spec_pagination(pagination):
+        return compiled.validate_pagination(pagination, "pagination")
+
+    validate_response = compiled.validate_response
+    validate_order = validate_spec_order
+    validate_pagination = validate_spec_pagination
+
+
+def with_cursor(url, cursor):
+    """Return `url` with its page parameter replaced by `cursor`."""
+    parts = urlsplit(url)
+    query = [(k, v) for k, v in parse_qsl(parts.query) if k not in ("page", "cursor")]
+    query.append(("cursor", cursor))
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+def with_page(url, page):
+    """Return `url` with its page parameter set to `page` and any cursor removed."""
+    parts = urlsplit(url)
+    query = [(k, v) for k, v in parse_qsl(parts.query) if k not in ("page", "cursor")]
+    query.append(("page", str(page)))
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+def fetch_json(url):
+    """GET `url` and return the decoded JSON body; exit with FAIL on any error."""
     try:
         req = urllib.request.Request(url, headers={"Accept": "application/json"})
         with urllib.request.urlopen(req, timeout=10) as resp:
             if resp.status != 200:
-                print(f"FAIL: Expected HTTP 200, got {resp.status}")
+                fail("", f"Expected HTTP 200, got {resp.status}")
                 sys.exit(1)
 
             content_type = resp.headers.get("Content-Type", "")
             if "application/json" not in content_type:
-                print(f"FAIL: Expected Content-Type application/json, got '{content_type}'")
+                fail("", f"Expected Content-Type application/json, got '{content_type}'")
                 sys.exit(1)
 
-            body = resp.read().decode("utf-8")
+            raw = resp.read()
+            etag = resp.headers.get("ETag")
+            if etag:
+                FETCHED_ETAGS[url] = (etag, len(raw))
+            body = raw.decode("utf-8")
 
     except urllib.error.URLError as e:
-        print(f"FAIL: Could not connect to {url}: {e}")
+        fail("", f"Could not connect to {url}: {e}")
         sys.exit(1)
 
     try:
-        data = json.loads(body)
+        return json.loads(body)
     except json.JSONDecodeError as e:
-        print(f"FAIL: Response is not valid JSON: {e}")
+        fail("", f"Response is not valid JSON: {e}")
         sys.exit(1)
 
-    print(f"Response received: {len(data.get('orders', []))} orders")
-    print("---")
 
-    if validate_response(data):
-        print("---")
-        print("PASS: All validations passed.")
-        print(f"  Orders: {len(data['orders'])}")
-        print(f"  Page: {data['pagination']['page']}/{data['pagination']['total_pages']}")
-        sys.exit(0)
-    else:
-        print("---")
-        print("FAIL: Validation errors found (see above).")
+def revalidate(url, etag, full_size):
+    """Re-request `url` with If-None-Match; return (status, body bytes saved)."""
+    req = urllib.request.Request(url, headers={"Accept": "application/json", "If-None-Match": etag})
+    try:
+        with urllib.request.urlopen(req, timeout=10) as resp:
+            status, body = resp.status, resp.read()
+    except urllib.error.HTTPError as e:
+        # urllib reports 304 as an error; it is the outcome we want
+        status, body = e.code, e.read()
+    except urllib.error.URLError as e:
+        fail("", f"Could not connect to {url}: {e}")
         sys.exit(1)
+    return status, full_size - len(body)
+
+
+def check_conditional_requests():
+    """Revalidate every fetched page and report the bytes each request saved."""
+    if not FETCHED_ETAGS:
+        return fail("--conditional", "server sent no ETag header")
+    ok = True
+    total_saved = 0
+    for url, (etag, full_size) in FETCHED_ETAGS.items():
+        status, saved = revalidate(url, etag, full_size)
+        if status != 304:
+            RESULTS.set_location(url)
+            ok = fail("If-None-Match", f"expected 304 for ETag {etag}, got {status}")
+            continue
+        total_saved += saved
+        progress(f"  304 Not Modified: saved {saved} of {full_size} body bytes ({url})")
+    progress(f"Conditional requests: {len(FETCHED_ETAGS)}, body bytes saved: {total_saved}")
+    return ok
+
+
+def follow_cursor(url, first_page):
+    """Walk every page through next_cursor, validating each one.
+
+    Checks that no order_id repeats and that the walk visits exactly
+    pagination.total_orders orders.
+    """
+    ok = True
+    seen = set()
+    data = first_page
+    pages = 1
+    while True:
+        for i, order in enumerate(data["orders"]):
+            order_id = order.get("order_id") if isinstance(order, dict) else None
+            if order_id in seen:
+                ok = fail(f"orders[{i}].order_id", f"'{order_id}' on page {pages} already seen on an earlier page")
+            seen.add(order_id)
+
+        cursor = data["pagination"].get("next_cursor")
+        if not cursor:
+            break
+        page_url = with_cursor(url, cursor)
+        data = fetch_json(page_url)
+        pages += 1
+        RESULTS.start_record(page_url)
+        if not validate_response(data):
+            ok = fail("", f"page {pages}: response failed validation (cursor {cursor})")
+            break
+
+    total_orders = first_page["pagination"]["total_orders"]
+    if ok and len(seen) != total_orders:
+        RESULTS.set_location(url)
+        ok = fail("pagination.total_orders", f"is {total_orders}, but the cursor walk visited {len(seen)} orders")
+    progress(f"Cursor walk: {pages} pages, {len(seen)} unique orders")
+    return ok
+
+
+class PageFetcher:
+    """Fetch pages over persistent connections, one per worker thread.
+
+    Unlike fetch_json, errors are returned rather than exiting, so a crawl
+    can report every broken page.
+    """
+
+    def __init__(self, url):
+        parts = urlsplit(url)
+        self.connection_class = (
+            http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+        )
+        self.netloc = parts.netloc
+        self.local = threading.local()
+
+    def _connection(self):
+        conn = getattr(self.local, "conn", None)
+        if conn is None:
+            conn = self.local.conn = self.connection_class(self.netloc, timeout=10)
+        return conn
+
+    def fetch(self, url):
+        """Return (data, etag, body size, error); error is None on success."""
+        parts = urlsplit(url)
+        target = urlunsplit(("", "", parts.path or "/", parts.query, ""))
+        for attempt in (1, 2):
+            conn = self._connection()
+            try:
+                conn.request("GET", target, headers={"Accept": "application/json"})
+                resp = conn.getresponse()
+                raw = resp.read()
+                break
+            except (OSError, http.client.HTTPException) as e:
+                # The server may close an idle keep-alive connection; retry once fresh
+                conn.close()
+                self.local.conn = None
+                if attempt == 2:
+                    return None, None, 0, f"Could not fetch {url}: {e}"
+        if resp.will_close:
+            conn.close()
+            self.local.conn = None
+        if resp.status != 200:
+            return None, None, 0, f"Expected HTTP 200, got {resp.status} for {url}"
+        content_type = resp.headers.get("Content-Type", "")
+        if "application/json" not in content_type:
+            return None, None, 0, f"Expected Content-Type application/json, got '{content_type}' for {url}"
+        try:
+            return json.loads(raw.decode("utf-8")), resp.headers.get("ETag"), len(raw), None
+        except (UnicodeDecodeError, json.JSONDecodeError) as e:
+            return None, None, 0, f"Response for {url} is not valid JSON: {e}"
+
+
+def crawl(url, first_page, connections=DEFAULT_CRAWL_CONNECTIONS):
+    """Fetch every page by number in parallel and validate the whole dataset.
+
+    Pages are fetched by a bounded pool of `connections` threads, each with
+    its own keep-alive connection, and validated in this thread as they
+    arrive, so failure output is never interleaved. At most a few pages per
+    connection are in flight, which keeps memory bounded on huge datasets.
+    Checks every page with validate_response, that each page agrees with
+    page 1 on page_size/total_orders/total_pages and holds the expected
+    number of orders, that no order_id repeats, and that the crawl sees
+    exactly total_orders orders.
+    """
+    pagination = first_page["pagination"]
+    page_size = pagination["page_size"]
+    total_orders = pagination["total_orders"]
+    total_pages = pagination["total_pages"]
+    first_number = pagination["page"]
+
+    ok = True
+    seen = {}  # order_id -> page it first appeared on
+
+    def check_page(number, data):
+        nonlocal ok
+        got = data["pagination"]
+        for field, expected in (("page", number), ("page_size", page_size),
+                                ("total_orders", total_orders), ("total_pages", total_pages)):
+            if got[field] != expected:
+                ok = fail(f"pagination.{field}", f"is {got[field]} on page {number}, expected {expected}")
+        expected_count = min(page_size, max(0, total_orders - (number - 1) * page_size))
+        if len(data["orders"]) != expected_count:
+            ok = fail("orders", f"{len(data['orders'])} orders on page {number}, expected {expected_count}")
+        for i, order in enumerate(data["orders"]):
+            order_id = order.get("order_id") if isinstance(order, dict) else None
+            if order_id in seen:
+                ok = fail(f"orders[{i}].order_id", f"'{order_id}' on page {number} already seen on page {seen[order_id]}")
+            else:
+                seen[order_id] = number
+
+    check_page(first_number, first_page)
+
+    fetcher = PageFetcher(url)
+    numbers = iter(n for n in range(1, total_pages + 1) if n != first_number)
+    window = connections * 4
+    pending = {}
+    with ThreadPoolExecutor(max_workers=connections) as pool:
+        while True:
+            for number in numbers:
+                page_url = with_page(url, number)
+                pending[pool.submit(fetcher.fetch, page_url)] = (number, page_url)
+                if len(pending) >= window:
+                    break
+            if not pending:
+                break
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                number, page_url = pending.pop(future)
+                data, etag, size, error = future.result()
+                RESULTS.start_record(page_url)
+                if error:
+                    ok = fail("", f"page {number}: {error}")
+                    continue
+                if etag:
+                    FETCHED_ETAGS[page_url] = (etag, size)
+                if not validate_response(data):
+                    ok = fail("", f"page {number}: response failed validation")
+                    continue
+                check_page(number, data)
+
+    RESULTS.set_location(url)
+    if len(seen) < total_orders:
+        ok = fail("pagination.total_orders", f"is {total_orders}, but the crawl is missing "
+                                             f"{total_orders - len(seen)} orders ({len(seen)} unique)")
+    elif len(seen) > total_orders:
+        ok = fail("pagination.total_orders", f"is {total_orders}, but the crawl saw {len(seen)} unique orders")
+    progress(f"Crawl: {total_pages} pages over {connections} connections, {len(seen)} unique orders")
+    return ok
+
+
+def validate_url(url, follow=False, crawl_pages=False, conditional=False,
+                 connections=DEFAULT_CRAWL_CONNECTIONS):
+    """Validate the first page at `url`, then walk the cursors (`follow`), fetch
+    every page (`crawl_pages`) and revalidate with ETags (`conditional`) as
+    requested; return (ok, summary lines)."""
+    progress(f"Fetching: {url}")
+    data = fetch_json(url)
+
+    progress(f"Response received: {len(data.get('orders', []))} orders")
+    progress("---")
+
+    RESULTS.start_record(url)
+    ok = validate_response(data)
+    if ok and follow:
+        ok = follow_cursor(url, data)
+    if ok and crawl_pages:
+        ok = crawl(url, data, connections)
+    if ok and conditional:
+        ok = check_conditional_requests()
+    if not ok:
+        return False, []
+    return True, [f"Orders: {len(data['orders'])}",
+                  f"Page: {data['pagination']['page']}/{data['pagination']['total_pages']}"]
+
+
+def write_report(report_format, ok, summary, stream):
+    """Print the final verdict (text) or the aggregated report (json/junit)."""
+    if report_format in REPORT_RENDERERS:
+        stream.write(REPORT_RENDERERS[report_format](RESULTS, ok) + "\n")
+        return
+    if not RESULTS.echo and RESULTS.patterns:
+        stream.write(render_text(RESULTS) + "\n")
+    lines = ["---"]
+    if ok:
+        lines.append("PASS: All validations passed.")
+        lines.extend(f"  {line}" for line in summary)
+    else:
+        lines.append("FAIL: Validation errors found (see above).")
+    stream.write("\n".join(lines) + "\n")
+
+
+def build_parser():
+    # No abbreviations: a mistyped flag such as --craw must be an error
+    parser = argparse.ArgumentParser(
+        description="Validate GET /dashboard/orders responses against final_api_spec.yaml.",
+        allow_abbrev=False)
+    parser.add_argument("url", nargs="?", help=f"URL of the page to validate (default: {MOCK_SERVER_URL})")
+    parser.add_argument("--url", dest="url_option", metavar="URL", help="Same as the positional URL")
+
+    live = parser.add_argument_group("URL checks")
+    live.add_argument("--follow-cursor", action="store_true",
+                      help="Walk the whole dataset through pagination.next_cursor")
+    live.add_argument("--crawl", action="store_true", help="Fetch every page by number in parallel")
+    live.add_argument("--connections", type=int, default=DEFAULT_CRAWL_CONNECTIONS,
+                      help=f"Persistent connections for --crawl (default: {DEFAULT_CRAWL_CONNECTIONS})")
+    live.add_argument("--conditional", action="store_true",
+                      help="Re-request every fetched page with If-None-Match")
+
+    modes = parser.add_mutually_exclusive_group()
+    modes.add_argument("--corpus", metavar="PATH",
+                       help="Validate recorded responses: a JSONL file or a directory of .json/.jsonl")
+    modes.add_argument("--stream", action="store_true", help="Validate the live response while it downloads")
+    modes.add_argument("--file", metavar="PATH", help='Validate a saved response ("-" reads stdin)')
+    parser.add_argument("--ndjson", action="store_true",
+                        help="With --stream or --file, read one order per line")
+    parser.add_argument("--workers", type=int, help="Processes for --corpus (default: one per CPU)")
+    parser.add_argument("--spec", metavar="PATH",
+                        help="Validate with checks compiled from an OpenAPI spec")
+    parser.add_argument("--format", choices=["text", *REPORT_RENDERERS], default="text",
+                        help="Report format (default: text)")
+    parser.add_argument("--output", metavar="FILE", help="Write the report to FILE instead of stdout")
+    return parser
+
+
+def run_checks(args, url):
+    """Run the checks selected on the command line; return (ok, summary lines)."""
+    ok, summary = False, []
+    try:
+        if args.spec is not None:
+            try:
+                use_spec(args.spec)
+            except (OSError, spec_compiler.SpecError) as e:
+                fail("--spec", f"Could not compile spec: {e}")
+                sys.exit(1)
+
+        if args.corpus is not None:
+            RESULTS.echo = False
+            ok = validate_corpus(args.corpus, args.workers, args.spec)
+        elif args.file is not None or args.stream:
+            ok, summary = run_streaming(url, args.file, args.ndjson)
+        else:
+            ok, summary = validate_url(url, args.follow_cursor, args.crawl, args.conditional,
+                                       args.connections)
+    except SystemExit as e:
+        # Fatal errors (connection, HTTP status, invalid spec) are already recorded
+        if e.code not in (None, 1):
+            raise
+    return ok, summary
+
+
+def main(argv=None):
+    global PROGRESS
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.url and args.url_option:
+        parser.error("give the URL either positionally or with --url, not both")
+    url = args.url or args.url_option or MOCK_SERVER_URL
+    offline = args.corpus is not None or args.stream or args.file is not None
+    if offline and (args.follow_cursor or args.crawl or args.conditional):
+        parser.error("--follow-cursor, --crawl and --conditional cannot be combined with "
+                     "--corpus, --stream or --file")
+    if args.ndjson and not (args.stream or args.file is not None):
+        parser.error("--ndjson requires --stream or --file")
+    if args.workers is not None and args.corpus is None:
+        parser.error("--workers requires --corpus")
+    if args.connections < 1 or (args.workers is not None and args.workers < 1):
+        parser.error("--connections and --workers must be at least 1")
+
+    report_format, output = args.format, args.output
+    report_stream = open(output, "w") if output else sys.stdout
+    echo, progress_stream = RESULTS.echo, PROGRESS
+    if report_format != "text":
+        # The report is the output; failures are only aggregated, and
+        # progress lines must not mix into a report written to stdout
+        RESULTS.echo = False
+        if not output:
+            PROGRESS = sys.stderr
+
+    try:
+        ok, summary = run_checks(args, url)
+        write_report(report_format, ok, summary, report_stream)
+    finally:
+        RESULTS.echo, PROGRESS = echo, progress_stream
+        if output:
+            report_stream.close()
+    sys.exit(0 if ok else 1)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,534 @@
+#!/usr/bin/env python3
+"""
+Contract drift check: spec vs. mock server vs. client validators.
+Python stdlib only; Node.js, when installed, runs client_validator.js.
+
+For every version directory (final_api_spec.yaml + mock_server.py) the
+matching server is imported and driven in-process: its DashboardHandler
+answers generated requests into an in-memory wfile, so no socket is opened.
+Requests come from the spec's query parameters: random in-range values,
+out-of-range probes when the spec documents a 400, and next_cursor walks.
+Each 200 body is checked by validators compiled from that version's spec.
+
+The validators of the directory are then held against the same spec:
+client_validator.py by its field tables, its status list and its verdict on
+every sampled page; client_validator.js by its status list and a full run
+under Node, with fetch() answered by the in-process server.
+
+Every disagreement is reported, grouped by field path, in one run. Exits 1
+if there is any.
+
+Usage:
+    python contract_drift.py                       # every case-02 version next to this one
+    python contract_drift.py ../case-02-final-api-spec-discussion-v3 --pages 5000
+    python contract_drift.py --json --no-js
+"""
+
+import argparse
+import glob
+import http.client
+import importlib.util
+import io
+import json
+import os
+import random
+import re
+import shutil
+import subprocess
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from urllib.parse import urlencode, urlsplit
+
+import client_validator
+import spec_compiler
+from client_validator import ResultCollector
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SPEC_FILE = "final_api_spec.yaml"
+SERVER_FILE = "mock_server.py"
+
+DEFAULT_PAGES = 2000
+CURSOR_WALKS = 20
+MAX_WALK_PAGES = 1000
+# Upper bound for sampled integers the spec leaves unbounded (page, offset)
+OPEN_RANGE = 200
+EPOCH = datetime(2020, 1, 1, tzinfo=timezone.utc)
+
+# client_validator.py field tables, by the spec component they mirror
+PY_TABLES = {
+    "Order": "REQUIRED_ORDER_FIELDS",
+    "OrderItem": "REQUIRED_ITEM_FIELDS",
+    "Pagination": "REQUIRED_PAGINATION_FIELDS",
+}
+PY_TYPE_NAMES = {str: "string", int: "integer", float: "number", bool: "boolean",
+                 list: "array", dict: "object"}
+
+_JS_STATUSES = re.compile(r"const\s+VALID_STATUSES\s*=\s*\[([^\]]*)\]")
+_JS_STRING = re.compile(r"""["']([^"']*)["']""")
+_JS_FAIL = re.compile(r"FAIL:\s*(.*)")
+
+# Preloaded into client_validator.js: fetch() renders through this script
+JS_FETCH_STUB = """
+const { execFileSync } = require("child_process");
+const [python, tool, directory, script] = JSON.parse(process.env.CONTRACT_DRIFT);
+globalThis.fetch = async (url) => {
+  const out = execFileSync(python, [tool, "--render", directory, String(url)]);
+  const { status, headers, body } = JSON.parse(out.toString("utf8"));
+  return {
+    status,
+    ok: status >= 200 && status < 300,
+    headers: { get: (name) => headers[name.toLowerCase()] ?? null },
+    text: async () => body,
+    json: async () => JSON.parse(body),
+  };
+};
+require(script);
+"""
+
+
+def discover_versions(root=os.path.dirname(HERE)):
+    """Sibling case-02 directories holding both a spec and a server, sorted."""
+    pattern = os.path.join(root, "case-02-final-api-spec-discussion*")
+    return sorted(
+        d for d in glob.glob(pattern)
+        if os.path.isfile(os.path.join(d, SPEC_FILE)) and os.path.isfile(os.path.join(d, SERVER_FILE))
+    )
+
+
+def version_label(directory):
+    suffix = os.path.basename(os.path.normpath(directory)).rpartition("-")[2]
+    return suffix if re.fullmatch(r"v\d+", suffix) else "v1"
+
+
+def load_server(directory):
+    """Import `directory`/mock_server.py under a name of its own."""
+    name = f"contract_drift_{version_label(directory)}_mock_server"
+    module_spec = importlib.util.spec_from_file_location(name, os.path.join(directory, SERVER_FILE))
+    module = importlib.util.module_from_spec(module_spec)
+    module_spec.loader.exec_module(module)
+    return module
+
+
+def render(server, target):
+    """Answer GET `target` with the server's own handler, without a socket.
+
+    Returns (status, {lower-case header: value}, body bytes).
+    """
+    handler_class = server.DashboardHandler
+    handler = handler_class.__new__(handler_class)
+    handler.command = "GET"
+    handler.path = target
+    handler.request_version = "HTTP/1.1"
+    handler.requestline = f"GET {target} HTTP/1.1"
+    handler.headers = http.client.HTTPMessage()
+    handler.client_address = ("contract-drift", 0)
+    handler.close_connection = True
+    handler.wfile = io.BytesIO()
+    handler.log_message = lambda format, *args: None
+    handler.do_GET()
+    head, _, body = handler.wfile.getvalue().partition(b"\r\n\r\n")
+    lines = head.decode("latin-1").split("\r\n")
+    status = int(lines[0].split()[1])
+    headers = {}
+    for line in lines[1:]:
+        name, _, value = line.partition(":")
+        headers[name.strip().lower()] = value.strip()
+    return status, headers, body
+
+
+def get_operation(spec):
+    """(path, GET operation) of the first path with a GET, as validated by spec_compiler."""
+    for path, path_item in (spec.get("paths") or {}).items():
+        operation = (path_item or {}).get("get")
+        if operation:
+            return path, operation
+    raise spec_compiler.SpecError("spec has no GET operation")
+
+
+def query_parameters(spec, operation):
+    """{name: schema} of the operation's query parameters, $refs resolved."""
+    params = {}
+    for param in operation.get("parameters") or []:
+        if param.get("in") == "query":
+            params[param["name"]] = resolve(spec, param.get("schema") or {})
+    return params
+
+
+def resolve(spec, schema):
+    while "$ref" in schema:
+        node = spec
+        for part in schema["$ref"][2:].split("/"):
+            node = node[part]
+        schema = node
+    return schema
+
+
+def is_positional(schema):
+    """page/offset: integers without an upper bound, replaced by a cursor."""
+    return schema.get("type") == "integer" and "maximum" not in schema
+
+
+def sample_value(schema, rng):
+    """A random value `schema` allows, as a query string, or None to leave it out."""
+    if "enum" in schema:
+        return str(rng.choice(schema["enum"]))
+    kind = schema.get("type")
+    if kind == "integer":
+        low = schema.get("minimum", 0)
+        return str(rng.randint(low, schema.get("maximum", low + OPEN_RANGE)))
+    if kind == "string" and schema.get("format") == "date-time":
+        moment = EPOCH + timedelta(seconds=rng.randrange(10 * 365 * 24 * 3600))
+        return moment.strftime("%Y-%m-%dT%H:%M:%SZ")
+    return None  # opaque strings (cursors) only come from responses
+
+
+def sample_queries(params, rng, count):
+    """`count` random queries, each parameter present with probability 1/2."""
+    for _ in range(count):
+        query = {}
+        for name, schema in params.items():
+            if rng.random() < 0.5:
+                value = sample_value(schema, rng)
+                if value is not None:
+                    query[name] = value
+        yield query
+
+
+def smallest_page_query(params):
+    """Every bounded integer (the page size) at its minimum, so a cursor walk spans pages."""
+    return {name: str(schema["minimum"]) for name, schema in params.items()
+            if schema.get("type") == "integer" and "minimum" in schema and "maximum" in schema}
+
+
+def invalid_queries(params):
+    """(query, reason) for values outside what each parameter allows."""
+    for name, schema in params.items():
+        if "minimum" in schema:
+            yield {name: str(schema["minimum"] - 1)}, f"{name} below minimum {schema['minimum']}"
+        if "maximum" in schema:
+            yield {name: str(schema["maximum"] + 1)}, f"{name} above maximum {schema['maximum']}"
+        if "enum" in schema:
+            yield {name: "not-in-enum"}, f"{name} not in enum"
+        if schema.get("type") == "integer":
+            yield {name: "x"}, f"{name} not an integer"
+
+
+def documented_statuses(operation):
+    return {str(code) for code in (operation.get("responses") or {})}
+
+
+class VersionCheck:
+    """Drive one version's server and validators against its spec."""
+
+    def __init__(self, directory, pages=DEFAULT_PAGES, seed=0, run_js=True):
+        self.directory = directory
+        self.label = version_label(directory)
+        self.pages = pages
+        self.seed = seed
+        self.run_js = run_js
+        self.spec_path = os.path.join(directory, SPEC_FILE)
+        with open(self.spec_path) as f:
+            self.spec = spec_compiler.load_yaml(f.read())
+        self.path, self.operation = get_operation(self.spec)
+        self.params = query_parameters(self.spec, self.operation)
+        self.statuses = documented_statuses(self.operation)
+        self.server = load_server(directory)
+        # One collector per party whose behaviour can drift from the spec
+        self.findings = {
+            "server": ResultCollector(echo=False),
+            "client_validator.py": ResultCollector(echo=False),
+            "client_validator.js": ResultCollector(echo=False),
+        }
+        self.validators = spec_compiler.load_validators(self.spec_path, self.findings["server"].add)
+        self.hand = self._hand_validator()
+        self.requests = 0
+        self.walked = 0
+        self.elapsed = 0.0
+        self.status_counts = {}
+        self.notes = []
+
+    def _hand_validator(self):
+        """client_validator.py, when it lives in this directory (only v1's does)."""
+        if os.path.abspath(self.directory) != HERE:
+            return None
+        return client_validator
+
+    def components(self):
+        return (self.spec.get("components") or {}).get("schemas") or {}
+
+    # --- server ---
+
+    def request(self, query):
+        target = f"{self.path}?{urlencode(query)}" if query else self.path
+        self.requests += 1
+        status, headers, body = render(self.server, target)
+        self.status_counts[status] = self.status_counts.get(status, 0) + 1
+        return target, status, headers, body
+
+    def check_page(self, query):
+        """Request `query`, check status and body; return the decoded page or None."""
+        target, status, headers, body = self.request(query)
+        server = self.findings["server"]
+        server.start_record(target)
+        if str(status) not in self.statuses:
+            server.add("", f"HTTP {status} for a valid request, spec documents {sorted(self.statuses)}")
+            return None
+        if status != 200:
+            return None
+        if "application/json" not in headers.get("content-type", ""):
+            server.add("", f"Content-Type '{headers.get('content-type', '')}', spec says application/json")
+            return None
+        try:
+            data = json.loads(body)
+        except ValueError as e:
+            server.add("", f"Response is not valid JSON: {e}")
+            return None
+        spec_ok = self.validators.validate_response(data)
+        self.check_echo(query, data)
+        if self.hand is not None:
+            self.check_hand_verdict(target, data, spec_ok)
+        return data
+
+    def check_echo(self, query, data):
+        """In-range paging parameters must come back unchanged in pagination."""
+        pagination = data.get("pagination") if isinstance(data, dict) else None
+        if not isinstance(pagination, dict):
+            return
+        for name, value in query.items():
+            if self.params[name].get("type") == "integer" and name in pagination:
+                if pagination[name] != int(value):
+                    self.findings["server"].add(
+                        f"pagination.{name}", f"is {pagination[name]!r} for {name}={value}")
+
+    def probe_invalid(self):
+        """Out-of-range values must be rejected, if the spec documents a 400."""
+        if "400" not in self.statuses:
+            self.notes.append("spec documents no 400 response; invalid parameters not probed")
+            return
+        server = self.findings["server"]
+        for query, reason in invalid_queries(self.params):
+            target, status, _, _ = self.request(query)
+            if status != 400:
+                server.start_record(target)
+                server.add(f"parameters.{next(iter(query))}", f"{reason}: HTTP {status}, spec documents 400")
+
+    def walk_cursors(self, rng):
+        """Follow next_cursor until the last page, from the smallest pages and random first pages."""
+        if "cursor" not in self.params:
+            return 0
+        pages = 0
+        # Random page sizes rarely split a small dataset; the smallest always does
+        queries = [smallest_page_query(self.params), *sample_queries(self.params, rng, CURSOR_WALKS)]
+        for query in queries:
+            query = {k: v for k, v in query.items() if not is_positional(self.params[k])}
+            data = self.check_page(query)
+            for _ in range(MAX_WALK_PAGES):
+                pagination = data.get("pagination") if isinstance(data, dict) else None
+                cursor = pagination.get("next_cursor") if isinstance(pagination, dict) else None
+                if not cursor:
+                    break
+                data = self.check_page(dict(query, cursor=cursor))
+                pages += 1
+        if not pages:
+            self.notes.append("no cursor walk went past its first page")
+        return pages
+
+    # --- validators ---
+
+    def check_hand_verdict(self, target, data, spec_ok):
+        """client_validator.py must pass exactly the pages the spec passes."""
+        found = self.findings["client_validator.py"]
+        scratch = ResultCollector(echo=False)
+        scratch.start_record(target)
+        saved, client_validator.RESULTS = client_validator.RESULTS, scratch
+        try:
+            hand_ok = client_validator.validate_response(data)
+        finally:
+            client_validator.RESULTS = saved
+        if spec_ok and not hand_ok:
+            found.merge(scratch.state())
+        elif hand_ok and not spec_ok:
+            found.start_record(target)
+            found.add("", "accepts a response the spec rejects")
+
+    def check_py_tables(self):
+        """client_validator.py's field tables and statuses against the spec."""
+        found = self.findings["client_validator.py"]
+        components = self.components()
+        found.set_location(os.path.join(self.directory, "client_validator.py"))
+        for component, table_name in PY_TABLES.items():
+            table = getattr(self.hand, table_name)
+            schema = resolve(self.spec, components.get(component) or {})
+            if not schema:
+                found.add(table_name, f"mirrors component {component}, which the spec does not define")
+                continue
+            properties = schema.get("properties") or {}
+            required = set(schema.get("required") or [])
+            for field, expected in table.items():
+                where = f"{component}.{field}"
+                if field not in properties:
+                    found.add(where, f"required by {table_name}, not defined by the spec")
+                    continue
+                if field not in required:
+                    found.add(where, f"required by {table_name}, optional in the spec")
+                spec_type = resolve(self.spec, properties[field]).get("type")
+                if PY_TYPE_NAMES.get(expected) != spec_type:
+                    found.add(where, f"{table_name} expects {expected.__name__}, spec type is {spec_type}")
+            for field in sorted(required - set(table)):
+                found.add(f"{component}.{field}", f"required by the spec, missing from {table_name}")
+        self.compare_statuses(found, "VALID_STATUSES", list(self.hand.VALID_STATUSES))
+
+    def spec_statuses(self):
+        order = resolve(self.spec, self.components().get("Order") or {})
+        status = resolve(self.spec, (order.get("properties") or {}).get("status") or {})
+        return status.get("enum")
+
+    def compare_statuses(self, found, name, statuses):
+        enum = self.spec_statuses()
+        if enum is None:
+            return
+        for status in sorted(set(statuses) - set(enum)):
+            found.add("Order.status", f"{name} accepts '{status}', not in the spec enum")
+        for status in sorted(set(enum) - set(statuses)):
+            found.add("Order.status", f"{name} rejects '{status}', which the spec allows")
+
+    def check_js(self):
+        script = os.path.join(self.directory, "client_validator.js")
+        if not os.path.isfile(script):
+            return
+        found = self.findings["client_validator.js"]
+        found.set_location(script)
+        with open(script) as f:
+            match = _JS_STATUSES.search(f.read())
+        if match:
+            self.compare_statuses(found, "VALID_STATUSES", _JS_STRING.findall(match.group(1)))
+        node = shutil.which("node")
+        if not self.run_js or node is None:
+            self.notes.append("client_validator.js not run" + ("" if self.run_js else " (--no-js)")
+                              + ("; Node.js not found" if node is None else ""))
+            return
+        env = dict(os.environ, CONTRACT_DRIFT=json.dumps(
+            [sys.executable, os.path.abspath(__file__), os.path.abspath(self.directory), script]))
+        proc = subprocess.run([node, "-e", JS_FETCH_STUB], env=env, capture_output=True,
+                              text=True, timeout=300)
+        found.start_record(script)
+        for line in proc.stdout.splitlines():
+            failure = _JS_FAIL.search(line)
+            if failure:
+                check = failure.group(1).strip()
+                head, _, rest = check.partition(" ")
+                if "." in head or "[" in head:
+                    found.add(head, rest)
+                else:
+                    found.add("", check)
+        if proc.returncode not in (0, 1):
+            found.add("", f"exited with status {proc.returncode}: {proc.stderr.strip()[-500:]}")
+
+    # --- run ---
+
+    def run(self):
+        started = time.perf_counter()
+        rng = random.Random(self.seed)
+        self.check_page({})
+        for query in sample_queries(self.params, rng, self.pages):
+            self.check_page(query)
+        self.walked = self.walk_cursors(rng)
+        self.probe_invalid()
+        if self.hand is not None:
+            self.check_py_tables()
+        else:
+            self.notes.append("no client_validator.py in this directory")
+        self.check_js()
+        self.elapsed = time.perf_counter() - started
+        return self.drift_count() == 0
+
+    def drift_count(self):
+        return sum(collector.violations for collector in self.findings.values())
+
+    def report(self):
+        return {
+            "version": self.label,
+            "directory": self.directory,
+            "requests": self.requests,
+            "cursor_pages": self.walked,
+            "seconds": round(self.elapsed, 3),
+            "status_counts": {str(k): v for k, v in sorted(self.status_counts.items())},
+            "notes": self.notes,
+            "drift": {
+                source: [
+                    {"path": pattern, "count": count,
+                     "samples": [{"location": location, "path": path, "message": detail}
+                                 for location, path, detail in samples]}
+                    for pattern, (count, samples) in collector.sorted_patterns()
+                ]
+                for source, collector in self.findings.items() if collector.patterns
+            },
+        }
+
+
+def render_main(directory, url):
+    """--render: print one in-process response as JSON, for the Node fetch stub."""
+    parts = urlsplit(url)
+    target = parts.path + (f"?{parts.query}" if parts.query else "")
+    status, headers, body = render(load_server(directory), target)
+    print(json.dumps({"status": status, "headers": headers, "body": body.decode("utf-8")}))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Report drift between spec, mock server and validators.")
+    parser.add_argument("directories", nargs="*",
+                        help="Version directories (default: every case-02 version next to this one)")
+    parser.add_argument("--pages", type=int, default=DEFAULT_PAGES,
+                        help=f"Random requests per version (default: {DEFAULT_PAGES})")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the sampled requests (default: 0)")
+    parser.add_argument("--no-js", action="store_true", help="Do not run client_validator.js under Node")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    parser.add_argument("--render", nargs=2, metavar=("DIR", "URL"), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.render:
+        render_main(*args.render)
+        return
+
+    directories = args.directories or discover_versions()
+    if not directories:
+        parser.error("no version directories found")
+    reports = []
+    drift = 0
+    for directory in directories:
+        try:
+            check = VersionCheck(directory, args.pages, args.seed, not args.no_js)
+        except (OSError, spec_compiler.SpecError) as e:
+            print(f"FAIL: {directory}: {e}", file=sys.stderr)
+            sys.exit(2)
+        check.run()
+        drift += check.drift_count()
+        reports.append(check.report())
+
+    if args.json:
+        print(json.dumps({"drift": drift, "versions": reports}, indent=2))
+    else:
+        for r in reports:
+            statuses = ", ".join(f"{count} x {status}" for status, count in r["status_counts"].items())
+            print(f"{r['version']}: {os.path.basename(os.path.normpath(r['directory']))}")
+            print(f"  {r['requests']} requests ({r['cursor_pages']} via next_cursor) in "
+                  f"{r['seconds']:.2f}s: {statuses}")
+            for note in r["notes"]:
+                print(f"  note: {note}")
+            for source, patterns in r["drift"].items():
+                print(f"  {source}:")
+                for p in patterns:
+                    sample = p["samples"][0]
+                    text = f"{sample['path']}: {sample['message']}" if sample["path"] else sample["message"]
+                    print(f"    {p['count']:>6}  {p['path']}")
+                    print(f"            e.g. {text}")
+            if not r["drift"]:
+                print("  no drift")
+        print("---")
+        print(f"{'FAIL' if drift else 'PASS'}: {drift} mismatches across {len(reports)} versions")
+    sys.exit(1 if drift else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Load generator for GET /dashboard/orders.
+Python stdlib only — no external dependencies.
+
+Drives a running server from a pool of client threads for a fixed duration,
+picking each request from a weighted page mix, and prints requests per second
+and p50/p95/p99 latency as JSON so runs can be compared across versions.
+
+Usage:
+    python load_generator.py
+    python load_generator.py --concurrency 32 --duration 30 --keep-alive
+    python load_generator.py --mix "page=1&page_size=20:80,page=7&page_size=20:20"
+    python load_generator.py --url http://localhost:8080/dashboard/orders --output run.json
+"""
+
+import argparse
+import http.client
+import json
+import math
+import random
+import sys
+import threading
+import time
+from urllib.parse import urlsplit
+
+DEFAULT_URL = "http://localhost:8080/dashboard/orders"
+
+# Mostly first pages, like a dashboard; some deeper pages and the largest page size.
+DEFAULT_MIX = "page=1&page_size=20:60,page=2&page_size=20:20,page=5&page_size=20:10,page=1&page_size=50:10"
+
+
+def parse_mix(spec):
+    """Parse "query:weight,query:weight" into (queries, weights)."""
+    queries, weights = [], []
+    for entry in spec.split(","):
+        entry = entry.strip()
+        if not entry:
+            raise ValueError(f"empty entry in mix {spec!r}")
+        query, sep, weight = entry.rpartition(":")
+        if not sep:
+            query, weight = weight, "1"
+        try:
+            weight = float(weight)
+        except ValueError:
+            raise ValueError(f"invalid weight in mix entry {entry!r}")
+        if not (0 < weight < math.inf):
+            raise ValueError(f"weight must be positive and finite in mix entry {entry!r}")
+        queries.append(query)
+        weights.append(weight)
+    return queries, weights
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list, or None if empty."""
+    if not sorted_values:
+        return None
+    rank = max(1, -(-len(sorted_values) * pct // 100))
+    return sorted_values[int(rank) - 1]
+
+
+class Worker(threading.Thread):
+    """One client: sends requests back to back until the deadline."""
+
+    def __init__(self, host, port, path, mix, keep_alive, stop_at, seed):
+        super().__init__(daemon=True)
+        self.host, self.port, self.path = host, port, path
+        self.queries, self.weights = mix
+        self.keep_alive = keep_alive
+        self.stop_at = stop_at
+        self.rng = random.Random(seed)
+        self.latencies = []
+        self.statuses = {}
+        self.errors = 0
+        self.bytes = 0
+
+    def run(self):
+        headers = {} if self.keep_alive else {"Connection": "close"}
+        conn = http.client.HTTPConnection(self.host, self.port, timeout=10)
+        while time.monotonic() < self.stop_at:
+            query = self.rng.choices(self.queries, self.weights)[0]
+            target = f"{self.path}?{query}" if query else self.path
+            started = time.perf_counter()
+            try:
+                conn.request("GET", target, headers=headers)
+                resp = conn.getresponse()
+                body = resp.read()
+            except (OSError, http.client.HTTPException):
+                self.errors += 1
+                conn.close()
+                continue
+            self.latencies.append(time.perf_counter() - started)
+            self.statuses[resp.status] = self.statuses.get(resp.status, 0) + 1
+            self.bytes += len(body)
+            if not self.keep_alive:
+                conn.close()
+        conn.close()
+
+
+def run_load(url, concurrency, duration, mix, keep_alive=False, seed=0):
+    """Run the load test and return the JSON-ready report."""
+    parts = urlsplit(url)
+    if parts.scheme != "http":
+        raise ValueError("only http:// URLs are supported")
+    stop_at = time.monotonic() + duration
+    workers = [
+        Worker(parts.hostname, parts.port or 80, parts.path or "/", mix,
+               keep_alive, stop_at, seed + i)
+        for i in range(concurrency)
+    ]
+    started = time.monotonic()
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    elapsed = time.monotonic() - started
+
+    latencies = sorted(lat for w in workers for lat in w.latencies)
+    statuses = {}
+    for w in workers:
+        for status, count in w.statuses.items():
+            statuses[str(status)] = statuses.get(str(status), 0) + count
+
+    def ms(value):
+        return None if value is None else round(value * 1000, 3)
+
+    return {
+        "url": url,
+        "concurrency": concurrency,
+        "duration_s": round(elapsed, 3),
+        "keep_alive": keep_alive,
+        "mix": dict(zip(*mix)),
+        "requests": len(latencies),
+        "errors": sum(w.errors for w in workers),
+        "status_counts": statuses,
+        "bytes_received": sum(w.bytes for w in workers),
+        "requests_per_second": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "latency_ms": {
+            "min": ms(latencies[0] if latencies else None),
+            "mean": ms(sum(latencies) / len(latencies) if latencies else None),
+            "p50": ms(percentile(latencies, 50)),
+            "p95": ms(percentile(latencies, 95)),
+            "p99": ms(percentile(latencies, 99)),
+            "max": ms(latencies[-1] if latencies else None),
+        },
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test GET /dashboard/orders.")
+    parser.add_argument("--url", default=DEFAULT_URL, help=f"Endpoint URL without query (default: {DEFAULT_URL})")
+    parser.add_argument("--concurrency", type=int, default=8, help="Client threads (default: 8)")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds to run (default: 10)")
+    parser.add_argument("--mix", default=DEFAULT_MIX,
+                        help='Weighted queries, "query:weight,..." (default: mostly first pages)')
+    parser.add_argument("--keep-alive", action="store_true", help="Reuse one connection per client thread")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the page mix (default: 0)")
+    parser.add_argument("--output", help="Also write the JSON report to this file")
+    args = parser.parse_args(argv)
+
+    if args.concurrency < 1 or args.duration <= 0:
+        parser.error("--concurrency must be >= 1 and --duration > 0")
+    try:
+        mix = parse_mix(args.mix)
+        report = run_load(args.url, args.concurrency, args.duration, mix, args.keep_alive, args.seed)
+    except ValueError as e:
+        parser.error(str(e))
+
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    if report["requests"] == 0:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
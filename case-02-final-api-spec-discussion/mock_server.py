@@ -7,18 +7,57 @@ Usage:
     python mock_server.py
     # Server starts on http://localhost:8080
     # Try: curl "http://localhost:8080/dashboard/orders?page=1&page_size=5"
+    # Then follow pagination.next_cursor:
+    #      curl "http://localhost:8080/dashboard/orders?page_size=5&cursor=<next_cursor>"
+    # Filter and sort:
+    #      curl "http://localhost:8080/dashboard/orders?status=shipped&sort=total_cents:desc"
+
+    python mock_server.py --mode thread --workers 16
+    # Serve connections from a pool of 16 threads
+    python mock_server.py --mode fork --workers 4
+    # Fork 4 processes that share the listening socket (POSIX only)
+    python mock_server.py --orders 10000000 --lazy
+    # Serve 10M orders, generating only the ones each page needs
+    python mock_server.py --orders 5000 --seed 7 --items-dist geometric --port 9000
+    # Different dataset size, data and items-per-order distribution
+    python mock_server.py --mode asyncio
+    # Single-threaded asyncio engine with HTTP/1.1 keep-alive
+    python mock_server.py --mode thread --workers 32 --keep-alive --idle-timeout 2
+    # Persistent connections in the thread-pool mode
+
+In-process, without a socket:
+    mock_server.respond("GET", "/dashboard/orders?page=2")  # (status, headers, body)
+    mock_server.wsgi_app / mock_server.asgi_app              # WSGI and ASGI applications
 """
 
+import argparse
+import asyncio
+import base64
+import functools
+import hashlib
 import json
 import math
+import os
 import random
+import signal
 import string
+import sys
+import threading
+import zlib
+from collections import OrderedDict, namedtuple
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import formatdate
+from http import HTTPStatus
 from http.server import HTTPServer, BaseHTTPRequestHandler
 from urllib.parse import urlparse, parse_qs
 from datetime import datetime, timedelta, timezone
 
-# Seed for reproducible data
-random.seed(42)
+# Seed for reproducible data. Each order draws from its own
+# random.Random stream derived from the seed and its index, so any order can
+# be regenerated in isolation (see LazyOrders).
+DEFAULT_SEED = 42
+SEED = DEFAULT_SEED
 
 # --- Fake data pools ---
 
@@ -36,6 +75,19 @@ STATUSES = ["pending", "confirmed", "shipped", "delivered", "cancelled", "return
 
 TOTAL_ORDERS = 127  # Simulated total for a single user
 
+# Line items per order: "uniform" draws 1..MAX_ITEMS evenly, "geometric"
+# halves the odds of each extra item (most orders are small), "fixed" always
+# uses MAX_ITEMS.
+ITEMS_DISTRIBUTIONS = ("uniform", "geometric", "fixed")
+ITEMS_DIST = "uniform"
+MAX_ITEMS = 8
+
+# Orders are laid out one time slot apart, newest first. A slot is one day
+# until the dataset would span more than MAX_DATE_SPAN_DAYS, then it shrinks
+# (to one second at the least) so that large datasets keep realistic dates.
+SECONDS_PER_DAY = 24 * 60 * 60
+MAX_DATE_SPAN_DAYS = 3 * 365
+
 
 def _generate_product_id(index):
     return f"prod_{index:04d}"
@@ -49,10 +101,34 @@ def _generate_image_url(product_id):
     return f"https://cdn.example.com/products/{product_id}/thumb.webp"
 
 
+def _slot_seconds(total_orders):
+    return max(1, min(SECONDS_PER_DAY, MAX_DATE_SPAN_DAYS * SECONDS_PER_DAY // max(total_orders, 1)))
+
+
+def _order_rng(order_index):
+    # The default seed keeps random.Random(order_index), the data this server
+    # has always served. Other seeds hash "seed/index" as a string, so every
+    # seed, negative or not, gets its own streams.
+    if SEED == DEFAULT_SEED:
+        return random.Random(order_index)
+    return random.Random(f"{SEED}/{order_index}")
+
+
+def _draw_items_count(rng):
+    if ITEMS_DIST == "fixed":
+        return MAX_ITEMS
+    if ITEMS_DIST == "geometric":
+        count = 1
+        while count < MAX_ITEMS and rng.random() < 0.5:
+            count += 1
+        return count
+    return rng.randint(1, MAX_ITEMS)
+
+
 def _generate_order(order_index):
     """Generate a single order with deterministic but realistic data."""
-    rng = random.Random(order_index)
-    total_items_count = rng.randint(1, 8)
+    rng = _order_rng(order_index)
+    total_items_count = _draw_items_count(rng)
     preview_count = min(total_items_count, 3)
 
     items = []
@@ -75,9 +151,13 @@ def _generate_order(order_index):
     for i in range(total_items_count - preview_count):
         order_total += rng.randint(299, 9999) * rng.randint(1, 4)
 
+    # The time-of-day offset is scaled into the order's slot, so it never
+    # reaches the next slot: index order is exactly newest-first order.
+    slot = _slot_seconds(TOTAL_ORDERS)
     days_ago = TOTAL_ORDERS - order_index
+    time_of_day = rng.randint(0, 23) * 3600 + rng.randint(0, 59) * 60
     created = datetime(2025, 1, 1, tzinfo=timezone.utc) + timedelta(
-        days=days_ago, hours=rng.randint(0, 23), minutes=rng.randint(0, 59)
+        seconds=days_ago * slot + time_of_day * slot // SECONDS_PER_DAY
     )
 
     return {
@@ -91,58 +171,711 @@ def _generate_order(order_index):
     }
 
 
+class LazyOrders(Sequence):
+    """Read-only, newest-first view of the dataset that generates on demand.
+
+    _generate_order is deterministic per index and index order is the sort
+    order, so ALL_ORDERS[start:end] only has to generate end - start orders.
+    Startup is instant and memory per request is O(page_size), however large
+    the dataset.
+    """
+
+    def __init__(self, total_orders):
+        self._total = total_orders
+
+    def __len__(self):
+        return self._total
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [_generate_order(i) for i in range(self._total)[index]]
+        return _generate_order(range(self._total)[index])
+
+
+def order_sort_key(order, field="created_at"):
+    """The (field, order_id) key orders are sorted on; ALL_ORDERS uses created_at, descending."""
+    return order[field], order["order_id"]
+
+
+def build_orders(lazy=False):
+    """Build the newest-first dataset, eagerly as a list or as LazyOrders."""
+    if lazy:
+        return LazyOrders(TOTAL_ORDERS)
+    orders = [_generate_order(i) for i in range(TOTAL_ORDERS)]
+    orders.sort(key=order_sort_key, reverse=True)
+    return orders
+
+
 # Pre-generate all orders (sorted newest first)
-ALL_ORDERS = [_generate_order(i) for i in range(TOTAL_ORDERS)]
-ALL_ORDERS.sort(key=lambda o: o["created_at"], reverse=True)
+ALL_ORDERS = build_orders()
+
+
+class RequestError(Exception):
+    """A request that maps to an error response rather than a page of orders."""
+
+    def __init__(self, status_code, message):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+# --- Sorting and filtering index ---
+#
+# Every supported sort is (field, descending). "total_amount" is accepted as
+# an alias of total_cents for the JavaScript validator's VALID_SORTS.
+
+SORTS = {
+    "created_at:desc": ("created_at", True),
+    "created_at:asc": ("created_at", False),
+    "total_cents:desc": ("total_cents", True),
+    "total_cents:asc": ("total_cents", False),
+    "total_amount:desc": ("total_cents", True),
+    "total_amount:asc": ("total_cents", False),
+}
+DEFAULT_SORT = "created_at:desc"
+
+
+class _KeyView(Sequence):
+    """Read-only view mapping each order of a sequence through `key`."""
+
+    def __init__(self, orders, key):
+        self._orders = orders
+        self._key = key
+
+    def __len__(self):
+        return len(self._orders)
+
+    def __getitem__(self, index):
+        return self._key(self._orders[index])
+
+
+def _first_below(keys, value):
+    """Index of the first entry of the descending `keys` that is < value."""
+    lo, hi = 0, len(keys)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if keys[mid] < value:
+            hi = mid
+        else:
+            lo = mid + 1
+    return lo
+
+
+class OrderView(Sequence):
+    """The orders matching one query, in the requested order, without copying.
+
+    A window [lo, hi) over a list of ALL_ORDERS positions that is sorted
+    descending by the query's sort key; ascending sorts read it backwards.
+    """
+
+    def __init__(self, orders, positions, lo, hi, field, descending):
+        self._orders = orders
+        self._positions = positions
+        self._lo = lo
+        self._hi = hi
+        self.field = field
+        self.descending = descending
+
+    def __len__(self):
+        return self._hi - self._lo
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(len(self))[index]]
+        i = range(len(self))[index]
+        if self.descending:
+            return self._orders[self._positions[self._lo + i]]
+        return self._orders[self._positions[self._hi - 1 - i]]
+
+    def position_after(self, key):
+        """Index of the first order that comes after `key` in view order, O(log n)."""
+        lo, hi = 0, len(self)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            mid_key = order_sort_key(self[mid], self.field)
+            if (mid_key < key) if self.descending else (mid_key > key):
+                hi = mid
+            else:
+                lo = mid + 1
+        return lo
+
+
+class OrderIndex:
+    """Orderings of ALL_ORDERS precomputed once, for filtered and sorted pages.
+
+    For all orders and for each status this keeps the matching positions
+    newest first, their created_at keys, and the positions ordered by
+    (total_cents, order_id) descending. A page is then a window of one of
+    those lists: two bisects for a date range, plus O(page_size) lookups.
+    Only a date range combined with a total_cents sort falls back to sorting
+    the matching range.
+
+    Lazy datasets are never materialised. Index order is newest-first order,
+    so their date ranges are found by bisecting keys generated on demand.
+    Status filters and total_cents sorts need an eager dataset.
+    """
+
+    def __init__(self, orders):
+        self.orders = orders
+        self.lazy = isinstance(orders, LazyOrders)
+        everything = range(len(orders))
+        self._by_created = {None: everything}
+        self._created_keys = {None: _KeyView(orders, lambda o: o["created_at"])}
+        self._by_total = {}
+        if self.lazy:
+            return
+
+        for status in STATUSES:
+            self._by_created[status] = []
+        for position, order in enumerate(orders):
+            self._by_created[order["status"]].append(position)
+        for status, positions in self._by_created.items():
+            self._created_keys[status] = [orders[p]["created_at"] for p in positions]
+            self._by_total[status] = self._sorted_by_total(positions)
+
+    def _sorted_by_total(self, positions):
+        orders = self.orders
+        return sorted(positions, key=lambda p: order_sort_key(orders[p], "total_cents"), reverse=True)
+
+    def view(self, status=None, created_after=None, created_before=None, sort=DEFAULT_SORT):
+        """Return the OrderView for a filter and sort.
+
+        created_after is inclusive and created_before exclusive, both as
+        normalised "%Y-%m-%dT%H:%M:%SZ" strings.
+        """
+        field, descending = SORTS[sort]
+        if self.lazy and (status is not None or field != "created_at"):
+            raise RequestError(400, "status filters and total_cents sorts are not available on a --lazy dataset")
+
+        positions = self._by_created[status]
+        lo, hi = 0, len(positions)
+        if created_before is not None:
+            lo = _first_below(self._created_keys[status], created_before)
+        if created_after is not None:
+            hi = max(lo, _first_below(self._created_keys[status], created_after))
+
+        if field == "total_cents":
+            if (lo, hi) == (0, len(positions)):
+                positions = self._by_total[status]
+            else:
+                positions = self._sorted_by_total(positions[lo:hi])
+                lo, hi = 0, len(positions)
+        return OrderView(self.orders, positions, lo, hi, field, descending)
+
+
+ORDER_INDEX = OrderIndex(ALL_ORDERS)
+
+
+# --- Cursor pagination ---
+#
+# A cursor is the sort key of the last order on the previous page,
+# base64url-encoded so clients treat it as opaque. Unlike an offset, it stays
+# valid as new orders arrive and maps onto an index seek in a real database.
+
+
+def encode_cursor(order, field="created_at"):
+    raw = json.dumps(list(order_sort_key(order, field)), separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def decode_cursor(cursor, field="created_at"):
+    """Return the (field value, order_id) key in a cursor; raise RequestError if malformed.
+
+    A cursor only makes sense for the sort it was issued under, so its
+    value must have that sort field's type.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        value, order_id = json.loads(raw)
+    except (ValueError, TypeError):
+        raise RequestError(400, "invalid cursor")
+    value_type = str if field == "created_at" else int
+    if type(value) is not value_type or not isinstance(order_id, str):
+        raise RequestError(400, "invalid cursor")
+    return value, order_id
+
+
+# --- Request handling ---
+
+OrdersQuery = namedtuple(
+    "OrdersQuery",
+    "status created_after created_before sort start page_size pretty",
+)
+OrdersQuery.__doc__ = """A validated request; hashable, so it doubles as the page cache key.
+
+`start` is the index of the page's first order within the filtered, sorted
+view: (page - 1) * page_size for page requests, or the position after the
+cursor for cursor requests.
+"""
+
+
+def _parse_flag(params, name):
+    value = params.get(name, ["0"])[0].lower()
+    if value in ("1", "true"):
+        return True
+    if value in ("0", "false"):
+        return False
+    raise RequestError(400, f"{name} must be 0 or 1")
+
+
+def _parse_timestamp(params, name):
+    """Normalise an ISO 8601 bound to the "%Y-%m-%dT%H:%M:%SZ" form orders use.
+
+    Naive timestamps are taken as UTC. Fractional seconds round up, which
+    keeps both the inclusive lower and the exclusive upper bound exact.
+    """
+    if name not in params:
+        return None
+    value = params[name][0]
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        raise RequestError(400, f"{name} must be an ISO 8601 timestamp")
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    parsed = parsed.astimezone(timezone.utc)
+    if parsed.microsecond:
+        parsed = parsed.replace(microsecond=0) + timedelta(seconds=1)
+    return parsed.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def parse_orders_query(target):
+    """Validate a request target and return its OrdersQuery.
+
+    Raises RequestError for unknown paths and invalid parameters.
+    """
+    parsed = urlparse(target)
+
+    if parsed.path != "/dashboard/orders":
+        raise RequestError(404, "Not found")
+
+    params = parse_qs(parsed.query)
+    try:
+        page = int(params.get("page", ["1"])[0])
+        page_size = int(params.get("page_size", ["20"])[0])
+    except ValueError:
+        raise RequestError(400, "page and page_size must be integers")
+
+    if page < 1:
+        raise RequestError(400, "page must be >= 1")
+    if page_size < 1 or page_size > 50:
+        raise RequestError(400, "page_size must be between 1 and 50")
+    pretty = _parse_flag(params, "pretty")
+
+    status = params.get("status", [None])[0]
+    if status is not None and status not in STATUSES:
+        raise RequestError(400, f"status must be one of {', '.join(STATUSES)}")
+    sort = params.get("sort", [DEFAULT_SORT])[0]
+    if sort not in SORTS:
+        raise RequestError(400, f"sort must be one of {', '.join(SORTS)}")
+    created_after = _parse_timestamp(params, "created_after")
+    created_before = _parse_timestamp(params, "created_before")
+
+    view = ORDER_INDEX.view(status, created_after, created_before, sort)
+    if "cursor" in params:
+        if "page" in params:
+            raise RequestError(400, "use either page or cursor, not both")
+        start = view.position_after(decode_cursor(params["cursor"][0], view.field))
+    else:
+        start = (page - 1) * page_size
+    return OrdersQuery(status, created_after, created_before, sort, start, page_size, pretty)
+
+
+def build_orders_page(query):
+    """Build the response for the page of orders that `query` selects."""
+    view = ORDER_INDEX.view(query.status, query.created_after, query.created_before, query.sort)
+    start, page_size = query.start, query.page_size
+    total_orders = len(view)
+    total_pages = max(1, math.ceil(total_orders / page_size))
+    end = start + page_size
+    orders_page = view[start:end]
+    has_more = orders_page and end < total_orders
+    next_cursor = encode_cursor(orders_page[-1], view.field) if has_more else None
+
+    return {
+        "orders": orders_page,
+        "pagination": {
+            "page": start // page_size + 1,
+            "page_size": page_size,
+            "total_orders": total_orders,
+            "total_pages": total_pages,
+            "next_cursor": next_cursor,
+        },
+    }
+
+
+def handle_orders_request(target):
+    """Route a request target (path + query string) to (status_code, data).
+
+    Shared by every serving engine so they all honour the same contract.
+    """
+    try:
+        query = parse_orders_query(target)
+    except RequestError as e:
+        return e.status_code, {"error": str(e)}
+    return 200, build_orders_page(query)
+
+
+def encode_json(data, pretty=False):
+    """Encode a response body: minified by default, indented when pretty."""
+    if pretty:
+        return json.dumps(data, indent=2).encode("utf-8")
+    return json.dumps(data, separators=(",", ":")).encode("utf-8")
+
+
+# Content codings the server can produce, in order of preference.
+# "deflate" is the zlib-wrapped format (RFC 9110), not raw deflate.
+COMPRESSORS = {
+    "gzip": lambda body: _compress(body, wbits=31),
+    "deflate": lambda body: _compress(body, wbits=15),
+}
+
+
+def _compress(body, wbits):
+    compressor = zlib.compressobj(6, zlib.DEFLATED, wbits)
+    return compressor.compress(body) + compressor.flush()
+
+
+def negotiate_encoding(accept_encoding):
+    """Pick the content coding for an Accept-Encoding header value.
+
+    Returns "gzip", "deflate" or "identity". Honours q-values (q=0 refuses a
+    coding) and the "*" wildcard; ties go to the order of COMPRESSORS.
+    """
+    if not accept_encoding:
+        return "identity"
+    weights = {}
+    for part in accept_encoding.split(","):
+        coding, _, param_str = part.partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in param_str.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        weights[coding] = q
+
+    # Unlisted, identity stays acceptable (RFC 9110) but loses to any coding
+    # the client did list with a non-zero q
+    best, best_q = "identity", weights.get("identity", weights.get("*", 0.0))
+    for coding in COMPRESSORS:
+        q = weights.get(coding, weights.get("*", 0.0))
+        if q > 0 and q >= best_q:
+            if best == "identity" or q > best_q:
+                best, best_q = coding, q
+    return best
+
+
+class EncodedPage:
+    """An encoded 200 body plus its compressed variants and strong ETag.
+
+    Each coding is compressed once, on first request, and kept alongside the
+    identity bytes so later hits pay no compression cost. The ETag is hashed
+    once from the identity bytes; each coding is a distinct representation,
+    so compressed variants get a suffixed tag.
+    """
+
+    __slots__ = ("identity", "digest", "_compressed")
+
+    def __init__(self, body):
+        self.identity = body
+        self.digest = hashlib.blake2b(body, digest_size=12).hexdigest()
+        self._compressed = {}
+
+    def etag_for(self, coding):
+        if coding == "identity":
+            return f'"{self.digest}"'
+        return f'"{self.digest}-{coding}"'
+
+    def body_for(self, coding):
+        if coding == "identity":
+            return self.identity
+        body = self._compressed.get(coding)
+        if body is None:
+            body = self._compressed[coding] = COMPRESSORS[coding](self.identity)
+        return body
+
+
+class PageCache:
+    """Size-bounded LRU cache of encoded pages (EncodedPage instances).
+
+    ALL_ORDERS never changes after import, so a page is encoded once and
+    later hits are written straight from the cached bytes. Safe to share
+    between the threads of the thread-pool mode; forked workers each get
+    their own copy.
+    """
+
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, build):
+        """Return the cached entry for `key`, calling build() on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+            self.misses += 1
+
+        entry = build()
+        if self.maxsize <= 0:
+            return entry
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return entry
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+PAGE_CACHE = PageCache()
+
+
+def configure_dataset(total_orders=TOTAL_ORDERS, lazy=False, seed=DEFAULT_SEED,
+                      items_dist="uniform", max_items=8):
+    """Rebuild ALL_ORDERS from the generator settings.
+
+    Every setting feeds the same _generate_order pipeline, so scaling sweeps
+    differ only in the knobs they turn. Call before serving; cached pages of
+    the previous dataset are dropped.
+    """
+    global TOTAL_ORDERS, SEED, ITEMS_DIST, MAX_ITEMS, ALL_ORDERS, ORDER_INDEX
+    if items_dist not in ITEMS_DISTRIBUTIONS:
+        raise ValueError(f"items_dist must be one of {ITEMS_DISTRIBUTIONS}")
+    if max_items < 1:
+        raise ValueError("max_items must be at least 1")
+    TOTAL_ORDERS = total_orders
+    SEED = seed
+    ITEMS_DIST = items_dist
+    MAX_ITEMS = max_items
+    ALL_ORDERS = build_orders(lazy)
+    ORDER_INDEX = OrderIndex(ALL_ORDERS)
+    PAGE_CACHE.clear()
+    _parsed_queries.clear()
+
+
+# Clients may store pages but must revalidate them (cheaply, via ETag)
+# before every reuse, which is what a polling dashboard wants.
+CACHE_CONTROL = "private, no-cache"
+
+
+def etag_matches(if_none_match, etag):
+    """Evaluate an If-None-Match header against `etag` (weak comparison)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+# Parsed request targets. A target always maps to the same OrdersQuery for a
+# given dataset, and urllib's query parsing is most of the cost of a cached
+# page, so repeated targets skip it. Cleared by configure_dataset().
+QUERY_MEMO_SIZE = 4096
+_parsed_queries = {}
+
+
+def parse_orders_query_memo(target):
+    """parse_orders_query with memoized successes; errors are never cached."""
+    query = _parsed_queries.get(target)
+    if query is None:
+        query = parse_orders_query(target)
+        if len(_parsed_queries) >= QUERY_MEMO_SIZE:
+            _parsed_queries.clear()
+        _parsed_queries[target] = query
+    return query
+
+
+def render_orders_request(target, accept_encoding="", if_none_match=""):
+    """Like handle_orders_request, but return (status_code, headers, body).
+
+    `headers` lists the extra response headers the transport must send.
+    200 bodies come from PAGE_CACHE, keyed by the OrdersQuery, in
+    the content coding negotiated from `accept_encoding`. Error bodies are
+    small and always sent uncompressed. When `if_none_match` names the
+    page's current ETag, the result is a bodiless 304.
+    """
+    try:
+        query = parse_orders_query_memo(target)
+    except RequestError as e:
+        return e.status_code, [], encode_json({"error": str(e)})
+
+    entry = PAGE_CACHE.get(
+        query, lambda: EncodedPage(encode_json(build_orders_page(query), query.pretty))
+    )
+    coding = negotiate_encoding(accept_encoding)
+    etag = entry.etag_for(coding)
+    headers = [
+        ("Vary", "Accept-Encoding"),
+        ("ETag", etag),
+        ("Cache-Control", CACHE_CONTROL),
+    ]
+    if etag_matches(if_none_match, etag):
+        return 304, headers, b""
+    if coding != "identity":
+        headers.append(("Content-Encoding", coding))
+    return 200, headers, entry.body_for(coding)
+
+
+# --- transport-independent interface ---
+#
+# respond() is the whole request/response cycle as a pure function of the
+# request line and two headers. The http.server handler, the asyncio engine
+# and the WSGI/ASGI applications below only translate to and from it, so
+# benchmarks and tests can call respond() or wsgi_app() directly, with no
+# socket and no server loop.
+
+def response_headers(status_code, body, extra=()):
+    """Entity and CORS headers for a response, followed by `extra`."""
+    headers = []
+    if status_code != 304:
+        headers.append(("Content-Type", "application/json"))
+        headers.append(("Content-Length", str(len(body))))
+    headers.append(("Access-Control-Allow-Origin", "*"))
+    headers.extend(extra)
+    return headers
+
+
+def respond(method, target, accept_encoding="", if_none_match=""):
+    """Answer one request; return (status_code, headers, body).
+
+    `headers` is complete except for the connection's own (Date, Server,
+    Connection). HEAD gets the GET headers and an empty body; other
+    methods get 405.
+    """
+    if method in ("GET", "HEAD"):
+        status_code, extra, body = render_orders_request(target, accept_encoding, if_none_match)
+    else:
+        status_code, extra, body = 405, [("Allow", "GET, HEAD")], encode_json({"error": "Method not allowed"})
+    headers = response_headers(status_code, body, extra)
+    return status_code, headers, b"" if method == "HEAD" else body
+
+
+_STATUS_LINES = {status.value: f"{status.value} {status.phrase}" for status in HTTPStatus}
+
+
+def wsgi_app(environ, start_response):
+    """WSGI application, e.g. for wsgiref.simple_server or `gunicorn mock_server:wsgi_app`."""
+    target = environ.get("PATH_INFO") or "/"
+    if environ.get("QUERY_STRING"):
+        target = f"{target}?{environ['QUERY_STRING']}"
+    status_code, headers, body = respond(
+        environ.get("REQUEST_METHOD", "GET"),
+        target,
+        environ.get("HTTP_ACCEPT_ENCODING", ""),
+        environ.get("HTTP_IF_NONE_MATCH", ""),
+    )
+    start_response(_STATUS_LINES[status_code], headers)
+    return [body]
+
+
+async def asgi_app(scope, receive, send):
+    """ASGI application, e.g. for `uvicorn mock_server:asgi_app`. Request bodies are ignored."""
+    if scope["type"] == "lifespan":
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+    if scope["type"] != "http":
+        raise ValueError(f"unsupported ASGI scope type {scope['type']!r}")
+    target = scope["path"]
+    if scope.get("query_string"):
+        target = f"{target}?{scope['query_string'].decode('latin-1')}"
+    request_headers = {name.lower(): value for name, value in scope.get("headers", ())}
+    status_code, headers, body = respond(
+        scope["method"],
+        target,
+        request_headers.get(b"accept-encoding", b"").decode("latin-1"),
+        request_headers.get(b"if-none-match", b"").decode("latin-1"),
+    )
+    await send({
+        "type": "http.response.start",
+        "status": status_code,
+        "headers": [(name.lower().encode("latin-1"), value.encode("latin-1")) for name, value in headers],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+# Seconds an idle persistent connection is kept open before it is closed
+DEFAULT_IDLE_TIMEOUT = 5.0
 
 
 class DashboardHandler(BaseHTTPRequestHandler):
+    # HTTP/1.0 closes the connection after every response. make_server()
+    # switches to HTTP/1.1 for keep-alive, and `timeout` then bounds how long
+    # an idle connection may hold a worker. Headers and body are separate
+    # writes, so Nagle would stall every persistent response on a delayed ACK.
+    protocol_version = "HTTP/1.0"
+    timeout = DEFAULT_IDLE_TIMEOUT
+    disable_nagle_algorithm = True
 
     def do_GET(self):
-        parsed = urlparse(self.path)
+        self._respond("GET")
 
-        if parsed.path != "/dashboard/orders":
-            self._send_json(404, {"error": "Not found"})
-            return
+    def do_HEAD(self):
+        self._respond("HEAD")
 
-        params = parse_qs(parsed.query)
+    def _respond_method(self):
+        # respond() answers other methods with 405, as every transport does.
+        # The body is skipped so a persistent connection stays in sync.
         try:
-            page = int(params.get("page", ["1"])[0])
-            page_size = int(params.get("page_size", ["20"])[0])
+            length = int(self.headers.get("Content-Length", "0"))
         except ValueError:
-            self._send_json(400, {"error": "page and page_size must be integers"})
-            return
+            length = -1
+        if length < 0 or "chunked" in self.headers.get("Transfer-Encoding", "").lower():
+            self.close_connection = True
+        elif length:
+            self.rfile.read(length)
+        self._respond(self.command)
 
-        if page < 1:
-            self._send_json(400, {"error": "page must be >= 1"})
-            return
-        if page_size < 1 or page_size > 50:
-            self._send_json(400, {"error": "page_size must be between 1 and 50"})
-            return
+    do_POST = do_PUT = do_PATCH = do_DELETE = do_OPTIONS = do_TRACE = _respond_method
 
-        total_orders = len(ALL_ORDERS)
-        total_pages = max(1, math.ceil(total_orders / page_size))
-        start = (page - 1) * page_size
-        end = start + page_size
-        orders_page = ALL_ORDERS[start:end]
-
-        response = {
-            "orders": orders_page,
-            "pagination": {
-                "page": page,
-                "page_size": page_size,
-                "total_orders": total_orders,
-                "total_pages": total_pages,
-            },
-        }
-        self._send_json(200, response)
-
-    def _send_json(self, status_code, data):
-        body = json.dumps(data, indent=2).encode("utf-8")
+    def _respond(self, method):
+        status_code, headers, body = respond(
+            method,
+            self.path,
+            self.headers.get("Accept-Encoding", ""),
+            self.headers.get("If-None-Match", ""),
+        )
         self.send_response(status_code)
-        self.send_header("Content-Type", "application/json")
-        self.send_header("Content-Length", str(len(body)))
-        self.send_header("Access-Control-Allow-Origin", "*")
+        for name, value in headers:
+            self.send_header(name, value)
         self.end_headers()
         self.wfile.write(body)
 
@@ -150,17 +883,335 @@ class DashboardHandler(BaseHTTPRequestHandler):
         print(f"[{self.log_date_time_string()}] {format % args}")
 
 
-def main():
-    host = "localhost"
-    port = 8080
-    server = HTTPServer((host, port), DashboardHandler)
-    print(f"Mock server running on http://{host}:{port}")
+# --- asyncio engine ---
+#
+# A minimal HTTP/1.1 server on asyncio.start_server. One coroutine per
+# connection instead of one thread, so thousands of idle keep-alive
+# connections cost little more than their sockets. Only what the dashboard
+# contract needs is implemented: GET/HEAD, request bodies are skipped, and
+# chunked request bodies are rejected.
+
+MAX_HEADER_BYTES = 64 * 1024
+
+
+def _http_response(status_code, headers, body, keep_alive):
+    reason = HTTPStatus(status_code).phrase
+    lines = "".join(f"{name}: {value}\r\n" for name, value in headers)
+    head = (
+        f"HTTP/1.1 {status_code} {reason}\r\n"
+        f"Date: {formatdate(usegmt=True)}\r\n"
+        f"{lines}"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+        "\r\n"
+    ).encode("latin-1")
+    return head + body
+
+
+def _http_error(status_code, message):
+    """A complete response that closes the connection, for malformed requests."""
+    body = encode_json({"error": message})
+    return _http_response(status_code, response_headers(status_code, body), body, False)
+
+
+def _parse_request_head(raw):
+    """Parse a request head into (method, target, version, headers).
+
+    Raises ValueError on anything that is not a well-formed HTTP/1.x request.
+    Header names are lower-cased.
+    """
+    lines = raw.decode("latin-1").split("\r\n")
+    parts = lines[0].split()
+    if len(parts) != 3 or not parts[2].startswith("HTTP/1."):
+        raise ValueError(f"malformed request line: {lines[0]!r}")
+    method, target, version = parts
+    headers = {}
+    for line in lines[1:]:
+        if not line:
+            continue
+        name, sep, value = line.partition(":")
+        if not sep:
+            raise ValueError(f"malformed header line: {line!r}")
+        headers[name.strip().lower()] = value.strip()
+    return method, target, version, headers
+
+
+async def _handle_connection(reader, writer, keep_alive_enabled=True,
+                             idle_timeout=DEFAULT_IDLE_TIMEOUT):
+    # Pipelined requests are answered in order: the next request head is only
+    # read from the stream buffer after the previous response is written.
+    try:
+        while True:
+            try:
+                raw = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), idle_timeout)
+            except asyncio.TimeoutError:
+                break  # idle connection
+            except asyncio.LimitOverrunError:
+                writer.write(_http_error(431, "Request headers too large"))
+                break
+            except asyncio.IncompleteReadError:
+                break  # client closed the connection
+
+            try:
+                method, target, version, headers = _parse_request_head(raw)
+            except ValueError:
+                writer.write(_http_error(400, "Bad request"))
+                break
+
+            connection = headers.get("connection", "").lower()
+            if not keep_alive_enabled:
+                keep_alive = False
+            elif version == "HTTP/1.0":
+                keep_alive = connection == "keep-alive"
+            else:
+                keep_alive = connection != "close"
+
+            if "chunked" in headers.get("transfer-encoding", "").lower():
+                writer.write(_http_error(411, "Length required"))
+                break
+            try:
+                body_length = int(headers.get("content-length", "0"))
+            except ValueError:
+                body_length = -1
+            if body_length < 0:
+                writer.write(_http_error(400, "Bad Content-Length"))
+                break
+            if body_length:
+                await reader.readexactly(body_length)
+
+            status_code, response_head, body = respond(
+                method, target, headers.get("accept-encoding", ""), headers.get("if-none-match", "")
+            )
+            writer.write(_http_response(status_code, response_head, body, keep_alive))
+            await writer.drain()
+            if not keep_alive:
+                break
+    except (ConnectionError, asyncio.IncompleteReadError):
+        pass
+    finally:
+        writer.close()
+
+
+async def _serve_asyncio(host, port, keep_alive, idle_timeout):
+    server = await asyncio.start_server(
+        functools.partial(_handle_connection, keep_alive_enabled=keep_alive, idle_timeout=idle_timeout),
+        host,
+        port,
+        limit=MAX_HEADER_BYTES,
+        backlog=1024,
+    )
+    async with server:
+        await server.serve_forever()
+
+
+def serve_asyncio(host, port, keep_alive=True, idle_timeout=DEFAULT_IDLE_TIMEOUT):
+    """Run the asyncio engine until interrupted."""
+    asyncio.run(_serve_asyncio(host, port, keep_alive, idle_timeout))
+
+
+class PooledHTTPServer(HTTPServer):
+    """HTTPServer that hands each accepted connection to a fixed-size thread pool.
+
+    Unlike ThreadingHTTPServer, the number of threads is bounded, so a burst
+    of clients queues up instead of spawning one thread per connection.
+    """
+
+    def __init__(self, server_address, handler_class, workers):
+        super().__init__(server_address, handler_class)
+        self.workers = workers
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="mock-worker")
+
+    def process_request(self, request, client_address):
+        self._pool.submit(self._process_request_worker, request, client_address)
+
+    def _process_request_worker(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self):
+        super().server_close()
+        self._pool.shutdown(wait=False)
+
+
+def make_server(host, port, mode="single", workers=1, keep_alive=False,
+                idle_timeout=DEFAULT_IDLE_TIMEOUT):
+    """Build the server for the requested serving mode.
+
+    "single" is the original one-request-at-a-time HTTPServer, "thread" uses a
+    pool of `workers` threads, and "fork" returns a plain HTTPServer whose
+    socket is shared by `workers` forked processes (see serve_forked).
+
+    With keep_alive, connections persist between requests until they sit
+    idle for `idle_timeout` seconds. Each open connection occupies a worker
+    in these blocking modes, so size `workers` to the expected connections.
+    """
+    DashboardHandler.protocol_version = "HTTP/1.1" if keep_alive else "HTTP/1.0"
+    DashboardHandler.timeout = idle_timeout
+    if mode == "thread":
+        return PooledHTTPServer((host, port), DashboardHandler, workers)
+    return HTTPServer((host, port), DashboardHandler)
+
+
+def _print_cache_stats(label):
+    print(f"[{label}] page cache: {json.dumps(PAGE_CACHE.stats())}", flush=True)
+
+
+def serve_forked(server, workers):
+    """Fork `workers` children that all accept() on the same listening socket."""
+    children = []
+    for _ in range(workers):
+        pid = os.fork()
+        if pid == 0:
+            signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+            try:
+                server.serve_forever()
+            except KeyboardInterrupt:
+                pass
+            finally:
+                _print_cache_stats(f"worker {os.getpid()}")
+                os._exit(0)
+        children.append(pid)
+
+    # SIGTERM (e.g. Popen.terminate()) must not orphan the workers either
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    try:
+        for pid in children:
+            os.waitpid(pid, 0)
+    except (KeyboardInterrupt, SystemExit):
+        for pid in children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        for pid in children:
+            os.waitpid(pid, 0)
+        raise
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Mock server for GET /dashboard/orders.")
+    parser.add_argument(
+        "--mode",
+        choices=["single", "thread", "fork", "asyncio"],
+        default="single",
+        help="Serving mode; asyncio ignores --workers (default: single)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=4,
+        help="Threads or processes for the thread/fork modes (default: 4)",
+    )
+    parser.add_argument(
+        "--cache-size",
+        type=int,
+        default=PAGE_CACHE.maxsize,
+        help=f"Encoded pages kept in the LRU page cache, 0 disables it (default: {PAGE_CACHE.maxsize})",
+    )
+    parser.add_argument("--host", default="localhost", help="Bind address (default: localhost)")
+    parser.add_argument("--port", type=int, default=8080, help="Bind port (default: 8080)")
+    parser.add_argument(
+        "--orders",
+        type=int,
+        default=TOTAL_ORDERS,
+        help=f"Number of orders in the dataset (default: {TOTAL_ORDERS})",
+    )
+    parser.add_argument(
+        "--lazy",
+        action="store_true",
+        help="Generate orders on demand instead of all at startup",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=DEFAULT_SEED,
+        help=f"Seed for the generated data (default: {DEFAULT_SEED})",
+    )
+    parser.add_argument(
+        "--items-dist",
+        choices=ITEMS_DISTRIBUTIONS,
+        default=ITEMS_DIST,
+        help=f"Distribution of line items per order (default: {ITEMS_DIST})",
+    )
+    parser.add_argument(
+        "--max-items",
+        type=int,
+        default=MAX_ITEMS,
+        help=f"Maximum line items per order (default: {MAX_ITEMS})",
+    )
+    keep_alive = parser.add_mutually_exclusive_group()
+    keep_alive.add_argument(
+        "--keep-alive",
+        dest="keep_alive",
+        action="store_true",
+        default=None,
+        help="Keep connections open between requests (default: on for asyncio, off otherwise)",
+    )
+    keep_alive.add_argument(
+        "--no-keep-alive",
+        dest="keep_alive",
+        action="store_false",
+        help="Close the connection after every response",
+    )
+    parser.add_argument(
+        "--idle-timeout",
+        type=float,
+        default=DEFAULT_IDLE_TIMEOUT,
+        help=f"Seconds before an idle keep-alive connection is closed (default: {DEFAULT_IDLE_TIMEOUT:g})",
+    )
+    args = parser.parse_args(argv)
+    if args.keep_alive is None:
+        args.keep_alive = args.mode == "asyncio"
+    if args.idle_timeout <= 0:
+        parser.error("--idle-timeout must be positive")
+    if args.orders < 0:
+        parser.error("--orders must be non-negative")
+    if args.max_items < 1:
+        parser.error("--max-items must be at least 1")
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.cache_size < 0:
+        parser.error("--cache-size must be non-negative")
+    if args.mode == "fork" and not hasattr(os, "fork"):
+        parser.error("--mode fork requires a POSIX platform")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    host = args.host
+    port = args.port
+    PAGE_CACHE.maxsize = args.cache_size
+    configure_dataset(args.orders, args.lazy, args.seed, args.items_dist, args.max_items)
+    if args.mode == "asyncio":
+        print(f"Mock server running on http://{host}:{port} (asyncio engine)")
+        print(f"Try: curl http://{host}:{port}/dashboard/orders?page=1&page_size=5")
+        try:
+            serve_asyncio(host, port, args.keep_alive, args.idle_timeout)
+        except KeyboardInterrupt:
+            print("\nShutting down.")
+            _print_cache_stats("main")
+        return
+
+    server = make_server(host, port, args.mode, args.workers, args.keep_alive, args.idle_timeout)
+    if args.mode == "single":
+        print(f"Mock server running on http://{host}:{port}")
+    else:
+        print(f"Mock server running on http://{host}:{port} ({args.mode} mode, {args.workers} workers)")
     print(f"Try: curl http://{host}:{port}/dashboard/orders?page=1&page_size=5")
     try:
-        server.serve_forever()
+        if args.mode == "fork":
+            serve_forked(server, args.workers)
+        else:
+            server.serve_forever()
     except KeyboardInterrupt:
         print("\nShutting down.")
         server.server_close()
+        if args.mode != "fork":
+            _print_cache_stats("main")
 
 
 if __name__ == "__main__":
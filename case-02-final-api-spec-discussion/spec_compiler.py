@@ -0,0 +1,618 @@
+#!/usr/bin/env python3
+"""
+Compile the response schemas of an OpenAPI spec into Python validators.
+Python stdlib only; PyYAML is used when installed, otherwise a small loader
+for the YAML subset our specs are written in.
+
+The spec is read once and turned into straight-line Python source: one
+function per component schema plus validate_response() for the 200 JSON
+response of the first GET operation. $refs are inlined, each field is one
+dict lookup and one exact type check, and failure context strings are only
+built when a check fails. The source is cached on disk, keyed by the hash of
+the spec, so later runs skip YAML parsing and code generation entirely.
+
+Usage:
+    python spec_compiler.py final_api_spec.yaml            # compile, print cache path
+    python spec_compiler.py final_api_spec.yaml --print    # print the generated source
+
+    validators = spec_compiler.load_validators("final_api_spec.yaml", fail)
+    validators.validate_response(data)
+    validators.validate_order(order, "orders[0]")
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import types
+from datetime import date, datetime, timedelta, timezone
+
+# Bump when the generated code changes, so stale cache files are not reused
+COMPILER_VERSION = 3
+
+
+class SpecError(Exception):
+    """The spec uses a construct the compiler or YAML loader cannot handle."""
+
+
+# --- YAML loading ---
+
+_KEY = re.compile(r"""^("(?:[^"\\]|\\.)*"|'(?:[^']|'')*'|[^\s#'"\[\]{}][^#]*?)\s*:(?:\s+|$)""")
+_QUOTED = re.compile(r"""^(?:"((?:[^"\\]|\\.)*)"|'((?:[^']|'')*)')\s*(?:#.*)?$""")
+# YAML 1.1 plain scalars, as PyYAML's safe_load resolves them
+_BOOLS = {
+    **dict.fromkeys(("yes", "Yes", "YES", "true", "True", "TRUE", "on", "On", "ON"), True),
+    **dict.fromkeys(("no", "No", "NO", "false", "False", "FALSE", "off", "Off", "OFF"), False),
+}
+_INT = re.compile(r"^[-+]?(0b[01_]+|0x[0-9a-fA-F_]+|0[0-7_]+|0|[1-9][0-9_]*)$")
+_FLOAT = re.compile(r"^[-+]?([0-9][0-9_]*\.[0-9_]*|\.[0-9][0-9_]*)([eE][-+][0-9]+)?$")  # floats need a dot
+_SPECIAL_FLOATS = {
+    **dict.fromkeys((".inf", ".Inf", ".INF", "+.inf", "+.Inf", "+.INF"), float("inf")),
+    **dict.fromkeys(("-.inf", "-.Inf", "-.INF"), float("-inf")),
+    **dict.fromkeys((".nan", ".NaN", ".NAN"), float("nan")),
+}
+_SEXAGESIMAL = re.compile(r"^[-+]?[0-9][0-9_]*(:[0-5]?[0-9])+(\.[0-9_]*)?$")
+_TIMESTAMP = re.compile(
+    r"^([0-9]{4})-([0-9]{1,2})-([0-9]{1,2})"
+    r"(?:(?:[Tt]|[ \t]+)([0-9]{1,2}):([0-9]{2}):([0-9]{2})(?:\.([0-9]*))?"
+    r"(?:[ \t]*(Z|([-+])([0-9]{1,2})(?::([0-9]{2}))?))?)?$")
+
+
+def _parse_int(text, line_number):
+    sign, digits = (-1, text[1:]) if text[0] == "-" else (1, text.lstrip("+"))
+    digits = digits.replace("_", "")
+    try:
+        if digits.startswith(("0b", "0x")):
+            return sign * int(digits, 0)
+        if len(digits) > 1 and digits[0] == "0":
+            return sign * int(digits, 8)
+        return sign * int(digits)
+    except ValueError:
+        raise SpecError(f"line {line_number}: invalid integer {text!r}")
+
+
+def _parse_timestamp(match, line_number):
+    year, month, day, hour, minute, second, fraction, tz, tz_sign, tz_hour, tz_minute = match.groups()
+    try:
+        if hour is None:
+            return date(int(year), int(month), int(day))
+        tzinfo = None
+        if tz_sign:
+            offset = timedelta(hours=int(tz_hour), minutes=int(tz_minute or 0))
+            tzinfo = timezone(-offset if tz_sign == "-" else offset)
+        elif tz:
+            tzinfo = timezone.utc
+        return datetime(int(year), int(month), int(day), int(hour), int(minute), int(second),
+                        int((fraction or "")[:6].ljust(6, "0")), tzinfo)
+    except ValueError as e:
+        raise SpecError(f"line {line_number}: invalid timestamp {match.group(0)!r}: {e}")
+
+
+def _parse_scalar(text, line_number):
+    if text[:1] in "\"'":
+        match = _QUOTED.match(text)
+        if not match:
+            raise SpecError(f"line {line_number}: unsupported quoted scalar {text}")
+        if match.group(1) is not None:
+            try:
+                return json.loads(f'"{match.group(1)}"')
+            except ValueError:
+                raise SpecError(f"line {line_number}: unsupported escape in {text}")
+        return match.group(2).replace("''", "'")
+    text = text.split(" #", 1)[0].rstrip()
+    if text in ("[]", "{}"):
+        return [] if text == "[]" else {}
+    if text[:1] in "[{&*!|>%@`":
+        raise SpecError(f"line {line_number}: unsupported YAML construct {text!r}; install PyYAML")
+    if text in ("null", "Null", "NULL", "~"):
+        return None
+    if text in _BOOLS:
+        return _BOOLS[text]
+    if _INT.match(text):
+        return _parse_int(text, line_number)
+    if _FLOAT.match(text):
+        return float(text.replace("_", ""))
+    if text in _SPECIAL_FLOATS:
+        return _SPECIAL_FLOATS[text]
+    timestamp = _TIMESTAMP.match(text)
+    if timestamp:
+        return _parse_timestamp(timestamp, line_number)
+    if _SEXAGESIMAL.match(text):
+        raise SpecError(f"line {line_number}: unsupported base 60 number {text!r}; install PyYAML")
+    return text
+
+
+class _SubsetYAMLLoader:
+    """Block mappings, block sequences, scalars and folded/literal blocks.
+
+    Anything else (flow collections, anchors, tags, multi-documents) raises
+    SpecError rather than being misread.
+    """
+
+    def __init__(self, text):
+        if "\t" in text:
+            raise SpecError("tabs are not allowed in YAML indentation")
+        self.lines = text.splitlines()
+        self.i = 0
+
+    def load(self):
+        line = self._peek()
+        if line is None:
+            return None
+        node = self._node(line[0])
+        if self._peek() is not None:
+            raise SpecError(f"line {self.i + 1}: unexpected content {self._peek()[1]!r}")
+        return node
+
+    def _peek(self):
+        """(indent, text) of the next line with content, or None at the end."""
+        while self.i < len(self.lines):
+            raw = self.lines[self.i]
+            text = raw.strip()
+            if text and not text.startswith("#"):
+                if text in ("---", "..."):
+                    raise SpecError(f"line {self.i + 1}: multi-document YAML is not supported")
+                return len(raw) - len(raw.lstrip(" ")), text
+            self.i += 1
+        return None
+
+    @staticmethod
+    def _is_item(text):
+        return text == "-" or text.startswith("- ")
+
+    def _node(self, indent):
+        line = self._peek()
+        return self._list(indent) if self._is_item(line[1]) else self._map(indent)
+
+    def _map(self, indent):
+        result = {}
+        while True:
+            line = self._peek()
+            if line is None or line[0] < indent or (line[0] == indent and self._is_item(line[1])):
+                return result
+            if line[0] > indent:
+                raise SpecError(f"line {self.i + 1}: unexpected indentation")
+            match = _KEY.match(line[1])
+            if not match:
+                raise SpecError(f"line {self.i + 1}: expected 'key: value', got {line[1]!r}")
+            key = _parse_scalar(match.group(1), self.i + 1)
+            if key in result:
+                raise SpecError(f"line {self.i + 1}: duplicate key {key!r}")
+            self.i += 1
+            result[key] = self._value(line[1][match.end():].strip(), indent, allow_list=True)
+
+    def _list(self, indent):
+        result = []
+        while True:
+            line = self._peek()
+            if line is None or line[0] < indent:
+                return result
+            if line[0] > indent or not self._is_item(line[1]):
+                if line[0] == indent:
+                    return result
+                raise SpecError(f"line {self.i + 1}: unexpected indentation")
+            rest = line[1][1:].lstrip()
+            if rest and _KEY.match(rest):
+                # "- key: value" starts a mapping indented past the dash
+                item_indent = indent + len(line[1]) - len(rest)
+                self.lines[self.i] = " " * item_indent + rest
+                result.append(self._map(item_indent))
+            else:
+                self.i += 1
+                result.append(self._value(rest, indent, allow_list=False))
+
+    def _value(self, rest, indent, allow_list):
+        if rest and rest[0] in ">|":
+            return self._block_scalar(rest, indent)
+        if rest:
+            return _parse_scalar(rest, self.i)
+        line = self._peek()
+        if line is not None and (line[0] > indent or (allow_list and line[0] == indent and self._is_item(line[1]))):
+            return self._node(line[0])
+        return None
+
+    def _block_scalar(self, header, indent):
+        style, chomp = header[0], header[1:].split(" #", 1)[0].strip()
+        if chomp not in ("", "-"):
+            raise SpecError(f"line {self.i}: unsupported block scalar header {header!r}")
+        block = []
+        block_indent = None
+        while self.i < len(self.lines):
+            raw = self.lines[self.i]
+            if raw.strip():
+                current = len(raw) - len(raw.lstrip(" "))
+                if current <= indent:
+                    break
+                if block_indent is None:
+                    block_indent = current
+                block.append(raw[block_indent:])
+            else:
+                block.append("")
+            self.i += 1
+        while block and not block[-1]:
+            block.pop()
+        if style == "|":
+            text = "\n".join(block)
+        else:
+            text = ""
+            for previous, line in zip([None] + block, block):
+                if previous is None:
+                    text = line
+                elif not line:
+                    text += "\n"
+                elif not previous:
+                    text += line
+                else:
+                    text += " " + line
+        if chomp == "-" or not text:
+            return text
+        return text + "\n"
+
+
+def load_yaml(text):
+    """Parse YAML with PyYAML when installed, else with the subset loader."""
+    try:
+        import yaml
+    except ImportError:
+        return _SubsetYAMLLoader(text).load()
+    try:
+        return yaml.safe_load(text)
+    except yaml.YAMLError as e:
+        raise SpecError(str(e))
+
+
+# --- code generation ---
+
+_PY_TYPES = {
+    "object": ("dict", "type({v}) is not dict"),
+    "array": ("list", "type({v}) is not list"),
+    "string": ("str", "type({v}) is not str"),
+    "integer": ("int", "type({v}) is not int"),
+    "number": ("number", "type({v}) not in (int, float)"),
+    "boolean": ("bool", "type({v}) is not bool"),
+}
+
+# Formats with a runtime check; any other format is accepted as OpenAPI allows
+FORMAT_MESSAGES = {
+    "date-time": "is not a valid ISO 8601 datetime",
+    "uri": "is not a valid URI (must start with http:// or https://)",
+}
+
+
+def is_datetime(value):
+    # datetime.fromisoformat is C; regex or fixed-width pre-checks measured
+    # slower than the full parse they would skip (see bench_validators.py)
+    try:
+        datetime.fromisoformat(value.replace("Z", "+00:00"))
+        return True
+    except ValueError:
+        return False
+
+
+# Valid URIs seen so far. Image URLs repeat across orders (one per product),
+# so most checks are a set lookup. Bounded for corpora with unique URLs.
+URI_CACHE_SIZE = 65536
+_known_uris = set()
+
+
+def is_uri(value):
+    if value in _known_uris:
+        return True
+    if value.startswith(("http://", "https://")):
+        if len(_known_uris) < URI_CACHE_SIZE:
+            _known_uris.add(value)
+        return True
+    return False
+
+
+FORMAT_CHECKS = {"date-time": is_datetime, "uri": is_uri}
+
+
+def _snake(name):
+    return re.sub(r"(?<=[a-z0-9])(?=[A-Z])", "_", name).replace("-", "_").lower()
+
+
+def _fstring(template):
+    """Source for an f-string whose literal text is `template`."""
+    return "f" + repr(template)
+
+
+def _escape(text):
+    return str(text).replace("{", "{{").replace("}", "}}")
+
+
+class _Generator:
+    def __init__(self, spec, object_checks=()):
+        self.spec = spec
+        self.object_checks = set(object_checks)
+        self.constants = {}
+        self.counter = 0
+
+    def _name(self, prefix):
+        self.counter += 1
+        return f"{prefix}{self.counter}"
+
+    def _constant(self, source):
+        if source not in self.constants:
+            self.constants[source] = f"_C{len(self.constants) + 1}"
+        return self.constants[source]
+
+    def _resolve(self, schema, seen, name):
+        """Follow $refs; also return the component schema name reached, if any."""
+        while "$ref" in schema:
+            ref = schema["$ref"]
+            if not ref.startswith("#/"):
+                raise SpecError(f"only local $refs are supported, got {ref!r}")
+            if ref in seen:
+                raise SpecError(f"recursive $ref {ref!r} cannot be inlined")
+            seen = seen | {ref}
+            node = self.spec
+            for part in ref[2:].split("/"):
+                try:
+                    node = node[part.replace("~1", "/").replace("~0", "~")]
+                except (KeyError, TypeError):
+                    raise SpecError(f"unresolved $ref {ref!r}")
+            schema = node
+            if ref.startswith("#/components/schemas/"):
+                name = ref.rsplit("/", 1)[1]
+        return schema, seen, name
+
+    def emit(self, schema, var, path, out, depth, seen=frozenset(), name=None):
+        """Append lines checking `var` (already bound) against `schema`.
+
+        `path` is f-string text naming the value in failure messages; it may
+        reference runtime variables such as {path} or a loop index. `name`
+        is the component schema being checked, if any.
+        """
+        schema, seen, name = self._resolve(schema, seen, name)
+        where = path or "Response"
+        nullable = bool(schema.get("nullable"))
+        if nullable:
+            depth += 1
+        pad = "    " * depth
+
+        kind = schema.get("type")
+        if kind is not None and kind not in _PY_TYPES:
+            raise SpecError(f"{where}: unsupported type {kind!r}")
+        lines = []
+        body = []
+        self._constraints(schema, var, path, body, depth + (kind is not None), seen)
+        if name in self.object_checks:
+            problem = self._name("m")
+            body_pad = pad + "    " * (kind is not None)
+            body.append(f"{body_pad}{problem} = _check_{_snake(name)}({var})")
+            body.append(f"{body_pad}if {problem} is not None:")
+            self._fail(body_pad, body, path, f"{{{problem}}}")
+        if kind is not None:
+            type_name, test = _PY_TYPES[kind]
+            lines.append(f"{pad}if {test.format(v=var)}:")
+            self._fail(pad, lines, path, f"expected {type_name}, got {{type({var}).__name__}}")
+            if body:
+                lines.append(f"{pad}else:")
+        lines.extend(body)
+        if nullable and lines:
+            out.append(f"{pad[4:]}if {var} is not None:")
+        out.extend(lines)
+
+    def _fail(self, pad, out, path, detail):
+        """Emit `ok = fail(path, detail)`; both are f-string templates."""
+        if not path:
+            detail = f"Response {detail}"
+        out.append(f"{pad}    ok = fail({_fstring(path)}, {_fstring(detail)})")
+
+    def _constraints(self, schema, var, path, out, depth, seen):
+        pad = "    " * depth
+        if "enum" in schema:
+            values = schema["enum"]
+            name = self._constant(f"frozenset({values!r})")
+            out.append(f"{pad}if {var} not in {name}:")
+            self._fail(pad, out, path, f"'{{{var}}}' not in valid values {_escape(values)}")
+        fmt = schema.get("format")
+        if fmt in FORMAT_CHECKS:
+            out.append(f"{pad}if not _format_{_snake(fmt)}({var}):")
+            self._fail(pad, out, path, f"'{{{var}}}' {FORMAT_MESSAGES[fmt]}")
+        if "pattern" in schema:
+            name = self._constant(f"_re.compile({schema['pattern']!r})")
+            out.append(f"{pad}if not {name}.search({var}):")
+            self._fail(pad, out, path, f"'{{{var}}}' does not match {_escape(schema['pattern'])}")
+        for key, op, text in (("minLength", "<", "at least"), ("maxLength", ">", "at most")):
+            if key in schema:
+                out.append(f"{pad}if len({var}) {op} {schema[key]!r}:")
+                self._fail(pad, out, path, f"length must be {text} {schema[key]}, got {{len({var})}}")
+        self._bounds(schema, var, path, out, pad)
+
+        if "items" in schema or "minItems" in schema or "maxItems" in schema:
+            if "minItems" in schema:
+                out.append(f"{pad}if len({var}) < {schema['minItems']!r}:")
+                self._fail(pad, out, path, f"min {schema['minItems']} items required, got {{len({var})}}")
+            if "maxItems" in schema:
+                out.append(f"{pad}if len({var}) > {schema['maxItems']!r}:")
+                self._fail(pad, out, path, f"max {schema['maxItems']} items allowed, got {{len({var})}}")
+            if "items" in schema:
+                index, item = self._name("i"), self._name("v")
+                out.append(f"{pad}for {index}, {item} in enumerate({var}):")
+                self.emit(schema["items"], item, f"{path}[{{{index}}}]", out, depth + 1, seen)
+
+        required = schema.get("required", [])
+        properties = schema.get("properties", {})
+        for field in list(properties) + [f for f in required if f not in properties]:
+            child = self._name("v")
+            child_path = f"{path}.{_escape(field)}" if path else _escape(field)
+            if field in required:
+                # try/except is cheaper than .get() when the field is present
+                out.append(f"{pad}try:")
+                out.append(f"{pad}    {child} = {var}[{field!r}]")
+                out.append(f"{pad}except KeyError:")
+                self._fail(pad, out, path, f"missing required field '{_escape(field)}'")
+                body = []
+                if field in properties:
+                    self.emit(properties[field], child, child_path, body, depth + 1, seen)
+                if body:
+                    out.append(f"{pad}else:")
+                    out.extend(body)
+            else:
+                out.append(f"{pad}{child} = {var}.get({field!r}, _MISSING)")
+                out.append(f"{pad}if {child} is not _MISSING:")
+                self.emit(properties[field], child, child_path, out, depth + 1, seen)
+
+    def _bounds(self, schema, var, path, out, pad):
+        low, high = schema.get("minimum"), schema.get("maximum")
+        if low is not None and schema.get("exclusiveMinimum"):
+            out.append(f"{pad}if {var} <= {low!r}:")
+            self._fail(pad, out, path, f"must be > {low}, got {{{var}}}")
+            low = None
+        if high is not None and schema.get("exclusiveMaximum"):
+            out.append(f"{pad}if {var} >= {high!r}:")
+            self._fail(pad, out, path, f"must be < {high}, got {{{var}}}")
+            high = None
+        if low is not None and high is not None:
+            out.append(f"{pad}if {var} < {low!r} or {var} > {high!r}:")
+            self._fail(pad, out, path, f"must be {low}-{high}, got {{{var}}}")
+        elif low is not None:
+            out.append(f"{pad}if {var} < {low!r}:")
+            self._fail(pad, out, path, f"must be >= {low}, got {{{var}}}")
+        elif high is not None:
+            out.append(f"{pad}if {var} > {high!r}:")
+            self._fail(pad, out, path, f"must be <= {high}, got {{{var}}}")
+
+    def function(self, name, args, schema, var, path, schema_name=None):
+        out = [f"def {name}({args}):", "    ok = True"]
+        self.emit(schema, var, path, out, 1, name=schema_name)
+        out.append("    return ok")
+        return out
+
+
+def _response_schema(spec):
+    """Schema of the 200 application/json response of the first GET operation."""
+    for path_item in (spec.get("paths") or {}).values():
+        operation = (path_item or {}).get("get")
+        if not operation:
+            continue
+        responses = operation.get("responses") or {}
+        response = responses.get("200") or responses.get(200) or {}
+        schema = ((response.get("content") or {}).get("application/json") or {}).get("schema")
+        if schema:
+            return schema
+    return None
+
+
+def generate_source(spec, spec_hash="", object_checks=()):
+    """Return Python source defining the validators for `spec`.
+
+    Every object validated against a component schema named in
+    `object_checks` is also passed to `_check_<snake_name>(obj)`, which
+    returns None or a failure message, for rules the schema cannot express.
+    """
+    if not isinstance(spec, dict):
+        raise SpecError("spec must be a mapping")
+    generator = _Generator(spec, object_checks)
+    functions = []
+    schemas = ((spec.get("components") or {}).get("schemas")) or {}
+    for name, schema in schemas.items():
+        functions.append(generator.function(
+            f"validate_{_snake(name)}", f"value, path={name!r}", schema, "value", "{path}", name))
+    response = _response_schema(spec)
+    if response is not None:
+        functions.append(generator.function("validate_response", "data", response, "data", ""))
+
+    lines = [
+        f"# Generated by spec_compiler.py (version {COMPILER_VERSION}) from spec {spec_hash}.",
+        "# Do not edit: delete the file to regenerate it.",
+        "import re as _re",
+        "",
+    ]
+    lines.extend(f"{name} = {source}" for source, name in generator.constants.items())
+    for function in functions:
+        lines.extend(["", ""])
+        lines.extend(function)
+    return "\n".join(lines) + "\n"
+
+
+# --- caching and loading ---
+
+def spec_hash(spec_bytes, object_checks=()):
+    digest = hashlib.sha256(spec_bytes)
+    digest.update(f"spec_compiler/{COMPILER_VERSION}/{','.join(sorted(object_checks))}".encode())
+    return digest.hexdigest()[:20]
+
+
+def compile_spec(spec_path, cache_dir=None, object_checks=()):
+    """Return the path of the generated source for `spec_path`, compiling if needed.
+
+    The cache lives in `cache_dir` (default: __pycache__ next to the spec)
+    and is keyed by the hash of the spec bytes, the compiler version and
+    the names of the object checks.
+    """
+    with open(spec_path, "rb") as f:
+        spec_bytes = f.read()
+    key = spec_hash(spec_bytes, object_checks)
+    if cache_dir is None:
+        cache_dir = os.path.join(os.path.dirname(os.path.abspath(spec_path)), "__pycache__")
+    stem = os.path.splitext(os.path.basename(spec_path))[0]
+    target = os.path.join(cache_dir, f"{stem}.{key}.validators.py")
+    if os.path.exists(target):
+        return target
+
+    try:
+        spec = load_yaml(spec_bytes.decode("utf-8"))
+    except (SpecError, UnicodeDecodeError) as e:
+        raise SpecError(f"{spec_path}: {e}")
+    source = generate_source(spec, key, object_checks)
+    os.makedirs(cache_dir, exist_ok=True)
+    temp = f"{target}.{os.getpid()}.tmp"
+    with open(temp, "w") as f:
+        f.write(source)
+    os.replace(temp, target)
+    return target
+
+
+def load_validators(spec_path, fail, cache_dir=None, format_checks=None, object_checks=None):
+    """Compile (or reuse) the validators for `spec_path` and return them.
+
+    `fail(path, detail)` is called for every violation, with the field path
+    (e.g. "orders[3].status", "" for the response itself) and the message;
+    its return value becomes the function's result, so client_validator's
+    fail() returning False works as is. `format_checks` overrides entries
+    of FORMAT_CHECKS. `object_checks` maps component schema names to
+    functions returning None or a failure message (see generate_source).
+    """
+    object_checks = object_checks or {}
+    source_path = compile_spec(spec_path, cache_dir, tuple(object_checks))
+    with open(source_path) as f:
+        source = f.read()
+    checks = dict(FORMAT_CHECKS, **(format_checks or {}))
+    namespace = {"fail": fail, "_MISSING": object(), "__name__": "spec_validators"}
+    for name, check in checks.items():
+        namespace[f"_format_{_snake(name)}"] = check
+    for name, check in object_checks.items():
+        namespace[f"_check_{_snake(name)}"] = check
+    exec(compile(source, source_path, "exec"), namespace)
+    validators = types.SimpleNamespace(source_path=source_path)
+    for name, value in namespace.items():
+        if name.startswith("validate_"):
+            setattr(validators, name, value)
+    return validators
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compile an OpenAPI spec into Python validators.")
+    parser.add_argument("spec", help="Path to the OpenAPI YAML spec")
+    parser.add_argument("--cache-dir", help="Where to keep generated validators (default: __pycache__ next to the spec)")
+    parser.add_argument("--print", action="store_true", dest="print_source", help="Print the generated source")
+    args = parser.parse_args(argv)
+    try:
+        path = compile_spec(args.spec, args.cache_dir)
+    except SpecError as e:
+        print(f"FAIL: {e}")
+        sys.exit(1)
+    if args.print_source:
+        with open(path) as f:
+            sys.stdout.write(f.read())
+    else:
+        print(path)
+
+
+if __name__ == "__main__":
+    main()
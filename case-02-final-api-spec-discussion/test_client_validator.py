@@ -0,0 +1,377 @@
+"""Tests for client_validator.py"""
+
+import io
+import json
+import sys
+import threading
+
+import xml.etree.ElementTree as ET
+
+import pytest
+
+import client_validator
+import mock_server
+from client_validator import iter_response_members
+
+
+@pytest.fixture(autouse=True)
+def quiet_results():
+    client_validator.RESULTS.reset()
+    client_validator.RESULTS.echo = False
+    yield
+    client_validator.RESULTS.reset()
+    client_validator.RESULTS.echo = True
+
+
+class CountingStream(io.BytesIO):
+    """BytesIO that records how many bytes have been read from it."""
+
+    def __init__(self, data):
+        super().__init__(data)
+        self.bytes_read = 0
+
+    def read(self, size=-1):
+        data = super().read(size)
+        self.bytes_read += len(data)
+        return data
+
+
+def members(data, chunk_size):
+    """Rebuild the response object that iter_response_members streams."""
+    result = {}
+    for key, index, value in iter_response_members(io.BytesIO(data), chunk_size):
+        if index is None:
+            result[key] = value
+        else:
+            result[key].append(value)
+    return result
+
+
+TRICKY = {
+    "orders": [
+        {"name": "café ☕ \U0001f3b2", "escaped": "quote \" slash \\ é \n",
+         "numbers": [0, -1, 12345678901234567890, -1.5e+10, 2.25e-3, 1e5],
+         "literals": [True, False, None], "nested": {"a": [[], {}, [1, [2]]]}},
+        {"empty": "", "unicode_escape": "\\u00e9"},
+    ],
+    "pagination": {"page": 1, "next_cursor": None, "ratio": -0.5},
+}
+
+
+class TestStreamChunkBoundaries:
+    """Values split across chunk boundaries decode exactly as json.loads does."""
+
+    @pytest.mark.parametrize("chunk_size", [1, 2, 3, 5, 7, 13, 64])
+    def test_every_split(self, chunk_size):
+        for text in [json.dumps(TRICKY), json.dumps(TRICKY, ensure_ascii=False, indent=2)]:
+            data = text.encode("utf-8")
+            assert members(data, chunk_size) == json.loads(data)
+
+    @pytest.mark.parametrize("chunk_size", [1, 4, 9])
+    def test_mock_server_page(self, chunk_size):
+        _, page = mock_server.handle_orders_request("/dashboard/orders?page=2&page_size=10")
+        data = json.dumps(page).encode("utf-8")
+        assert members(data, chunk_size) == page
+
+    def test_validate_stream_of_valid_page(self):
+        _, page = mock_server.handle_orders_request("/dashboard/orders?page=1&page_size=20")
+        ok, count, pagination = client_validator.validate_stream(
+            io.BytesIO(json.dumps(page).encode("utf-8")), chunk_size=7)
+        assert ok
+        assert count == 20
+        assert pagination == page["pagination"]
+
+
+class TestStreamMalformedInput:
+    """Malformed input raises ValueError without reading the rest of the stream."""
+
+    @pytest.mark.parametrize("text", [
+        '{"orders": [{"a": oops}]}',
+        '{"orders": [1 2]}',
+        '{"orders": [], "pagination": {"page": 1}',
+        '{"orders": [{"a": "unterminated}]',
+        '{"orders": [tru',
+        '{"orders": [-]}',
+        '{"orders": ["\\u12"]}',
+        '{"orders": ["line\nbreak"]}',
+        '{"orders": []} trailing',
+        '{1: 2}',
+        '[]',
+        '',
+    ])
+    @pytest.mark.parametrize("chunk_size", [1, 4, 64])
+    def test_raises_value_error(self, text, chunk_size):
+        with pytest.raises(ValueError):
+            members(text.encode("utf-8"), chunk_size)
+
+    def test_invalid_utf8(self):
+        with pytest.raises(ValueError):
+            members(b'{"orders": ["\xff\xfe"]}', 4)
+
+    def test_early_error_stops_reading(self):
+        chunk_size = 1024
+        body = b'{"orders": [{"order_id": oops}, ' + b", ".join(
+            json.dumps({"order_id": f"ord_{i:05d}", "padding": "x" * 200}).encode()
+            for i in range(5000)) + b'], "pagination": {}}'
+        stream = CountingStream(body)
+        with pytest.raises(ValueError):
+            for _ in iter_response_members(stream, chunk_size):
+                pass
+        assert len(body) > 1_000_000
+        assert stream.bytes_read <= 2 * chunk_size
+
+    def test_validate_stream_reports_invalid_json(self):
+        ok, _, _ = client_validator.validate_stream(io.BytesIO(b'{"orders": [x]}'))
+        assert not ok
+        assert client_validator.RESULTS.violations == 1
+
+
+class TestMainOutput:
+    """Progress lines stay out of a json/junit report written to stdout."""
+
+    @pytest.fixture
+    def page_file(self, tmp_path):
+        _, page = mock_server.handle_orders_request("/dashboard/orders?page=1&page_size=5")
+        path = tmp_path / "page.json"
+        path.write_text(json.dumps(page))
+        return str(path)
+
+    def run_main(self, *argv):
+        with pytest.raises(SystemExit) as exit_info:
+            client_validator.main(list(argv))
+        return exit_info.value.code
+
+    @pytest.mark.parametrize("report_format", ["json", "junit"])
+    def test_report_alone_on_stdout(self, capsys, page_file, report_format):
+        stdout = sys.stdout
+        assert self.run_main("--file", page_file, "--format", report_format) == 0
+        out, err = capsys.readouterr()
+        assert f"Reading: {page_file}" in err
+        assert "Reading:" not in out
+        if report_format == "json":
+            assert json.loads(out)["ok"] is True
+        assert sys.stdout is stdout
+        assert client_validator.PROGRESS is None
+
+    def test_progress_restored_for_next_run(self, capsys, page_file):
+        self.run_main("--file", page_file, "--format", "json")
+        capsys.readouterr()
+        assert self.run_main("--file", page_file) == 0
+        out, err = capsys.readouterr()
+        assert "Reading:" in out and "PASS" in out
+        assert err == ""
+
+    def test_report_file_keeps_progress_on_stdout(self, capsys, page_file, tmp_path):
+        report = tmp_path / "report.json"
+        assert self.run_main("--file", page_file, "--format", "json", "--output", str(report)) == 0
+        out, _ = capsys.readouterr()
+        assert "Reading:" in out
+        assert json.loads(report.read_text())["ok"] is True
+
+
+@pytest.fixture(scope="module")
+def server_url():
+    handler = mock_server.DashboardHandler
+    saved = handler.protocol_version, handler.timeout
+    mock_server.configure_dataset()
+    server = mock_server.make_server("127.0.0.1", 0, mode="thread", workers=8, keep_alive=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/dashboard/orders"
+    server.shutdown()
+    server.server_close()
+    handler.protocol_version, handler.timeout = saved
+
+
+def first_page(url):
+    client_validator.RESULTS.start_record(url)
+    data = client_validator.fetch_json(url)
+    assert client_validator.validate_response(data)
+    return data
+
+
+class TestCrawl:
+    """--crawl and --follow-cursor over every page of a live mock server."""
+
+    @pytest.fixture(autouse=True)
+    def no_etags(self):
+        client_validator.FETCHED_ETAGS.clear()
+        yield
+        client_validator.FETCHED_ETAGS.clear()
+
+    @pytest.mark.parametrize("page, page_size, connections", [(1, 20, 4), (3, 10, 1), (7, 20, 16)])
+    def test_crawl_visits_every_page(self, server_url, page, page_size, connections):
+        url = f"{server_url}?page={page}&page_size={page_size}"
+        data = first_page(url)
+        assert client_validator.crawl(url, data, connections)
+        total_pages = data["pagination"]["total_pages"]
+        assert client_validator.RESULTS.records == total_pages
+        assert client_validator.RESULTS.violations == 0
+        assert len(client_validator.FETCHED_ETAGS) == total_pages
+
+    def test_cursor_walk_visits_every_page(self, server_url):
+        url = f"{server_url}?page_size=20"
+        assert client_validator.follow_cursor(url, first_page(url))
+        assert client_validator.RESULTS.records == 7
+        assert client_validator.RESULTS.violations == 0
+
+    def test_crawl_and_cursor_walk_agree_with_conditional_requests(self, server_url):
+        url = f"{server_url}?page_size=30"
+        assert client_validator.crawl(url, first_page(url), 4)
+        assert client_validator.follow_cursor(url, first_page(url))
+        assert client_validator.check_conditional_requests()
+
+    def test_crawl_reports_a_repeated_page(self, server_url, monkeypatch):
+        render = mock_server.render_orders_request
+
+        def page_3_repeats_page_2(target, *args):
+            return render(target.replace("page=3", "page=2"), *args)
+        monkeypatch.setattr(mock_server, "render_orders_request", page_3_repeats_page_2)
+
+        url = f"{server_url}?page=1&page_size=20"
+        assert not client_validator.crawl(url, first_page(url), 4)
+        assert set(client_validator.RESULTS.patterns) == {
+            "pagination.page", "orders[*].order_id", "pagination.total_orders"}
+        assert client_validator.RESULTS.patterns["orders[*].order_id"][0] == 20
+
+
+def jsonl_corpus(tmp_path):
+    """A JSONL file of mock pages with blank and CRLF lines; returns (path, {offset: line})."""
+    path = tmp_path / "corpus.jsonl"
+    lines = {}
+    with open(path, "wb") as f:
+        for page in range(1, 8):
+            _, data = mock_server.handle_orders_request(f"/dashboard/orders?page={page}&page_size={page * 3}")
+            if page == 3:
+                f.write(b"\n")
+            line = json.dumps(data).encode() + (b"\r\n" if page % 2 else b"\n")
+            lines[f.tell()] = line
+            f.write(line)
+    return path, lines
+
+
+class TestCorpusTasks:
+    """corpus_tasks splits a corpus so every record belongs to exactly one task."""
+
+    def test_every_line_owned_once_at_any_chunk_size(self, tmp_path, monkeypatch):
+        path, lines = jsonl_corpus(tmp_path)
+        size = path.stat().st_size
+        offsets = sorted(lines)
+        # Chunk sizes that put boundaries just before, on and after line starts
+        sizes = {1, 2, 3, 7, 64, size - 1, size, size + 1}
+        sizes |= {offset + delta for offset in offsets[1:] for delta in (-1, 0, 1)}
+        for chunk in sorted(sizes):
+            monkeypatch.setattr(client_validator, "CORPUS_CHUNK_BYTES", chunk)
+            tasks = list(client_validator.corpus_tasks(str(path)))
+            assert tasks[0][2] == 0 and tasks[-1][3] == size
+            assert all(a[3] == b[2] for a, b in zip(tasks, tasks[1:]))
+            records = [record for task in tasks for record in client_validator._iter_task_records(task)]
+            assert records == [(f"{path}@{offset}", lines[offset]) for offset in offsets], chunk
+
+    def test_json_files_are_batched(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(client_validator, "CORPUS_FILES_PER_TASK", 2)
+        (tmp_path / "sub").mkdir()
+        names = ["a.json", "b.json", "c.json", "sub/d.json", "sub/e.jsonl", "notes.txt"]
+        for name in names:
+            (tmp_path / name).write_text("{}\n")
+        tasks = list(client_validator.corpus_tasks(str(tmp_path)))
+        files = [task for task in tasks if task[0] == "files"]
+        assert [len(task[1]) for task in files] == [2, 2]
+        assert sorted(p for task in files for p in task[1]) == sorted(
+            str(tmp_path / name) for name in names if name.endswith(".json"))
+        assert [task[1:] for task in tasks if task[0] == "lines"] == [(str(tmp_path / "sub/e.jsonl"), 0, 3)]
+
+    def test_validate_corpus_merges_every_task(self, tmp_path, monkeypatch):
+        path, lines = jsonl_corpus(tmp_path)
+        with open(path, "ab") as f:
+            f.write(b'{"orders": [], "pagination": {}}\nnot json\n')
+        monkeypatch.setattr(client_validator, "CORPUS_CHUNK_BYTES", 1000)
+        assert not client_validator.validate_corpus(str(path), workers=2)
+        results = client_validator.RESULTS
+        assert results.records == len(lines) + 2
+        assert results.failed_records == 2
+        assert "(response)" in results.patterns
+        assert "pagination.page" in results.patterns
+
+
+def collected(failures):
+    """A ResultCollector fed (location, path, detail) failures."""
+    results = client_validator.ResultCollector(echo=False, max_samples=2)
+    location = None
+    for where, path, detail in failures:
+        if where != location:
+            results.start_record(where)
+            location = where
+        results.add(path, detail)
+    return results
+
+
+FAILURES = [
+    ("p1", "orders[0].status", "'lost' not in valid values"),
+    ("p1", "orders[3].status", "'gone' not in valid values"),
+    ("p1", "orders[2].items[1]", "missing required field 'quantity'"),
+    ("p2", "orders[5].status", "'lost' not in valid values"),
+    ("p2", "", "Response is not valid JSON: <x & y>"),
+]
+
+
+class TestReports:
+    """Failures aggregate by path pattern and render as text, JSON and JUnit."""
+
+    def test_aggregation_by_pattern(self):
+        results = collected(FAILURES)
+        assert (results.records, results.failed_records, results.violations) == (2, 2, 5)
+        assert [(pattern, count) for pattern, (count, _) in results.sorted_patterns()] == [
+            ("orders[*].status", 3), ("(response)", 1), ("orders[*].items[*].quantity", 1)]
+        # Only the first max_samples failures of a pattern keep their text
+        assert results.patterns["orders[*].status"][1] == [
+            ("p1", "orders[0].status", "'lost' not in valid values"),
+            ("p1", "orders[3].status", "'gone' not in valid values")]
+
+    def test_merge_matches_one_collector(self):
+        whole = collected(FAILURES)
+        merged = client_validator.ResultCollector(echo=False, max_samples=2)
+        merged.merge(collected(FAILURES[:3]).state())
+        merged.merge(collected(FAILURES[3:]).state())
+        assert merged.state() == whole.state()
+
+    def test_render_text(self):
+        text = client_validator.render_text(collected(FAILURES))
+        assert text.splitlines()[:3] == [
+            "Failures by path: 5 in 2 of 2 responses",
+            "         3  orders[*].status",
+            "            e.g. p1: orders[0].status: 'lost' not in valid values",
+        ]
+
+    def test_render_json(self):
+        report = json.loads(client_validator.render_json(collected(FAILURES), False))
+        assert {k: report[k] for k in ("ok", "records", "failed_records", "violations")} == {
+            "ok": False, "records": 2, "failed_records": 2, "violations": 5}
+        assert [f["path"] for f in report["failures"]] == [
+            "orders[*].status", "(response)", "orders[*].items[*].quantity"]
+        assert report["failures"][0]["count"] == 3
+        assert report["failures"][0]["samples"][1] == {
+            "location": "p1", "path": "orders[3].status", "message": "'gone' not in valid values"}
+
+    def test_render_junit(self):
+        root = ET.fromstring(client_validator.render_junit(collected(FAILURES), False))
+        assert root.tag == "testsuites"
+        suite = root.find("testsuite")
+        assert (suite.get("tests"), suite.get("failures")) == ("3", "3")
+        cases = suite.findall("testcase")
+        assert [case.get("name") for case in cases] == [
+            "orders[*].status", "(response)", "orders[*].items[*].quantity"]
+        failure = cases[0].find("failure")
+        assert failure.get("message") == "3 violation(s) at orders[*].status"
+        assert failure.text.splitlines() == [
+            "p1: orders[0].status: 'lost' not in valid values",
+            "p1: orders[3].status: 'gone' not in valid values"]
+        # Markup in messages is escaped, so the XML still parses
+        assert cases[1].find("failure").text == "p2: Response is not valid JSON: <x & y>"
+
+    @pytest.mark.parametrize("ok, name, failures", [(True, "validate_response", "0"), (False, "validation", "1")])
+    def test_render_junit_without_failures(self, ok, name, failures):
+        results = client_validator.ResultCollector(echo=False)
+        results.start_record("p1")
+        suite = ET.fromstring(client_validator.render_junit(results, ok)).find("testsuite")
+        assert [case.get("name") for case in suite] == [name]
+        assert (suite.get("tests"), suite.get("failures")) == ("1", failures)
@@ -0,0 +1,100 @@
+"""Tests for contract_drift.py"""
+
+import json
+import os
+
+import pytest
+
+import contract_drift
+import mock_server
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+V3 = os.path.join(os.path.dirname(HERE), "case-02-final-api-spec-discussion-v3")
+
+
+def run_main(capsys, *argv):
+    with pytest.raises(SystemExit) as exit_info:
+        contract_drift.main(list(argv))
+    return exit_info.value.code, capsys.readouterr().out
+
+
+class TestRender:
+    """Responses rendered by the handler without a socket."""
+
+    def test_page(self):
+        status, headers, body = contract_drift.render(mock_server, "/dashboard/orders?page=2&page_size=5")
+        assert status == 200
+        assert headers["content-type"].startswith("application/json")
+        assert int(headers["content-length"]) == len(body)
+        data = json.loads(body)
+        assert data["pagination"]["page"] == 2
+        assert len(data["orders"]) == 5
+
+    def test_error(self):
+        status, _, body = contract_drift.render(mock_server, "/dashboard/orders?page=0")
+        assert status == 400
+        assert "error" in json.loads(body)
+
+
+@pytest.fixture(scope="module")
+def params():
+    with open(os.path.join(HERE, contract_drift.SPEC_FILE)) as f:
+        spec = contract_drift.spec_compiler.load_yaml(f.read())
+    return contract_drift.query_parameters(spec, contract_drift.get_operation(spec)[1])
+
+
+class TestQueries:
+    """Requests generated from the spec's query parameters."""
+
+    def test_smallest_page_query(self, params):
+        assert contract_drift.smallest_page_query(params) == {"page_size": "1"}
+
+    def test_invalid_queries(self, params):
+        reasons = [reason for _, reason in contract_drift.invalid_queries(params)]
+        assert "page below minimum 1" in reasons
+        assert "page_size above maximum 50" in reasons
+        assert "status not in enum" in reasons
+
+
+class TestCursorWalk:
+    """The default sampling follows next_cursor past the first page."""
+
+    @pytest.mark.parametrize("directory", [HERE, V3], ids=["v1", "v3"])
+    def test_walk_spans_pages(self, directory):
+        check = contract_drift.VersionCheck(directory, pages=10, run_js=False)
+        check.run()
+        assert check.report()["cursor_pages"] > 0
+        assert "no cursor walk went past its first page" not in check.notes
+
+    def test_v3_walks_every_order(self):
+        check = contract_drift.VersionCheck(V3, pages=0, run_js=False)
+        assert check.walk_cursors(contract_drift.random.Random(0)) >= check.server.TOTAL_ORDERS - 1
+
+
+class TestReport:
+    """The text and JSON drift reports."""
+
+    def test_text_rows(self, capsys):
+        code, out = run_main(capsys, HERE, V3, "--pages", "20", "--no-js")
+        lines = out.splitlines()
+        assert code == 1
+        assert lines[0] == "v1: case-02-final-api-spec-discussion"
+        assert lines[1].startswith("  ") and "via next_cursor) in " in lines[1]
+        assert "  client_validator.js:" in lines
+        row = lines.index("  client_validator.js:") + 1
+        assert lines[row].split() == ["3", "Order.status"]
+        assert lines[row + 1] == (
+            "            e.g. Order.status: VALID_STATUSES accepts 'processing', not in the spec enum")
+        v3 = lines.index("v3: case-02-final-api-spec-discussion-v3")
+        assert "  no drift" in lines[v3:]
+        assert lines[-2:] == ["---", "FAIL: 3 mismatches across 2 versions"]
+
+    def test_json(self, capsys):
+        code, out = run_main(capsys, V3, "--pages", "20", "--no-js", "--json")
+        report = json.loads(out)
+        assert code == 0
+        assert report["drift"] == 0
+        (version,) = report["versions"]
+        assert version["version"] == "v3"
+        assert version["requests"] == sum(version["status_counts"].values())
+        assert version["drift"] == {}
@@ -0,0 +1,84 @@
+"""Tests for load_generator.py"""
+
+import threading
+
+import pytest
+
+import load_generator
+import mock_server
+from load_generator import parse_mix, percentile
+
+
+class TestParseMix:
+    """Tests for the --mix "query:weight,..." syntax."""
+
+    def test_weighted_entries(self):
+        assert parse_mix("page=1&page_size=20:60, page=2:2.5") == (
+            ["page=1&page_size=20", "page=2"], [60.0, 2.5])
+
+    def test_weight_defaults_to_one(self):
+        assert parse_mix("page=1,page=2:3") == (["page=1", "page=2"], [1.0, 3.0])
+
+    def test_weight_is_after_the_last_colon(self):
+        assert parse_mix("created_after=2025-03-01T00:00:00Z:5") == (
+            ["created_after=2025-03-01T00:00:00Z"], [5.0])
+
+    def test_explicit_weight_for_bare_path(self):
+        assert parse_mix(":1") == ([""], [1.0])
+
+    def test_default_mix(self):
+        queries, weights = parse_mix(load_generator.DEFAULT_MIX)
+        assert len(queries) == len(weights) == 4
+        assert sum(weights) == 100
+
+    @pytest.mark.parametrize("spec, message", [
+        ("page=1:abc", "invalid weight"),
+        ("created_after=2025-03-01T00:00:00Z", "invalid weight"),
+        ("page=1:0", "positive"),
+        ("page=1:-2", "positive"),
+        ("page=1:nan", "positive"),
+        ("page=1:inf", "positive"),
+        ("page=1:1,,page=2:1", "empty entry"),
+        ("", "empty entry"),
+    ])
+    def test_errors(self, spec, message):
+        with pytest.raises(ValueError, match=message):
+            parse_mix(spec)
+
+
+class TestPercentile:
+    """Nearest-rank percentiles."""
+
+    def test_empty(self):
+        assert percentile([], 50) is None
+
+    @pytest.mark.parametrize("pct", [0, 1, 50, 99, 100])
+    def test_one_sample(self, pct):
+        assert percentile([7.5], pct) == 7.5
+
+    def test_nearest_rank(self):
+        values = list(range(1, 101))
+        assert [percentile(values, p) for p in (0, 1, 50, 95, 99, 99.5, 100)] == [1, 1, 50, 95, 99, 100, 100]
+
+    def test_small_list(self):
+        values = [1, 2, 3, 4]
+        assert [percentile(values, p) for p in (25, 26, 50, 75, 100)] == [1, 2, 2, 3, 4]
+
+
+def test_run_load_against_mock_server():
+    handler = mock_server.DashboardHandler
+    saved = handler.protocol_version, handler.timeout
+    server = mock_server.make_server("127.0.0.1", 0, mode="thread", workers=4, keep_alive=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        url = f"http://127.0.0.1:{server.server_address[1]}/dashboard/orders"
+        report = load_generator.run_load(url, 2, 0.3, parse_mix("page=1:3,page=999:1"), keep_alive=True)
+    finally:
+        server.shutdown()
+        server.server_close()
+        handler.protocol_version, handler.timeout = saved
+    assert report["requests"] > 0
+    assert report["errors"] == 0
+    assert set(report["status_counts"]) == {"200"}
+    latency = report["latency_ms"]
+    assert latency["min"] <= latency["p50"] <= latency["p95"] <= latency["p99"] <= latency["max"]
@@ -0,0 +1,518 @@
+"""Tests for mock_server.py"""
+
+import asyncio
+import base64
+import gzip
+import http.client
+import itertools
+import json
+import random
+import socket
+import threading
+import zlib
+from urllib.parse import urlencode
+
+import pytest
+
+import mock_server
+
+
+@pytest.fixture(autouse=True)
+def default_dataset():
+    yield
+    mock_server.configure_dataset()
+
+
+def dataset(seed, total_orders=50):
+    mock_server.configure_dataset(total_orders=total_orders, seed=seed)
+    return list(mock_server.ALL_ORDERS)
+
+
+class TestSeed:
+    """Tests for the --seed dataset setting."""
+
+    def test_default_seed_keeps_original_streams(self):
+        for index in range(50):
+            assert mock_server._order_rng(index).random() == random.Random(index).random()
+
+    def test_same_seed_same_dataset(self):
+        assert dataset(7) == dataset(7)
+
+    def test_different_seeds_differ(self):
+        seeds = [0, 40, 41, 42, 43, 44, 84, -1, 1 << 70]
+        datasets = [dataset(seed) for seed in seeds]
+        for i in range(len(seeds)):
+            for j in range(i + 1, len(seeds)):
+                assert datasets[i] != datasets[j], (seeds[i], seeds[j])
+
+    def test_no_order_is_shared_between_seeds(self):
+        seeds = [0, 40, 41, 42, 43, 44, 84, -1]
+        for index in range(50):
+            draws = set()
+            for seed in seeds:
+                mock_server.SEED = seed
+                draws.add(mock_server._order_rng(index).random())
+            assert len(draws) == len(seeds), index
+
+
+class TestLazyDates:
+    """Large lazy datasets keep realistic, strictly newest-first dates."""
+
+    @pytest.mark.parametrize("total_orders", [1095, 2000, 10_000_000])
+    def test_span_is_capped(self, total_orders):
+        mock_server.configure_dataset(total_orders=total_orders, lazy=True)
+        orders = mock_server.ALL_ORDERS
+        newest, oldest = orders[0]["created_at"], orders[len(orders) - 1]["created_at"]
+        assert "2025-01-01" <= oldest < newest < "2028-01-02"
+        for index in [0, 1, total_orders // 2, total_orders - 2]:
+            assert orders[index]["created_at"] > orders[index + 1]["created_at"]
+
+    def test_default_dates_unchanged(self):
+        orders = dataset(mock_server.DEFAULT_SEED, total_orders=127)
+        assert orders[0]["created_at"] == "2025-05-08T17:45:00Z"
+        assert orders[-1]["created_at"] == "2025-01-02T20:11:00Z"
+
+
+def fetch(**params):
+    status, data = mock_server.handle_orders_request("/dashboard/orders?" + urlencode(params))
+    return status, data
+
+
+def expected_orders(status=None, created_after=None, created_before=None, sort="created_at:desc"):
+    field, descending = mock_server.SORTS[sort]
+    orders = [
+        o for o in mock_server.ALL_ORDERS
+        if (status is None or o["status"] == status)
+        and (created_after is None or o["created_at"] >= created_after)
+        and (created_before is None or o["created_at"] < created_before)
+    ]
+    return sorted(orders, key=lambda o: (o[field], o["order_id"]), reverse=descending)
+
+
+def walk_cursors(page_size, **filters):
+    """Follow next_cursor from the first page to the last; return every order seen."""
+    params = {k: v for k, v in filters.items() if v is not None}
+    status, data = fetch(page_size=page_size, **params)
+    assert status == 200
+    orders = list(data["orders"])
+    while data["pagination"]["next_cursor"]:
+        status, data = fetch(page_size=page_size, cursor=data["pagination"]["next_cursor"], **params)
+        assert status == 200
+        assert len(data["orders"]) <= page_size
+        orders.extend(data["orders"])
+    return orders
+
+
+class TestKeysetPagination:
+    """Brute-force checks of OrderIndex and cursors against filtering and sorting in Python."""
+
+    RANGES = [
+        (None, None),
+        ("2025-03-01T00:00:00Z", None),
+        (None, "2025-04-15T00:00:00Z"),
+        ("2025-02-10T00:00:00Z", "2025-03-20T12:00:00Z"),
+    ]
+
+    @pytest.mark.parametrize("sort", sorted(mock_server.SORTS))
+    def test_cursor_walks_match_brute_force(self, sort):
+        for status, (after, before), page_size in itertools.product(
+            [None, *mock_server.STATUSES], self.RANGES, [7, 50]
+        ):
+            filters = dict(status=status, created_after=after, created_before=before, sort=sort)
+            assert walk_cursors(page_size, **filters) == expected_orders(**filters), filters
+
+    @pytest.mark.parametrize("sort", ["created_at:asc", "total_cents:desc"])
+    def test_pages_match_brute_force(self, sort):
+        for status in [None, "shipped"]:
+            expected = expected_orders(status=status, sort=sort)
+            params = {"sort": sort, "page_size": 9, **({"status": status} if status else {})}
+            for page in range(1, len(expected) // 9 + 3):
+                code, data = fetch(page=page, **params)
+                assert code == 200
+                assert data["orders"] == expected[(page - 1) * 9:page * 9]
+                assert data["pagination"]["total_orders"] == len(expected)
+
+    def test_cursor_round_trip(self):
+        order = mock_server.ALL_ORDERS[3]
+        for field in ("created_at", "total_cents"):
+            cursor = mock_server.encode_cursor(order, field)
+            assert mock_server.decode_cursor(cursor, field) == (order[field], order["order_id"])
+
+
+def encoded(value):
+    return base64.urlsafe_b64encode(json.dumps(value).encode()).rstrip(b"=").decode()
+
+
+class TestInvalidCursors:
+    """Malformed and tampered cursors get a 400 response."""
+
+    @pytest.mark.parametrize("cursor", [
+        "!!!not-base64!!!",
+        encoded("just a string"),
+        encoded(["2025-03-01T00:00:00Z"]),
+        encoded(["2025-03-01T00:00:00Z", "ord_00001", "extra"]),
+        encoded([12345, "ord_00001"]),
+        encoded(["2025-03-01T00:00:00Z", 7]),
+        base64.urlsafe_b64encode(b"\xff\xfe{[").decode(),
+    ])
+    def test_malformed_cursor(self, cursor):
+        status, data = fetch(cursor=cursor)
+        assert status == 400
+        assert data == {"error": "invalid cursor"}
+
+    def test_tampered_cursor(self):
+        _, data = fetch(page_size=5)
+        cursor = data["pagination"]["next_cursor"]
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        for tampered in [b"{" + raw[1:], raw[:-1], raw.replace(b'","', b'",')]:
+            status, _ = fetch(cursor=base64.urlsafe_b64encode(tampered).decode())
+            assert status == 400, tampered
+        status, _ = fetch(cursor=cursor[:8])
+        assert status == 400
+
+    def test_cursor_from_another_sort(self):
+        _, data = fetch(page_size=5, sort="created_at:desc")
+        status, _ = fetch(cursor=data["pagination"]["next_cursor"], sort="total_cents:desc")
+        assert status == 400
+
+    def test_cursor_with_page(self):
+        _, data = fetch(page_size=5)
+        status, _ = fetch(page=2, cursor=data["pagination"]["next_cursor"])
+        assert status == 400
+
+
+class TestPageCache:
+    """PageCache is an LRU with hit, miss and eviction counters."""
+
+    def test_evicts_least_recently_used(self):
+        cache = mock_server.PageCache(maxsize=2)
+        built = []
+
+        def get(key):
+            return cache.get(key, lambda: built.append(key) or key.upper())
+
+        assert [get("a"), get("b"), get("a")] == ["A", "B", "A"]
+        get("c")  # evicts "b", the least recently used
+        assert list(cache._entries) == ["a", "c"]
+        get("a")
+        get("b")  # rebuilt, evicts "c"
+        assert built == ["a", "b", "c", "b"]
+        assert list(cache._entries) == ["a", "b"]
+        assert cache.stats() == {"hits": 2, "misses": 4, "evictions": 2, "size": 2,
+                                 "maxsize": 2, "hit_rate": 0.3333}
+
+    def test_zero_maxsize_caches_nothing(self):
+        cache = mock_server.PageCache(maxsize=0)
+        for _ in range(3):
+            assert cache.get("a", lambda: "A") == "A"
+        assert cache.stats()["misses"] == 3
+        assert cache.stats()["size"] == 0
+
+    def test_clear_keeps_counters(self):
+        cache = mock_server.PageCache()
+        cache.get("a", lambda: "A")
+        cache.get("a", lambda: "A")
+        cache.clear()
+        assert cache.stats()["size"] == 0
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_requests_share_entries_by_query(self):
+        mock_server.configure_dataset()
+        before = mock_server.PAGE_CACHE.stats()
+        first = mock_server.render_orders_request("/dashboard/orders?page=2&page_size=10")
+        # The same query spelled differently is one entry; pretty is another
+        again = mock_server.render_orders_request("/dashboard/orders?page_size=10&page=2")
+        pretty = mock_server.render_orders_request("/dashboard/orders?page=2&page_size=10&pretty=true")
+        after = mock_server.PAGE_CACHE.stats()
+        assert first == again
+        assert pretty[2] != first[2]
+        assert json.loads(pretty[2]) == json.loads(first[2])
+        assert after["misses"] - before["misses"] == 2
+        assert after["hits"] - before["hits"] == 1
+
+    def test_configure_dataset_drops_cached_pages(self):
+        mock_server.render_orders_request("/dashboard/orders?page=1")
+        mock_server.configure_dataset(seed=9)
+        assert mock_server.PAGE_CACHE.stats()["size"] == 0
+        _, _, body = mock_server.render_orders_request("/dashboard/orders?page=1")
+        assert json.loads(body)["orders"][0] == mock_server.ALL_ORDERS[0]
+
+
+class TestContentEncoding:
+    """Accept-Encoding negotiation and the compressed bodies it selects."""
+
+    @pytest.mark.parametrize("accept_encoding, coding", [
+        ("", "identity"),
+        ("gzip", "gzip"),
+        ("deflate", "deflate"),
+        ("GZIP", "gzip"),
+        ("br", "identity"),
+        ("gzip, deflate", "gzip"),
+        ("deflate, gzip", "gzip"),
+        ("gzip;q=0.5, deflate", "deflate"),
+        ("gzip;q=0.5, deflate;q=0.5", "gzip"),
+        ("gzip;q=0", "identity"),
+        ("gzip;q=0, deflate;q=0.1", "deflate"),
+        ("gzip;q=bogus", "identity"),
+        ("gzip ; q=0.8", "gzip"),
+        ("identity;q=0, deflate;q=0.3", "deflate"),
+        ("gzip;q=0.5, identity", "identity"),
+        ("gzip;q=1, identity;q=1", "gzip"),
+        ("*", "gzip"),
+        ("*;q=0", "identity"),
+        ("*;q=0.5, identity", "identity"),
+        ("*, gzip;q=0", "deflate"),
+    ])
+    def test_q_values(self, accept_encoding, coding):
+        assert mock_server.negotiate_encoding(accept_encoding) == coding
+
+    @pytest.mark.parametrize("coding, decompress", [
+        ("gzip", gzip.decompress),
+        ("deflate", zlib.decompress),
+    ])
+    def test_compressed_body_round_trips(self, coding, decompress):
+        _, plain_headers, plain = mock_server.respond("GET", TARGET)
+        status, headers, body = mock_server.respond("GET", TARGET, coding)
+        headers = dict(headers)
+        assert status == 200
+        assert headers["Content-Encoding"] == coding
+        assert headers["Content-Length"] == str(len(body))
+        assert headers["Vary"] == "Accept-Encoding"
+        assert len(body) < len(plain)
+        assert decompress(body) == plain
+        # Each coding is its own representation with its own ETag
+        assert headers["ETag"] != dict(plain_headers)["ETag"]
+        assert "Content-Encoding" not in dict(plain_headers)
+
+    def test_errors_are_not_compressed(self):
+        status, headers, body = mock_server.respond("GET", "/dashboard/orders?page=0", "gzip")
+        assert status == 400
+        assert "Content-Encoding" not in dict(headers)
+        assert "error" in json.loads(body)
+
+
+def etag_of(target=None, accept_encoding=""):
+    _, headers, _ = mock_server.respond("GET", target or TARGET, accept_encoding)
+    return dict(headers)["ETag"]
+
+
+class TestConditionalRequests:
+    """ETag, If-None-Match, 304 and HEAD responses."""
+
+    @pytest.mark.parametrize("if_none_match, matches", [
+        ("", False),
+        ("{etag}", True),
+        ("W/{etag}", True),
+        ("*", True),
+        (" * ", True),
+        ('"other", {etag}', True),
+        ('"other", W/{etag}', True),
+        ('"other"', False),
+        ("{unquoted}", False),
+        ("W/{unquoted}", False),
+    ])
+    def test_etag_matches(self, if_none_match, matches):
+        etag = '"abc123"'
+        header = if_none_match.format(etag=etag, unquoted=etag.strip('"'))
+        assert mock_server.etag_matches(header, etag) is matches
+
+    @pytest.mark.parametrize("form", ["{etag}", "W/{etag}", "*", '"stale", {etag}'])
+    def test_304_on_match(self, form):
+        etag = etag_of()
+        status, headers, body = mock_server.respond("GET", TARGET, "", form.format(etag=etag))
+        headers = dict(headers)
+        assert status == 304
+        assert body == b""
+        assert headers["ETag"] == etag
+        assert headers["Cache-Control"] == mock_server.CACHE_CONTROL
+        assert "Content-Length" not in headers and "Content-Type" not in headers
+
+    def test_200_on_stale_or_other_coding_etag(self):
+        status, _, body = mock_server.respond("GET", TARGET, "", '"stale"')
+        assert status == 200 and body
+        # The identity ETag does not match the gzip representation
+        status, _, _ = mock_server.respond("GET", TARGET, "gzip", etag_of())
+        assert status == 200
+        status, _, _ = mock_server.respond("GET", TARGET, "gzip", etag_of(accept_encoding="gzip"))
+        assert status == 304
+
+    def test_etag_follows_content(self):
+        assert etag_of() == etag_of()
+        assert etag_of() != etag_of("/dashboard/orders?page=2")
+        before = etag_of()
+        mock_server.configure_dataset(seed=9)
+        assert etag_of() != before
+
+    def test_head_has_get_headers_and_no_body(self):
+        get_status, get_headers, get_body = mock_server.respond("GET", TARGET)
+        status, headers, body = mock_server.respond("HEAD", TARGET)
+        assert (status, headers, body) == (get_status, get_headers, b"")
+        assert dict(headers)["Content-Length"] == str(len(get_body))
+        status, _, body = mock_server.respond("HEAD", TARGET, "", etag_of())
+        assert (status, body) == (304, b"")
+
+
+METHODS = ["POST", "PUT", "PATCH", "DELETE", "OPTIONS"]
+TARGET = "/dashboard/orders?page=1"
+
+
+def via_respond(method):
+    status, headers, body = mock_server.respond(method, TARGET)
+    return status, dict(headers), body
+
+
+def via_wsgi(method):
+    path, _, query = TARGET.partition("?")
+    captured = {}
+
+    def start_response(status, headers):
+        captured["status"] = int(status.split()[0])
+        captured["headers"] = dict(headers)
+
+    body = b"".join(mock_server.wsgi_app(
+        {"REQUEST_METHOD": method, "PATH_INFO": path, "QUERY_STRING": query}, start_response))
+    return captured["status"], captured["headers"], body
+
+
+def via_asgi(method):
+    path, _, query = TARGET.partition("?")
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"{}", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {"type": "http", "method": method, "path": path,
+             "query_string": query.encode(), "headers": []}
+    asyncio.run(mock_server.asgi_app(scope, receive, send))
+    start, body = messages
+    headers = {name.decode().title(): value.decode() for name, value in start["headers"]}
+    return start["status"], headers, body["body"]
+
+
+def over_connection(port, method):
+    """Send `method` with a body, then a GET on the same persistent connection."""
+    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+    try:
+        connection.request(method, TARGET, body=b'{"order_id": "ord_1"}')
+        response = connection.getresponse()
+        result = response.status, dict(response.getheaders()), response.read()
+        connection.request("GET", TARGET)
+        follow_up = connection.getresponse()
+        follow_up.read()
+        assert follow_up.status == 200
+        return result
+    finally:
+        connection.close()
+
+
+@pytest.fixture(scope="module")
+def http_server_port():
+    handler = mock_server.DashboardHandler
+    saved = handler.protocol_version, handler.timeout
+    server = mock_server.make_server("127.0.0.1", 0, keep_alive=True)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server.server_address[1]
+    server.shutdown()
+    server.server_close()
+    handler.protocol_version, handler.timeout = saved
+
+
+@pytest.fixture(scope="module")
+def asyncio_port():
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    server = asyncio.run_coroutine_threadsafe(
+        asyncio.start_server(mock_server._handle_connection, "127.0.0.1", 0), loop).result()
+    yield server.sockets[0].getsockname()[1]
+    server.close()
+    asyncio.run_coroutine_threadsafe(server.wait_closed(), loop).result()
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+    loop.close()
+
+
+class TestMethodNotAllowed:
+    """Every transport answers methods other than GET and HEAD with the same 405."""
+
+    @pytest.mark.parametrize("method", METHODS)
+    def test_same_405_on_every_transport(self, method, http_server_port, asyncio_port):
+        responses = {
+            "respond": via_respond(method),
+            "wsgi": via_wsgi(method),
+            "asgi": via_asgi(method),
+            "http.server": over_connection(http_server_port, method),
+            "asyncio": over_connection(asyncio_port, method),
+        }
+        for transport, (status, headers, body) in responses.items():
+            assert status == 405, transport
+            assert headers["Allow"] == "GET, HEAD", transport
+            assert headers["Content-Type"] == "application/json", transport
+            assert json.loads(body) == {"error": "Method not allowed"}, transport
+
+
+def read_response(stream):
+    """Read one HTTP/1.x response from a binary stream: (status, headers, body)."""
+    status_line = stream.readline()
+    if not status_line:
+        return None
+    status = int(status_line.split()[1])
+    headers = {}
+    for line in iter(stream.readline, b"\r\n"):
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    return status, headers, stream.read(int(headers.get("content-length", 0)))
+
+
+def raw_exchange(port, payload):
+    """Send `payload` at once on one socket; return every response until it closes."""
+    with socket.create_connection(("127.0.0.1", port), timeout=5) as sock:
+        sock.sendall(payload)
+        stream = sock.makefile("rb")
+        return list(iter(lambda: read_response(stream), None))
+
+
+def request(target, *headers, version="HTTP/1.1"):
+    lines = [f"GET {target} {version}", "Host: localhost", *headers]
+    return ("\r\n".join(lines) + "\r\n\r\n").encode()
+
+
+class TestKeepAlive:
+    """Persistent connections and pipelined requests on the asyncio engine."""
+
+    def test_two_pipelined_requests(self, asyncio_port):
+        responses = raw_exchange(asyncio_port, request("/dashboard/orders?page=1&page_size=5")
+                                 + request("/dashboard/orders?page=2&page_size=5", "Connection: close"))
+        assert [status for status, _, _ in responses] == [200, 200]
+        first, second = (json.loads(body) for _, _, body in responses)
+        assert first["pagination"]["page"] == 1
+        assert second["pagination"]["page"] == 2
+        assert first["orders"][0] != second["orders"][0]
+        assert responses[0][1]["connection"] == "keep-alive"
+        assert responses[1][1]["connection"] == "close"
+
+    def test_pipelined_request_after_a_body(self, asyncio_port):
+        post = (b"POST /dashboard/orders HTTP/1.1\r\nHost: localhost\r\n"
+                b"Content-Length: 11\r\n\r\n{\"a\": \"b\"}\n")
+        responses = raw_exchange(asyncio_port, post + request(TARGET, "Connection: close"))
+        assert [status for status, _, _ in responses] == [405, 200]
+
+    def test_connection_close_ends_the_connection(self, asyncio_port):
+        responses = raw_exchange(asyncio_port, request(TARGET, "Connection: close") + request(TARGET))
+        assert len(responses) == 1
+
+    def test_http_1_0_closes_unless_asked(self, asyncio_port):
+        responses = raw_exchange(asyncio_port, request(TARGET, version="HTTP/1.0") + request(TARGET))
+        assert len(responses) == 1
+        responses = raw_exchange(asyncio_port, request(TARGET, "Connection: keep-alive", version="HTTP/1.0")
+                                 + request(TARGET, "Connection: close", version="HTTP/1.0"))
+        assert [status for status, _, _ in responses] == [200, 200]
+
+    def test_http_server_pipelining(self, http_server_port):
+        responses = raw_exchange(http_server_port, request(TARGET) + request(TARGET, "Connection: close"))
+        assert [status for status, _, _ in responses] == [200, 200]
+        assert responses[0][2] == responses[1][2]
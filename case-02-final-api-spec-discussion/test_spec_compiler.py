@@ -0,0 +1,281 @@
+"""Tests for spec_compiler.py"""
+
+import copy
+import math
+import os
+import shutil
+
+import pytest
+
+try:
+    import yaml
+except ImportError:
+    yaml = None
+
+import client_validator
+import mock_server
+import spec_compiler
+from spec_compiler import SpecError, _SubsetYAMLLoader
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SPEC = os.path.join(HERE, "final_api_spec.yaml")
+SPECS = [
+    os.path.join(os.path.dirname(HERE), name, "final_api_spec.yaml")
+    for name in [
+        "case-02-final-api-spec-discussion",
+        "case-02-final-api-spec-discussion-v2",
+        "case-02-final-api-spec-discussion-v3",
+    ]
+]
+
+needs_yaml = pytest.mark.skipif(yaml is None, reason="PyYAML is not installed")
+
+
+@pytest.fixture(autouse=True)
+def quiet_results():
+    client_validator.RESULTS.reset()
+    client_validator.RESULTS.echo = False
+    yield
+    client_validator.RESULTS.reset()
+    client_validator.RESULTS.echo = True
+
+
+def same_value(a, b):
+    if isinstance(a, float) and isinstance(b, float) and math.isnan(a) and math.isnan(b):
+        return True
+    return a == b and type(a) is type(b) and getattr(a, "tzinfo", None) == getattr(b, "tzinfo", None)
+
+
+class TestSubsetYAMLLoader:
+    """The fallback loader reads our specs exactly as PyYAML's safe_load does."""
+
+    @needs_yaml
+    @pytest.mark.parametrize("path", SPECS, ids=["v1", "v2", "v3"])
+    def test_specs_match_safe_load(self, path):
+        with open(path) as f:
+            text = f.read()
+        assert _SubsetYAMLLoader(text).load() == yaml.safe_load(text)
+
+    @needs_yaml
+    @pytest.mark.parametrize("scalar", [
+        "yes", "No", "ON", "off", "y", "n", "true", "False", "null", "~", "Null",
+        "0", "-0", "+12", "1_000", "0777", "08", "0x1F", "-0x1_F", "0b101", "0o17",
+        "1.5", "1.", ".5", "1e5", "1.0e+5", "1.0e5", "1_0.5", "-.inf", "+.inf", ".NaN",
+        "2001-12-14", "2025-01-15T10:30:00Z", "2025-1-5 1:02:03.1234567 -05:30",
+        "2025-01-15t10:30:00+02", "2025-01-15T10:30:00", "3.14.15", "hello world",
+        "'quoted: yes'", '"escaped \\u00e9"', "text # comment",
+    ])
+    def test_scalars_match_safe_load(self, scalar):
+        text = f"key: {scalar}\n"
+        assert same_value(_SubsetYAMLLoader(text).load()["key"], yaml.safe_load(text)["key"])
+
+    @needs_yaml
+    def test_block_scalars_match_safe_load(self):
+        text = (
+            "folded: >\n  one\n  two\n\n  three\n"
+            "literal: |\n  one\n  two\n"
+            "stripped: >-\n  one\n  two\n"
+            "list:\n- a\n- key: value\n  other: 2\n-\n  nested: true\n"
+        )
+        assert _SubsetYAMLLoader(text).load() == yaml.safe_load(text)
+
+    @pytest.mark.parametrize("text", [
+        "key: {a: 1}",
+        "key: [1, 2]",
+        "key: &anchor 1",
+        "key: *anchor",
+        "key: !!str 1",
+        "key: 12:30",
+        "key: 0b_",
+        "key: 2025-02-30",
+        "---\nkey: 1",
+        "key:\n\tnested: 1",
+        "key: 1\nkey: 2",
+    ])
+    def test_unsupported_input_raises_spec_error(self, text):
+        with pytest.raises(SpecError):
+            _SubsetYAMLLoader(text).load()
+
+
+def valid_page():
+    _, page = mock_server.handle_orders_request("/dashboard/orders?page=1&page_size=5")
+    page = copy.deepcopy(page)
+    for order in page["orders"]:
+        order["items"] = order["items"][:3]
+    return page
+
+
+def set_field(path, value):
+    def mutate(data):
+        *parents, last = path
+        target = data
+        for key in parents:
+            target = target[key]
+        target[last] = value
+    return mutate
+
+
+def delete_field(path):
+    def mutate(data):
+        *parents, last = path
+        target = data
+        for key in parents:
+            target = target[key]
+        del target[last]
+    return mutate
+
+
+MUTATIONS = {
+    "valid": lambda data: None,
+    **{f"missing {field}": delete_field(["orders", 1, field])
+       for field in client_validator.REQUIRED_ORDER_FIELDS},
+    **{f"null {field}": set_field(["orders", 1, field], None)
+       for field in client_validator.REQUIRED_ORDER_FIELDS},
+    **{f"missing item {field}": delete_field(["orders", 0, "items", 0, field])
+       for field in client_validator.REQUIRED_ITEM_FIELDS},
+    **{f"missing pagination {field}": delete_field(["pagination", field])
+       for field in client_validator.REQUIRED_PAGINATION_FIELDS},
+    "unknown status": set_field(["orders", 1, "status"], "lost"),
+    "created_at not a date": set_field(["orders", 1, "created_at"], "yesterday"),
+    "created_at month 13": set_field(["orders", 1, "created_at"], "2025-13-01T00:00:00Z"),
+    "total_cents string": set_field(["orders", 1, "total_cents"], "12"),
+    "total_cents float": set_field(["orders", 1, "total_cents"], 1.5),
+    "total_items_count 0": set_field(["orders", 1, "total_items_count"], 0),
+    "total_items_count below items": set_field(["orders", 0, "total_items_count"], 0),
+    "four items": lambda data: data["orders"][1].__setitem__("items", data["orders"][1]["items"] * 4),
+    "items object": set_field(["orders", 1, "items"], {}),
+    "image url ftp": set_field(["orders", 0, "items", 0, "product_image_url"], "ftp://x"),
+    "image url relative": set_field(["orders", 0, "items", 0, "product_image_url"], "cdn/x.webp"),
+    "quantity string": set_field(["orders", 0, "items", 0, "quantity"], "2"),
+    "quantity 0": set_field(["orders", 0, "items", 0, "quantity"], 0),
+    "page 0": set_field(["pagination", "page"], 0),
+    "page_size 51": set_field(["pagination", "page_size"], 51),
+    "total_pages -1": set_field(["pagination", "total_pages"], -1),
+    "next_cursor number": set_field(["pagination", "next_cursor"], 5),
+    "no next_cursor": delete_field(["pagination", "next_cursor"]),
+    "orders object": set_field(["orders"], {}),
+    "order not object": set_field(["orders", 0], 5),
+    "no orders": delete_field(["orders"]),
+    "no pagination": delete_field(["pagination"]),
+}
+
+
+class FailRecorder:
+    def __init__(self):
+        self.failures = []
+
+    def __call__(self, path, detail):
+        self.failures.append((path, detail))
+        return False
+
+    def patterns(self):
+        return {client_validator.path_pattern(path, detail) for path, detail in self.failures}
+
+
+@pytest.fixture(scope="module")
+def compiled(tmp_path_factory):
+    recorder = FailRecorder()
+    validators = spec_compiler.load_validators(
+        SPEC, recorder, cache_dir=str(tmp_path_factory.mktemp("cache")),
+        object_checks={"Order": client_validator.items_count_problem})
+    return validators, recorder
+
+
+def hand_verdict(data):
+    client_validator.RESULTS.reset()
+    ok = client_validator.validate_response(data)
+    patterns = set(client_validator.RESULTS.patterns)
+    return ok, patterns
+
+
+def compiled_verdict(compiled, data):
+    validators, recorder = compiled
+    recorder.failures.clear()
+    return validators.validate_response(data), recorder.patterns()
+
+
+class TestCompiledValidators:
+    """Validators compiled from final_api_spec.yaml agree with the hand-written tables."""
+
+    @pytest.mark.parametrize("name", sorted(MUTATIONS))
+    def test_same_verdict_and_failing_paths(self, compiled, name):
+        data = valid_page()
+        MUTATIONS[name](data)
+        hand = hand_verdict(copy.deepcopy(data))
+        assert compiled_verdict(compiled, copy.deepcopy(data)) == hand
+        assert hand[0] == (name in ("valid", "no next_cursor"))
+
+    def test_spec_is_stricter_about_booleans(self, compiled):
+        # JSON true is an int to isinstance() but not an integer to the spec
+        data = valid_page()
+        data["orders"][0]["total_cents"] = True
+        assert hand_verdict(copy.deepcopy(data))[0] is True
+        assert compiled_verdict(compiled, data) == (False, {"orders[*].total_cents"})
+
+    def test_hand_tables_reject_empty_cursor(self, compiled):
+        # The spec has no minLength for next_cursor
+        data = valid_page()
+        data["pagination"]["next_cursor"] = ""
+        assert hand_verdict(copy.deepcopy(data)) == (False, {"pagination.next_cursor"})
+        assert compiled_verdict(compiled, data) == (True, set())
+
+    def test_mock_server_pages_pass(self, compiled):
+        for page in range(1, 8):
+            _, data = mock_server.handle_orders_request(f"/dashboard/orders?page={page}&page_size=20")
+            assert compiled_verdict(compiled, data) == (True, set())
+
+
+class TestCache:
+    """Generated source is cached per spec content, compiler version and object checks."""
+
+    @pytest.fixture
+    def spec_copy(self, tmp_path):
+        path = tmp_path / "spec.yaml"
+        shutil.copy(SPEC, path)
+        return path
+
+    def test_unchanged_spec_reuses_cache(self, spec_copy, tmp_path, monkeypatch):
+        first = spec_compiler.compile_spec(str(spec_copy), str(tmp_path / "cache"))
+
+        def no_generation(*args, **kwargs):
+            raise AssertionError("spec was compiled again")
+        monkeypatch.setattr(spec_compiler, "generate_source", no_generation)
+        assert spec_compiler.compile_spec(str(spec_copy), str(tmp_path / "cache")) == first
+
+    def test_changed_spec_is_recompiled(self, spec_copy, tmp_path):
+        cache = str(tmp_path / "cache")
+        recorder = FailRecorder()
+        data = valid_page()
+        data["pagination"]["page_size"] = 40
+
+        before = spec_compiler.load_validators(str(spec_copy), recorder, cache_dir=cache)
+        assert before.validate_response(copy.deepcopy(data))
+
+        text = spec_copy.read_text()
+        assert "maximum: 50" in text
+        spec_copy.write_text(text.replace("maximum: 50", "maximum: 30"))
+        after = spec_compiler.load_validators(str(spec_copy), recorder, cache_dir=cache)
+        assert after.source_path != before.source_path
+        assert not after.validate_response(copy.deepcopy(data))
+        assert recorder.patterns() == {"pagination.page_size"}
+        assert len(os.listdir(cache)) == 2
+
+    def test_compiler_version_changes_key(self, spec_copy, tmp_path, monkeypatch):
+        cache = str(tmp_path / "cache")
+        first = spec_compiler.compile_spec(str(spec_copy), cache)
+        monkeypatch.setattr(spec_compiler, "COMPILER_VERSION", spec_compiler.COMPILER_VERSION + 1)
+        assert spec_compiler.compile_spec(str(spec_copy), cache) != first
+
+    def test_object_checks_change_key(self, spec_copy, tmp_path):
+        cache = str(tmp_path / "cache")
+        plain = spec_compiler.compile_spec(str(spec_copy), cache)
+        checked = spec_compiler.compile_spec(str(spec_copy), cache, ("Order",))
+        assert plain != checked
+        with open(checked) as f:
+            assert "_check_order" in f.read()
+
+    def test_invalid_spec_raises_spec_error(self, tmp_path):
+        path = tmp_path / "broken.yaml"
+        path.write_text("openapi: 3.0.3\npaths: {broken\n")
+        with pytest.raises(SpecError):
+            spec_compiler.compile_spec(str(path), str(tmp_path / "cache"))
@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+Benchmark and uniformity checks for dice_roller.py, with JSON results.
+
+Times roll_dice and calculate_total against the bulk and streaming paths
+(roll_dice_bulk, roll_stats, write_rolls, simulate) at sizes from 10 up to
+--max-size dice, then runs a chi-square test of each path against a fair
+die. Paths that build a Python list stop at --list-limit dice to keep
+memory in check.
+
+Results go to --output as JSON, along with the git commit. --compare
+checks them against an earlier file: a path more than --tolerance times
+slower, or a uniformity test with p below --alpha, exits with status 1.
+
+Usage:
+    python bench_dice_roller.py
+    python bench_dice_roller.py --max-size 100000000 --output bench.json
+    python bench_dice_roller.py --compare bench.json
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import subprocess
+import sys
+import time
+
+import dice_roller
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def gamma_q(a, x):
+    """Regularized upper incomplete gamma function Q(a, x)."""
+    if x <= 0:
+        return 1.0
+    log_prefix = a * math.log(x) - x - math.lgamma(a)
+    if x < a + 1:
+        term = total = 1 / a
+        n = a
+        while abs(term) > abs(total) * 1e-15:
+            n += 1
+            term *= x / n
+            total += term
+        return max(0.0, 1 - total * math.exp(log_prefix))
+    # Continued fraction, evaluated with the modified Lentz method.
+    tiny = 1e-300
+    b = x + 1 - a
+    c = 1 / tiny
+    d = 1 / b
+    h = d
+    for i in range(1, 10000):
+        an = -i * (i - a)
+        b += 2
+        d = an * d + b
+        d = tiny if abs(d) < tiny else d
+        c = b + an / c
+        c = tiny if abs(c) < tiny else c
+        d = 1 / d
+        delta = d * c
+        h *= delta
+        if abs(delta - 1) < 1e-15:
+            break
+    return math.exp(log_prefix) * h
+
+
+def chi_square_p(stats):
+    """P-value of a RollStats' chi-square statistic against a fair die."""
+    return gamma_q((stats.num_faces - 1) / 2, stats.chi_square() / 2)
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=HERE,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class NullSink:
+    """Binary stream that drops what it is given, to time encoding alone."""
+
+    def write(self, data):
+        return len(data)
+
+
+def timing_cases(faces, workers):
+    """(name, builds a list, setup(n) -> args, run(*args)) for each timed path."""
+    sink = NullSink()
+    return [
+        ("roll_dice", True, lambda n: (n,), lambda n: dice_roller.roll_dice(n, faces)),
+        ("calculate_total(list)", True, lambda n: (dice_roller.roll_dice(n, faces),),
+         dice_roller.calculate_total),
+        ("roll_dice_bulk", False, lambda n: (n,), lambda n: dice_roller.roll_dice_bulk(n, faces)),
+        ("calculate_total(array)", False, lambda n: (dice_roller.roll_dice_bulk(n, faces),),
+         dice_roller.calculate_total),
+        ("roll_stats", False, lambda n: (n,), lambda n: dice_roller.roll_stats(n, faces)),
+        ("write_rolls(plain)", False, lambda n: (n,),
+         lambda n: dice_roller.write_rolls(sink, n, faces, "plain")),
+        ("write_rolls(int8)", False, lambda n: (n,),
+         lambda n: dice_roller.write_rolls(sink, n, faces, "int8")),
+        (f"simulate(workers={workers})", False, lambda n: (n,),
+         lambda n: dice_roller.simulate(n, faces, seed=0, workers=workers)),
+    ]
+
+
+def time_case(setup, run, size, repeat):
+    """Fastest of `repeat` runs of run(*setup(size)), in seconds."""
+    best = None
+    for _ in range(repeat):
+        args = setup(size)
+        started = time.perf_counter()
+        run(*args)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def uniformity_sources(seed, workers):
+    """(name, rolls(n, faces) -> RollStats) for each path checked for bias.
+
+    Every path starts from `seed`, so a --compare run tests the same rolls.
+    """
+    def from_rolls(roll):
+        def rolls(n, faces):
+            stats = dice_roller.RollStats(faces)
+            stats.update(roll(n, faces, random.Random(seed)))
+            return stats
+        return rolls
+
+    def roll_dice(n, faces, rng):
+        # roll_dice takes no rng; it draws from the random module's generator
+        random.seed(rng.getrandbits(64))
+        return dice_roller.roll_dice(n, faces)
+
+    return [
+        ("roll_dice", True, from_rolls(roll_dice)),
+        ("roll_dice_bulk", False, from_rolls(dice_roller.roll_dice_bulk)),
+        ("roll_stats", False, lambda n, faces: dice_roller.roll_stats(n, faces, random.Random(seed))),
+        ("simulate", False, lambda n, faces: dice_roller.simulate(n, faces, seed, workers)),
+    ]
+
+
+def compare(previous, results, tolerance, alpha):
+    """Print how results moved against a previous run; return the regressions."""
+    before = {(t["name"], t["size"]): t for t in previous.get("timings", [])}
+    regressions = []
+    print(f"Compared with {previous.get('commit') or 'previous run'}:")
+    for t in results["timings"]:
+        old = before.get((t["name"], t["size"]))
+        if old is None or t["seconds"] < 1e-3:
+            continue
+        ratio = t["seconds"] / old["seconds"]
+        if ratio > tolerance:
+            regressions.append(f"{t['name']} at {t['size']} dice: {ratio:.2f}x slower")
+    for u in results["uniformity"]:
+        if u["p_value"] < alpha:
+            regressions.append(f"{u['source']} d{u['faces']}: chi-square p = {u['p_value']:.2e}")
+    for line in regressions:
+        print(f"  REGRESSION: {line}")
+    if not regressions:
+        print(f"  no path more than {tolerance:.2f}x slower, all uniformity tests pass")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time dice_roller and check its rolls are uniform.")
+    parser.add_argument("--max-size", type=int, default=10**6,
+                        help="Largest number of dice to time (default: 1000000)")
+    parser.add_argument("--list-limit", type=int, default=10**7,
+                        help="Largest size for paths that build a list (default: 10000000)")
+    parser.add_argument("--faces", type=int, default=6, help="Faces per die when timing (default: 6)")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="Runs per measurement below 10^7 dice, best is kept (default: 3)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="Worker processes for simulate (default: CPU count)")
+    parser.add_argument("--chi-samples", type=int, default=10**6,
+                        help="Rolls per uniformity test (default: 1000000)")
+    parser.add_argument("--chi-faces", default="2,6,20,100,256,1000",
+                        help="Dice checked for uniformity (default: 2,6,20,100,256,1000)")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the uniformity tests")
+    parser.add_argument("--alpha", type=float, default=1e-4,
+                        help="Uniformity tests fail below this p-value (default: 0.0001)")
+    parser.add_argument("--output", default=None, help="Write results as JSON to this file")
+    parser.add_argument("--compare", default=None, help="Compare with a previous JSON results file")
+    parser.add_argument("--tolerance", type=float, default=1.5,
+                        help="Slowdown against --compare counted as a regression (default: 1.5)")
+    args = parser.parse_args(argv)
+
+    sizes = []
+    size = 10
+    while size <= args.max_size:
+        sizes.append(size)
+        size *= 10
+
+    print(f"dice_roller benchmark, d{args.faces}, Python {sys.version.split()[0]}")
+    timings = []
+    for name, builds_list, setup, run in timing_cases(args.faces, args.workers):
+        for size in sizes:
+            if builds_list and size > args.list_limit:
+                continue
+            seconds = time_case(setup, run, size, args.repeat if size < 10**7 else 1)
+            timings.append({
+                "name": name,
+                "size": size,
+                "seconds": seconds,
+                "ns_per_die": round(seconds / size * 1e9, 2),
+            })
+            print(f"  {name:<24} {size:>11} dice  {seconds:10.6f} s  "
+                  f"{seconds / size * 1e9:9.1f} ns/die")
+
+    print(f"Uniformity, {args.chi_samples} rolls per test, fail below p = {args.alpha:g}")
+    uniformity = []
+    for name, builds_list, rolls in uniformity_sources(args.seed, args.workers):
+        for faces in (int(f) for f in args.chi_faces.split(",")):
+            samples = args.chi_samples
+            if builds_list:
+                samples = min(samples, args.list_limit)
+            stats = rolls(samples, faces)
+            p_value = chi_square_p(stats)
+            uniformity.append({
+                "source": name,
+                "faces": faces,
+                "samples": samples,
+                "chi_square": round(stats.chi_square(), 4),
+                "df": faces - 1,
+                "p_value": p_value,
+                "ok": p_value >= args.alpha,
+            })
+            status = "ok" if p_value >= args.alpha else "FAIL"
+            print(f"  {name:<16} d{faces:<5} chi2 = {stats.chi_square():10.2f}  "
+                  f"df = {faces - 1:<4} p = {p_value:.4f}  {status}")
+
+    results = {
+        "commit": git_commit(),
+        "python": sys.version.split()[0],
+        "faces": args.faces,
+        "workers": args.workers,
+        "timings": timings,
+        "uniformity": uniformity,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+            f.write("\n")
+        print(f"Results written to {args.output}")
+
+    failed = not all(u["ok"] for u in uniformity)
+    if args.compare:
+        with open(args.compare) as f:
+            previous = json.load(f)
+        failed = bool(compare(previous, results, args.tolerance, args.alpha)) or failed
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,7 +2,32 @@
 """A simple dice roller script."""
 
 import argparse
+import os
 import random
+import re
+import sys
+from array import array
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from fractions import Fraction
+from functools import lru_cache
+from itertools import accumulate
+
+# roll_dice hands calls of at least this many dice to roll_dice_bulk.
+BULK_THRESHOLD = 64
+
+# roll_dice_bulk stores rolls in unsigned arrays, so num_faces must be below this.
+BULK_MAX_FACES = 1 << 8 * array("Q").itemsize
+
+# Random bytes drawn per round by roll_dice_bulk.
+BULK_CHUNK = 1 << 20
+
+# Dice generated per chunk by roll_stats.
+STREAM_CHUNK = 1 << 20
+
+# Dice per shard of simulate. Each shard has its own RNG stream, so this,
+# unlike the worker count, is part of what a seed reproduces.
+SHARD_SIZE = 1 << 22
 
 
 def roll_dice(num_dice=1, num_faces=6):
@@ -19,9 +44,226 @@ def roll_dice(num_dice=1, num_faces=6):
         raise ValueError("num_faces must be at least 1")
     if num_dice < 0:
         raise ValueError("num_dice must be non-negative")
+    if num_dice >= BULK_THRESHOLD and num_faces < BULK_MAX_FACES:
+        return roll_dice_bulk(num_dice, num_faces).tolist()
     return [random.randint(1, num_faces) for _ in range(num_dice)]
 
 
+def _typecode(num_faces):
+    """Return the smallest unsigned array typecode that holds num_faces."""
+    for code in "BHILQ":
+        if num_faces < 1 << (8 * array(code).itemsize):
+            return code
+    raise ValueError("num_faces does not fit in an unsigned 64-bit array")
+
+
+def _byte_table(num_faces):
+    """Return (table, rejected) mapping random bytes uniformly onto faces.
+
+    Bytes at or above the largest multiple of num_faces below 256 are
+    rejected, so every face keeps exactly the same number of byte values.
+    """
+    limit = 256 - 256 % num_faces
+    table = bytes(b % num_faces + 1 if b < limit else 0 for b in range(256))
+    return table, bytes(range(limit, 256))
+
+
+def roll_dice_bulk(num_dice, num_faces=6, rng=None):
+    """Roll many dice at once and return the results as a compact array.
+
+    Dice with up to 255 faces are drawn as random bytes and mapped onto
+    faces with bytes.translate, which rejects the few bytes that would bias
+    the result. Larger dice fall back to random.choices, and dice with
+    more than sys.maxsize faces to random.randrange.
+
+    Args:
+        num_dice: Number of dice to roll.
+        num_faces: Number of faces on each die.
+        rng: A random.Random instance to draw from (default: the random
+            module's global generator).
+
+    Returns:
+        An array.array of integers, one per die rolled, using the smallest
+        unsigned typecode that holds num_faces.
+    """
+    if num_faces < 1:
+        raise ValueError("num_faces must be at least 1")
+    if num_dice < 0:
+        raise ValueError("num_dice must be non-negative")
+    rng = random if rng is None else rng
+    results = array(_typecode(num_faces))
+    if num_faces == 1:
+        results.frombytes(b"\x01" * num_dice)
+    elif num_faces < 256:
+        table, rejected = _byte_table(num_faces)
+        accepted = 1 - len(rejected) / 256
+        while len(results) < num_dice:
+            wanted = num_dice - len(results)
+            draw = min(BULK_CHUNK, int(wanted / accepted) + 16)
+            results.frombytes(rng.randbytes(draw).translate(table, rejected)[:wanted])
+    elif num_faces <= sys.maxsize:
+        faces = range(1, num_faces + 1)
+        while len(results) < num_dice:
+            results.extend(rng.choices(faces, k=min(BULK_CHUNK, num_dice - len(results))))
+    else:
+        # random.choices cannot index a range longer than sys.maxsize
+        results.extend(rng.randrange(num_faces) + 1 for _ in range(num_dice))
+    return results
+
+
+# One signed term of a dice expression: "3d6", "-d4", "+2".
+_TERM = re.compile(r"\s*([+-])?\s*(?:(\d*)[dD](\d+)|(\d+))\s*")
+
+# Exact sum counts already computed, keyed by (num_dice, num_faces). The
+# oldest entries are dropped once there are more than SUM_CACHE_SIZE.
+SUM_CACHE_SIZE = 128
+_sum_counts = {}
+
+
+def parse_expression(expression):
+    """Parse a dice expression such as "3d6+2d8-1".
+
+    Args:
+        expression: Terms of the form NdM, dM or a constant, joined by + or -.
+
+    Returns:
+        A (terms, constant) tuple, where terms is a list of
+        (sign, num_dice, num_faces) tuples.
+    """
+    if not expression.strip():
+        raise ValueError("empty dice expression")
+    terms, constant, pos = [], 0, 0
+    while pos < len(expression):
+        match = _TERM.match(expression, pos)
+        if not match or (pos and not match.group(1)):
+            raise ValueError(f"invalid dice expression: {expression!r}")
+        sign, num_dice, num_faces, number = match.groups()
+        sign = -1 if sign == "-" else 1
+        if number is not None:
+            constant += sign * int(number)
+        else:
+            num_dice = int(num_dice) if num_dice else 1
+            if int(num_faces) < 1:
+                raise ValueError("num_faces must be at least 1")
+            terms.append((sign, num_dice, int(num_faces)))
+        pos = match.end()
+    return terms, constant
+
+
+def sum_counts(num_dice, num_faces):
+    """Count the ways each total of NdM can be rolled.
+
+    Adding one die convolves the counts with the die's polynomial
+    x + x^2 + ... + x^M, a sliding window sum. Results are cached, and a new
+    NdM starts from the largest cached count of fewer M-faced dice.
+
+    Args:
+        num_dice: Number of dice.
+        num_faces: Number of faces on each die.
+
+    Returns:
+        A tuple whose k-th entry is the number of rolls totalling num_dice + k.
+    """
+    if num_faces < 1:
+        raise ValueError("num_faces must be at least 1")
+    if num_dice < 0:
+        raise ValueError("num_dice must be non-negative")
+    key = (num_dice, num_faces)
+    if key in _sum_counts:
+        return _sum_counts[key]
+    start = max((n for n, f in _sum_counts if f == num_faces and n < num_dice), default=0)
+    counts = _sum_counts.get((start, num_faces), (1,))
+    for _ in range(start, num_dice):
+        prefix = [0, *accumulate(counts)]
+        size = len(counts)
+        counts = tuple(prefix[min(k + 1, size)] - prefix[max(k + 1 - num_faces, 0)]
+                       for k in range(size + num_faces - 1))
+    if len(_sum_counts) >= SUM_CACHE_SIZE:
+        del _sum_counts[next(iter(_sum_counts))]
+    _sum_counts[key] = counts
+    return counts
+
+
+def _convolve(first, second):
+    result = [0] * (len(first) + len(second) - 1)
+    for i, a in enumerate(first):
+        if a:
+            for j, b in enumerate(second):
+                result[i + j] += a * b
+    return result
+
+
+class Distribution:
+    """Exact distribution of the total of a dice expression.
+
+    Attributes:
+        expression: The expression the distribution was computed for.
+        minimum: The lowest possible total.
+        maximum: The highest possible total.
+        counts: Ways to roll each total from minimum to maximum.
+        outcomes: Number of equally likely rolls.
+    """
+
+    def __init__(self, expression, minimum, counts):
+        self.expression = expression
+        self.minimum = minimum
+        self.maximum = minimum + len(counts) - 1
+        self.counts = tuple(counts)
+        self.outcomes = sum(self.counts)
+
+    def ways(self, total):
+        """Return the number of rolls that add up to total."""
+        if self.minimum <= total <= self.maximum:
+            return self.counts[total - self.minimum]
+        return 0
+
+    def probability(self, total):
+        """Return P(total) as a Fraction."""
+        return Fraction(self.ways(total), self.outcomes)
+
+    def at_least(self, total):
+        """Return P(result >= total) as a Fraction."""
+        start = min(max(total - self.minimum, 0), len(self.counts))
+        return Fraction(sum(self.counts[start:]), self.outcomes)
+
+    def at_most(self, total):
+        """Return P(result <= total) as a Fraction."""
+        return 1 - self.at_least(total + 1)
+
+    def mean(self):
+        """Return the expected total as a Fraction."""
+        weighted = sum(k * c for k, c in enumerate(self.counts))
+        return self.minimum + Fraction(weighted, self.outcomes)
+
+    def items(self):
+        """Yield (total, probability) pairs in increasing order of total."""
+        for k, count in enumerate(self.counts):
+            yield self.minimum + k, Fraction(count, self.outcomes)
+
+
+@lru_cache(maxsize=256)
+def distribution(expression):
+    """Compute the exact distribution of a dice expression's total.
+
+    Args:
+        expression: A dice expression such as "10d6" or "3d6+2d8-1".
+
+    Returns:
+        A Distribution. Results are cached per expression.
+    """
+    terms, constant = parse_expression(expression)
+    minimum, counts = constant, [1]
+    for sign, num_dice, num_faces in terms:
+        term = sum_counts(num_dice, num_faces)
+        if sign < 0:
+            term = term[::-1]
+            minimum -= num_dice * num_faces
+        else:
+            minimum += num_dice
+        counts = _convolve(counts, term) if len(counts) > 1 else list(term)
+    return Distribution(expression, minimum, counts)
+
+
 def calculate_total(results):
     """Calculate the total of dice results.
 
@@ -34,7 +276,270 @@ def calculate_total(results):
     return sum(results)
 
 
-def main():
+class RollStats:
+    """Running statistics over dice rolls, kept as a per-face histogram.
+
+    Total, mean, variance, minimum and maximum are all derived from the
+    histogram, so memory depends on the number of faces, not of rolls.
+
+    Attributes:
+        num_faces: Number of faces on each die.
+        histogram: Counter mapping each face rolled to its number of rolls.
+    """
+
+    def __init__(self, num_faces=6):
+        self.num_faces = num_faces
+        self.histogram = Counter()
+
+    def update(self, rolls):
+        """Add a batch of rolls, such as a roll_dice_bulk array."""
+        # One bytes.count pass per face beats Counter up to about 64 faces.
+        if isinstance(rolls, array) and rolls.typecode == "B" and self.num_faces <= 64:
+            data = rolls.tobytes()
+            for face in range(1, self.num_faces + 1):
+                found = data.count(face)
+                if found:
+                    self.histogram[face] += found
+        else:
+            self.histogram.update(rolls)
+
+    def merge(self, other):
+        """Add the rolls counted by another RollStats."""
+        self.histogram.update(other.histogram)
+
+    @property
+    def count(self):
+        return sum(self.histogram.values())
+
+    @property
+    def total(self):
+        return sum(face * n for face, n in self.histogram.items())
+
+    @property
+    def mean(self):
+        count = self.count
+        return self.total / count if count else 0.0
+
+    @property
+    def variance(self):
+        """Population variance of the rolls."""
+        count = self.count
+        if not count:
+            return 0.0
+        squares = sum(face * face * n for face, n in self.histogram.items())
+        return (count * squares - self.total ** 2) / count ** 2
+
+    @property
+    def minimum(self):
+        return min(self.histogram, default=None)
+
+    @property
+    def maximum(self):
+        return max(self.histogram, default=None)
+
+    def chi_square(self):
+        """Return Pearson's chi-square statistic against a fair die.
+
+        It has num_faces - 1 degrees of freedom; large values mean the
+        faces are not equally likely.
+        """
+        count = self.count
+        if not count:
+            return 0.0
+        squares = sum(n * n for n in self.histogram.values())
+        return (squares * self.num_faces - count * count) / count
+
+
+def _roll_chunk(num_dice, num_faces, rng):
+    """roll_dice_bulk, or a list for dice too wide for its arrays."""
+    if num_faces < BULK_MAX_FACES:
+        return roll_dice_bulk(num_dice, num_faces, rng)
+    # The same draws roll_dice_bulk makes above sys.maxsize faces
+    rng = random if rng is None else rng
+    return [rng.randrange(num_faces) + 1 for _ in range(num_dice)]
+
+
+def roll_stats(num_dice, num_faces=6, rng=None, chunk_size=STREAM_CHUNK):
+    """Roll dice in fixed-size chunks and fold them into a RollStats.
+
+    Only one chunk of rolls exists at a time, so any number of dice can be
+    rolled in constant memory.
+
+    Args:
+        num_dice: Number of dice to roll.
+        num_faces: Number of faces on each die.
+        rng: A random.Random instance to draw from (default: the random
+            module's global generator).
+        chunk_size: Dice generated per chunk.
+
+    Returns:
+        A RollStats covering all num_dice rolls.
+    """
+    if num_dice < 0:
+        raise ValueError("num_dice must be non-negative")
+    stats = RollStats(num_faces)
+    for start in range(0, num_dice, chunk_size):
+        stats.update(_roll_chunk(min(chunk_size, num_dice - start), num_faces, rng))
+    return stats
+
+
+def _shard_rng(seed, index):
+    """Return the RNG stream of one shard, derived from the simulation seed."""
+    return random.Random(f"dice_roller/{seed}/{index}")
+
+
+def _simulate_shard(task):
+    seed, index, num_dice, num_faces = task
+    return roll_stats(num_dice, num_faces, _shard_rng(seed, index)).histogram
+
+
+def simulate(num_dice, num_faces=6, seed=None, workers=None, shard_size=SHARD_SIZE):
+    """Roll dice across processes, reproducibly for a given seed.
+
+    The dice are split into shards of shard_size, and shard i draws from its
+    own generator seeded with (seed, i). Shards run on a ProcessPoolExecutor
+    and their histograms are added together. Which worker rolls which shard
+    does not matter, so a seed gives identical results at any worker count.
+
+    Args:
+        num_dice: Number of dice to roll.
+        num_faces: Number of faces on each die.
+        seed: Integer seed (default: a fresh random seed).
+        workers: Worker processes (default: os.cpu_count()). With 1, shards
+            run in this process.
+        shard_size: Dice per shard.
+
+    Returns:
+        A RollStats covering all num_dice rolls.
+    """
+    if num_faces < 1:
+        raise ValueError("num_faces must be at least 1")
+    if num_dice < 0:
+        raise ValueError("num_dice must be non-negative")
+    if seed is None:
+        seed = random.SystemRandom().getrandbits(64)
+    workers = workers or os.cpu_count() or 1
+    tasks = [(seed, index, min(shard_size, num_dice - start), num_faces)
+             for index, start in enumerate(range(0, num_dice, shard_size))]
+    stats = RollStats(num_faces)
+    if workers == 1 or len(tasks) <= 1:
+        for histogram in map(_simulate_shard, tasks):
+            stats.histogram.update(histogram)
+        return stats
+    with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as pool:
+        for histogram in pool.map(_simulate_shard, tasks):
+            stats.histogram.update(histogram)
+    return stats
+
+
+# Per-die output formats of the CLI: (text before the face, text of the face).
+# The first part gets the 1-based die number; plain has none.
+_TEXT_FORMATS = {
+    "text": ("  Die {}", ": {}\n"),
+    "plain": (None, "{}\n"),
+    "csv": ("{}", ",{}\n"),
+    "ndjson": ('{{"die":{}', ',"result":{}}}\n'),
+}
+OUTPUT_FORMATS = (*_TEXT_FORMATS, "int8", "int16")
+
+
+def _encoder(fmt, num_faces):
+    """Return a function encoding one chunk of rolls, numbered from start, as bytes."""
+    if fmt == "int8":
+        if num_faces > 127:
+            raise ValueError("int8 output holds at most 127 faces")
+        # roll_dice_bulk stores up to 255 faces as bytes, the same as int8 up to 127.
+        return lambda start, rolls: rolls.tobytes()
+    if fmt == "int16":
+        if num_faces > 32767:
+            raise ValueError("int16 output holds at most 32767 faces")
+
+        def encode_int16(start, rolls):
+            values = array("h", rolls)
+            if sys.byteorder == "big":
+                values.byteswap()
+            return values.tobytes()
+        return encode_int16
+    if fmt not in _TEXT_FORMATS:
+        raise ValueError(f"unknown output format: {fmt}")
+    number, face = _TEXT_FORMATS[fmt]
+    if num_faces <= 1 << 16:
+        face = ["", *map(face.format, range(1, num_faces + 1))].__getitem__
+    else:
+        face = face.format
+
+    def encode_text(start, rolls):
+        faces = map(face, rolls)
+        if number is None:
+            return "".join(faces).encode()
+        numbers = map(number.format, range(start + 1, start + len(rolls) + 1))
+        return "".join(map(str.__add__, numbers, faces)).encode()
+    return encode_text
+
+
+def write_rolls(out, num_dice, num_faces=6, fmt="plain", rng=None, chunk_size=STREAM_CHUNK):
+    """Roll dice in chunks and write them to a binary stream.
+
+    Each chunk is encoded in one go and handed to out in a single write, so
+    the cost per die is generation and encoding, not I/O calls.
+
+    Args:
+        out: A binary stream such as sys.stdout.buffer.
+        num_dice: Number of dice to roll.
+        num_faces: Number of faces on each die.
+        fmt: One of OUTPUT_FORMATS. int8 and int16 are raw little-endian
+            signed integers; the others are one line per die.
+        rng: A random.Random instance to draw from (default: the random
+            module's global generator).
+        chunk_size: Dice generated and written per chunk.
+
+    Returns:
+        The total of all rolls.
+    """
+    encode = _encoder(fmt, num_faces)
+    total = 0
+    for start in range(0, num_dice, chunk_size):
+        rolls = _roll_chunk(min(chunk_size, num_dice - start), num_faces, rng)
+        total += sum(rolls)
+        out.write(encode(start, rolls))
+    return total
+
+
+def print_summary(stats):
+    """Print the totals of a RollStats, with its histogram for up to 100 faces."""
+    print(f"Total: {stats.total}")
+    if not stats.count:
+        return
+    print(f"Mean: {stats.mean:.6f}")
+    print(f"Variance: {stats.variance:.6f}")
+    print(f"Min: {stats.minimum}  Max: {stats.maximum}")
+    if stats.num_faces <= 100:
+        width = len(str(stats.num_faces))
+        for face in range(1, stats.num_faces + 1):
+            rolled = stats.histogram[face]
+            print(f"  Face {face:>{width}}: {rolled} ({rolled / stats.count:.4%})")
+
+
+def print_distribution(dist, at_least=None, at_most=None):
+    """Print a distribution table, or only the requested tail probabilities."""
+    if at_least is not None or at_most is not None:
+        if at_least is not None:
+            p = dist.at_least(at_least)
+            print(f"P({dist.expression} >= {at_least}) = {p} ~ {float(p):.6f}")
+        if at_most is not None:
+            p = dist.at_most(at_most)
+            print(f"P({dist.expression} <= {at_most}) = {p} ~ {float(p):.6f}")
+        return
+    print(f"Distribution of {dist.expression} ({dist.outcomes} outcomes, "
+          f"mean {float(dist.mean()):g}):")
+    width = max(len(str(dist.minimum)), len(str(dist.maximum))) + 1
+    tail = dist.outcomes
+    for total, count in enumerate(dist.counts, dist.minimum):
+        print(f"  {total:>{width}}: {count / dist.outcomes:8.4%}  P(>=) {tail / dist.outcomes:8.4%}")
+        tail -= count
+
+
+def main(argv=None):
     parser = argparse.ArgumentParser(description="Roll dice and show results.")
     parser.add_argument(
         "--num-dice", type=int, default=1, help="Number of dice to roll (default: 1)"
@@ -45,20 +550,105 @@ def main():
         default=6,
         help="Number of faces on each die (default: 6)",
     )
-    args = parser.parse_args()
+    parser.add_argument(
+        "--dist",
+        metavar="EXPR",
+        help='Print the exact distribution of a dice expression such as "3d6+2d8"',
+    )
+    parser.add_argument(
+        "--at-least",
+        type=int,
+        metavar="T",
+        help="With --dist, print only P(total >= T)",
+    )
+    parser.add_argument(
+        "--at-most",
+        type=int,
+        metavar="T",
+        help="With --dist, print only P(total <= T)",
+    )
+    parser.add_argument(
+        "--summary",
+        action="store_true",
+        help="Stream the rolls and print summary statistics instead of every die",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        help="Seed the rolls so that a run can be reproduced. Every output mode "
+        "rolls the same dice for a seed, except --workers, which shards them",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="With --summary or --quiet, roll across this many processes (default: 1)",
+    )
+    parser.add_argument(
+        "--format",
+        choices=OUTPUT_FORMATS,
+        help="Per-die output format (default: text). int8 and int16 are raw "
+        "little-endian bytes; only text adds a header and total",
+    )
+    parser.add_argument(
+        "--quiet",
+        action="store_true",
+        help="Print only the total, without any per-die output",
+    )
+    args = parser.parse_args(argv)
+
+    if args.dist is not None:
+        try:
+            dist = distribution(args.dist)
+        except ValueError as exc:
+            parser.error(str(exc))
+        print_distribution(dist, args.at_least, args.at_most)
+        return
+    if args.at_least is not None or args.at_most is not None:
+        parser.error("--at-least and --at-most require --dist")
 
     if args.num_dice < 0:
         parser.error("--num-dice must be non-negative")
     if args.num_faces < 1:
         parser.error("--num-faces must be at least 1")
 
-    results = roll_dice(args.num_dice, args.num_faces)
-    total = calculate_total(results)
+    if args.workers is not None and not (args.summary or args.quiet):
+        parser.error("--workers requires --summary or --quiet")
+    if args.workers is not None and args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.format is not None and (args.summary or args.quiet):
+        parser.error("--format cannot be combined with --summary or --quiet")
+
+    # One stream for per-die output, --summary and --quiet alike, so a seed
+    # rolls the same dice whichever way they are shown. Only --workers
+    # switches to simulate's per-shard streams.
+    rng = None if args.seed is None else random.Random(args.seed)
+    if args.summary or args.quiet:
+        if args.workers is None:
+            stats = roll_stats(args.num_dice, args.num_faces, rng)
+        else:
+            stats = simulate(args.num_dice, args.num_faces, args.seed, args.workers)
+        if args.quiet:
+            print(f"Total: {stats.total}")
+            return
+        print(f"Rolling {args.num_dice} dice with {args.num_faces} faces each:")
+        print_summary(stats)
+        return
 
-    print(f"Rolling {args.num_dice} dice with {args.num_faces} faces each:")
-    for i, result in enumerate(results, 1):
-        print(f"  Die {i}: {result}")
-    print(f"Total: {total}")
+    fmt = args.format or "text"
+    out = sys.stdout.buffer
+    try:
+        if fmt == "text":
+            out.write(f"Rolling {args.num_dice} dice with {args.num_faces} faces each:\n".encode())
+        total = write_rolls(out, args.num_dice, args.num_faces, fmt, rng)
+        if fmt == "text":
+            out.write(f"Total: {total}\n".encode())
+        out.flush()
+    except ValueError as exc:
+        parser.error(str(exc))
+    except BrokenPipeError:
+        # The reader went away (e.g. `| head`); silence the flush at exit.
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        sys.exit(1)
 
 
 if __name__ == "__main__":
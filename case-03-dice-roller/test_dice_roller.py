@@ -1,7 +1,32 @@
 """Tests for dice_roller.py"""
 
+import io
+import itertools
+import json
+import random
+import re
+import sys
+from array import array
+from collections import Counter
+from fractions import Fraction
+from statistics import pvariance
+
 import pytest
-from dice_roller import roll_dice, calculate_total
+from dice_roller import (
+    BULK_MAX_FACES,
+    BULK_THRESHOLD,
+    RollStats,
+    calculate_total,
+    distribution,
+    main,
+    parse_expression,
+    roll_dice,
+    roll_dice_bulk,
+    roll_stats,
+    simulate,
+    sum_counts,
+    write_rolls,
+)
 
 
 class TestRollDice:
@@ -56,6 +81,360 @@ class TestRollDice:
         assert len(results) == 1000
         assert all(1 <= r <= 6 for r in results)
 
+    def test_large_call_still_returns_list(self):
+        results = roll_dice(num_dice=500, num_faces=6)
+        assert isinstance(results, list)
+        assert all(isinstance(r, int) and 1 <= r <= 6 for r in results)
+
+    @pytest.mark.parametrize("num_dice", [BULK_THRESHOLD - 1, BULK_THRESHOLD, 200])
+    @pytest.mark.parametrize("num_faces", [sys.maxsize + 1, BULK_MAX_FACES - 1, BULK_MAX_FACES, 2**70])
+    def test_faces_beyond_array_range(self, num_dice, num_faces):
+        results = roll_dice(num_dice, num_faces)
+        assert isinstance(results, list)
+        assert len(results) == num_dice
+        assert all(isinstance(r, int) and 1 <= r <= num_faces for r in results)
+
+
+class TestRollDiceBulk:
+    """Tests for the roll_dice_bulk function."""
+
+    def test_returns_array_of_requested_length(self):
+        for n in [0, 1, 10, 100000]:
+            results = roll_dice_bulk(n)
+            assert isinstance(results, array)
+            assert len(results) == n
+
+    def test_faces_in_range(self):
+        for num_faces in [2, 6, 20, 100, 255, 256, 1000, 70000]:
+            results = roll_dice_bulk(20000, num_faces)
+            assert min(results) >= 1
+            assert max(results) <= num_faces
+
+    def test_every_face_appears(self):
+        for num_faces in [6, 7, 255]:
+            results = roll_dice_bulk(100000, num_faces)
+            assert set(results) == set(range(1, num_faces + 1))
+
+    def test_typecode_fits_faces(self):
+        assert roll_dice_bulk(1, 6).typecode == "B"
+        assert roll_dice_bulk(1, 256).typecode == "H"
+        assert roll_dice_bulk(1, 70000).itemsize >= 4
+
+    def test_widest_faces(self):
+        for num_faces in (sys.maxsize, sys.maxsize + 1, BULK_MAX_FACES - 1):
+            results = roll_dice_bulk(100, num_faces)
+            assert results.itemsize == 8
+            assert all(1 <= r <= num_faces for r in results)
+        with pytest.raises(ValueError):
+            roll_dice_bulk(1, BULK_MAX_FACES)
+
+    def test_single_face_die(self):
+        assert roll_dice_bulk(5, 1).tolist() == [1, 1, 1, 1, 1]
+
+    def test_same_rng_seed_gives_same_rolls(self):
+        first = roll_dice_bulk(1000, 6, rng=random.Random(42))
+        second = roll_dice_bulk(1000, 6, rng=random.Random(42))
+        assert first == second
+
+    def test_negative_dice_raises_error(self):
+        with pytest.raises(ValueError):
+            roll_dice_bulk(-1)
+
+    def test_zero_faces_raises_error(self):
+        with pytest.raises(ValueError):
+            roll_dice_bulk(10, 0)
+
+
+class TestDistribution:
+    """Tests for parse_expression, sum_counts and distribution."""
+
+    def test_parse_expression(self):
+        assert parse_expression("3d6+2d8-1") == ([(1, 3, 6), (1, 2, 8)], -1)
+        assert parse_expression("d20 - d4 + 2") == ([(1, 1, 20), (-1, 1, 4)], 2)
+
+    def test_invalid_expressions_raise_error(self):
+        for expression in ["", "3x6", "3d6 2d6", "d", "3d0"]:
+            with pytest.raises(ValueError):
+                parse_expression(expression)
+
+    def test_sum_counts_of_2d6(self):
+        assert sum_counts(2, 6) == (1, 2, 3, 4, 5, 6, 5, 4, 3, 2, 1)
+
+    def test_sum_counts_edge_cases(self):
+        assert sum_counts(0, 6) == (1,)
+        assert sum_counts(4, 1) == (1,)
+        with pytest.raises(ValueError):
+            sum_counts(-1, 6)
+
+    def test_matches_brute_force(self):
+        for expression, dice, constant in [
+            ("3d6+2d4", [4, 4, 6, 6, 6], 0),
+            ("2d6-1", [6, 6], -1),
+        ]:
+            expected = Counter(
+                sum(roll) + constant
+                for roll in itertools.product(*(range(1, f + 1) for f in dice))
+            )
+            dist = distribution(expression)
+            assert dist.minimum == min(expected)
+            assert dist.maximum == max(expected)
+            assert all(dist.ways(total) == ways for total, ways in expected.items())
+
+    def test_negative_term(self):
+        dist = distribution("1d6-1d6")
+        assert (dist.minimum, dist.maximum) == (-5, 5)
+        assert dist.probability(0) == Fraction(1, 6)
+
+    def test_probabilities_sum_to_one(self):
+        dist = distribution("4d6+d20")
+        assert sum(p for _, p in dist.items()) == 1
+        assert dist.mean() == Fraction(4 * 7, 2) + Fraction(21, 2)
+
+    def test_tail_probabilities(self):
+        dist = distribution("10d6")
+        assert dist.at_least(10) == 1
+        assert dist.at_least(61) == 0
+        assert dist.at_most(9) == 0
+        assert dist.at_least(30) + dist.at_most(29) == 1
+        assert dist.at_least(60) == Fraction(1, 6**10)
+
+    def test_repeated_query_is_cached(self):
+        assert distribution("5d8+3") is distribution("5d8+3")
+
+
+class TestRollStats:
+    """Tests for RollStats and roll_stats."""
+
+    def test_matches_list_statistics(self):
+        for num_faces in [6, 100, 1000]:
+            rolls = roll_dice_bulk(5000, num_faces)
+            stats = RollStats(num_faces)
+            stats.update(rolls)
+            assert stats.count == len(rolls)
+            assert stats.total == sum(rolls)
+            assert stats.mean == pytest.approx(sum(rolls) / len(rolls))
+            assert stats.variance == pytest.approx(pvariance(rolls))
+            assert (stats.minimum, stats.maximum) == (min(rolls), max(rolls))
+            assert stats.histogram == Counter(rolls)
+
+    def test_update_accepts_lists(self):
+        stats = RollStats(6)
+        stats.update([1, 6, 6])
+        assert stats.histogram == {1: 1, 6: 2}
+        assert stats.total == 13
+
+    def test_empty_stats(self):
+        stats = RollStats(6)
+        assert stats.count == 0
+        assert stats.total == 0
+        assert stats.mean == 0.0
+        assert stats.minimum is None
+
+    def test_merge(self):
+        first, second = RollStats(6), RollStats(6)
+        first.update([1, 2])
+        second.update([2, 3])
+        first.merge(second)
+        assert first.histogram == {1: 1, 2: 2, 3: 1}
+
+    def test_chunked_rolls_cover_all_dice(self):
+        stats = roll_stats(10001, 6, chunk_size=1000)
+        assert stats.count == 10001
+        assert 10001 <= stats.total <= 60006
+
+    def test_same_seed_gives_same_histogram(self):
+        first = roll_stats(5000, 6, rng=random.Random(7), chunk_size=1000)
+        second = roll_stats(5000, 6, rng=random.Random(7), chunk_size=1000)
+        assert first.histogram == second.histogram
+
+    def test_negative_dice_raises_error(self):
+        with pytest.raises(ValueError):
+            roll_stats(-1)
+
+    def test_chi_square(self):
+        stats = RollStats(6)
+        stats.update([1, 2, 3, 4, 5, 6] * 10)
+        assert stats.chi_square() == 0
+        stats.update([6] * 60)
+        assert stats.chi_square() == pytest.approx(sum((o - 20) ** 2 / 20 for o in [10] * 5 + [70]))
+
+    @pytest.mark.parametrize("num_faces", [BULK_MAX_FACES - 1, BULK_MAX_FACES, 10**23])
+    def test_wide_dice(self, num_faces):
+        stats = roll_stats(50, num_faces, random.Random(4), chunk_size=16)
+        assert stats.count == 50
+        assert 1 <= stats.minimum <= stats.maximum <= num_faces
+        assert stats.histogram == roll_stats(50, num_faces, random.Random(4)).histogram
+
+    def test_wide_dice_in_summary_and_quiet(self, capsys):
+        args = ["--num-dice", "20", "--num-faces", str(10**23), "--seed", "2"]
+        quiet = run_main(capsys, *args, "--quiet")
+        summary = run_main(capsys, *args, "--summary")
+        assert printed_total(quiet) == printed_total(summary)
+        assert 20 <= printed_total(quiet) <= 20 * 10**23
+
+
+class TestUniformity:
+    """Seeded chi-square checks that every path rolls fair dice."""
+
+    # Chi-square critical values at p = 0.001, by number of faces.
+    CRITICAL = {2: 10.828, 6: 20.515, 20: 43.820, 256: 330.520, 1000: 1143.917}
+
+    @pytest.mark.parametrize("num_faces", sorted(CRITICAL))
+    def test_roll_dice_bulk(self, num_faces):
+        stats = RollStats(num_faces)
+        stats.update(roll_dice_bulk(200 * num_faces, num_faces, random.Random(num_faces)))
+        assert stats.chi_square() < self.CRITICAL[num_faces]
+
+    @pytest.mark.parametrize("num_faces", [6, 20])
+    def test_roll_stats(self, num_faces):
+        stats = roll_stats(300000, num_faces, random.Random(1), chunk_size=70000)
+        assert stats.chi_square() < self.CRITICAL[num_faces]
+
+    def test_simulate(self):
+        stats = simulate(300000, 6, seed=5, workers=1, shard_size=50000)
+        assert stats.chi_square() < self.CRITICAL[6]
+
+    def test_rejection_keeps_faces_that_do_not_divide_256_fair(self):
+        stats = RollStats(255)
+        stats.update(roll_dice_bulk(255 * 400, 255, random.Random(3)))
+        assert max(stats.histogram.values()) < 2 * min(stats.histogram.values())
+
+
+class TestSimulate:
+    """Tests for the seeded, sharded simulate function."""
+
+    def test_counts_all_dice(self):
+        stats = simulate(10001, 6, seed=1, workers=1, shard_size=1000)
+        assert stats.count == 10001
+        assert set(stats.histogram) <= set(range(1, 7))
+
+    def test_same_seed_same_result_at_any_worker_count(self):
+        results = [
+            simulate(20000, 6, seed=42, workers=workers, shard_size=3000).histogram
+            for workers in [1, 2, 3]
+        ]
+        assert results[0] == results[1] == results[2]
+
+    def test_different_seeds_differ(self):
+        first = simulate(5000, 20, seed=1, workers=1)
+        second = simulate(5000, 20, seed=2, workers=1)
+        assert first.histogram != second.histogram
+
+    def test_zero_dice(self):
+        assert simulate(0, 6, seed=1).count == 0
+
+    def test_invalid_arguments_raise_error(self):
+        with pytest.raises(ValueError):
+            simulate(-1, 6, seed=1)
+        with pytest.raises(ValueError):
+            simulate(10, 0, seed=1)
+
+
+class TestWriteRolls:
+    """Tests for write_rolls and its output formats."""
+
+    def write(self, fmt, num_dice=25, num_faces=6, chunk_size=10):
+        out = io.BytesIO()
+        total = write_rolls(out, num_dice, num_faces, fmt, random.Random(3), chunk_size)
+        expected = roll_dice_bulk(num_dice, num_faces, random.Random(3)).tolist()
+        return out.getvalue(), total, expected
+
+    def test_plain(self):
+        data, total, expected = self.write("plain", chunk_size=25)
+        assert [int(line) for line in data.decode().splitlines()] == expected
+        assert total == sum(expected)
+
+    def test_text(self):
+        data, _, expected = self.write("text", num_dice=3, chunk_size=3)
+        lines = [f"  Die {i}: {r}" for i, r in enumerate(expected, 1)]
+        assert data.decode().splitlines() == lines
+
+    def test_csv_numbers_dice_across_chunks(self):
+        data, total, _ = self.write("csv")
+        rows = [line.split(",") for line in data.decode().splitlines()]
+        assert [int(die) for die, _ in rows] == list(range(1, 26))
+        assert sum(int(result) for _, result in rows) == total
+
+    def test_ndjson(self):
+        data, total, _ = self.write("ndjson")
+        records = [json.loads(line) for line in data.decode().splitlines()]
+        assert [r["die"] for r in records] == list(range(1, 26))
+        assert sum(r["result"] for r in records) == total
+
+    def test_int8(self):
+        data, total, _ = self.write("int8", num_faces=100)
+        assert len(data) == 25
+        assert sum(array("b", data)) == total
+
+    def test_int16_is_little_endian(self):
+        data, total, _ = self.write("int16", num_faces=1000)
+        assert len(data) == 50
+        values = [int.from_bytes(data[i:i + 2], "little", signed=True) for i in range(0, 50, 2)]
+        assert sum(values) == total
+        assert all(1 <= v <= 1000 for v in values)
+
+    def test_wide_dice_in_text(self):
+        data, total, _ = self.write("plain", num_faces=100000)
+        assert sum(int(line) for line in data.decode().splitlines()) == total
+
+    def test_format_limits_raise_error(self):
+        with pytest.raises(ValueError):
+            write_rolls(io.BytesIO(), 1, 128, "int8")
+        with pytest.raises(ValueError):
+            write_rolls(io.BytesIO(), 1, 32768, "int16")
+        with pytest.raises(ValueError):
+            write_rolls(io.BytesIO(), 1, 6, "xml")
+
+    def test_zero_dice_writes_nothing(self):
+        out = io.BytesIO()
+        assert write_rolls(out, 0, 6, "csv") == 0
+        assert out.getvalue() == b""
+
+
+def run_main(capsys, *argv):
+    main(list(argv))
+    return capsys.readouterr().out
+
+
+def printed_total(output):
+    return int(re.search(r"^Total: (\d+)$", output, re.M).group(1))
+
+
+class TestMainSeed:
+    """--seed rolls the same dice in every output mode."""
+
+    @pytest.mark.parametrize("num_dice, num_faces, seed", [(5, 6, 3), (1000, 20, 7), (300, 1000, 0)])
+    def test_per_die_sum_matches_quiet_and_summary(self, capsys, num_dice, num_faces, seed):
+        args = ["--num-dice", str(num_dice), "--num-faces", str(num_faces), "--seed", str(seed)]
+        text = run_main(capsys, *args)
+        rolls = [int(line.split(": ")[1]) for line in text.splitlines() if line.startswith("  Die ")]
+        assert len(rolls) == num_dice
+        assert printed_total(text) == sum(rolls)
+        plain = run_main(capsys, *args, "--format", "plain")
+        assert [int(line) for line in plain.split()] == rolls
+        assert printed_total(run_main(capsys, *args, "--quiet")) == sum(rolls)
+        assert printed_total(run_main(capsys, *args, "--summary")) == sum(rolls)
+
+    @pytest.mark.parametrize("num_faces", [BULK_MAX_FACES - 1, BULK_MAX_FACES, 10**23])
+    def test_wide_dice_in_every_text_format(self, capsys, num_faces):
+        args = ["--num-dice", "5", "--num-faces", str(num_faces), "--seed", "9"]
+        text = run_main(capsys, *args)
+        rolls = [int(line.split(": ")[1]) for line in text.splitlines() if line.startswith("  Die ")]
+        assert len(rolls) == 5
+        assert all(1 <= r <= num_faces for r in rolls)
+        assert printed_total(text) == sum(rolls)
+        ndjson = run_main(capsys, *args, "--format", "ndjson")
+        assert [json.loads(line) for line in ndjson.splitlines()] == [
+            {"die": i, "result": r} for i, r in enumerate(rolls, 1)]
+        csv = run_main(capsys, *args, "--format", "csv")
+        assert csv.splitlines() == [f"{i},{r}" for i, r in enumerate(rolls, 1)]
+        assert printed_total(run_main(capsys, *args, "--quiet")) == sum(rolls)
+
+    def test_workers_reproduce_across_worker_counts(self, capsys):
+        args = ["--num-dice", "1000", "--seed", "5", "--quiet"]
+        totals = {printed_total(run_main(capsys, *args, "--workers", str(w))) for w in (1, 2)}
+        assert len(totals) == 1
+
 
 class TestCalculateTotal:
     """Tests for the calculate_total function."""
@@ -79,6 +458,9 @@ class TestCalculateTotal:
         results = roll_dice(num_dice=5, num_faces=6)
         assert calculate_total(results) == sum(results)
 
+    def test_bulk_array(self):
+        assert calculate_total(array("B", [1, 2, 3])) == 6
+
 
 class TestIntegration:
     """Integration tests combining roll_dice and calculate_total."""